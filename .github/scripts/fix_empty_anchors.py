@@ -25,8 +25,17 @@ When to use which script:
     - Use clean_html.py for: complex HTML documents, when sanitization is important, or when
       working with HTML that may contain script tags with anchors
 
+Performance:
+    - Directory trees are walked lazily with os.scandir, so processing starts
+      before the whole tree has been listed
+    - Files are cleaned concurrently in a thread pool (--jobs)
+    - Files without any "<a" occurrence are skipped after a byte search,
+      without decoding or running the regex patterns
+    - Only files whose content actually changed are rewritten, via a
+      temporary file and an atomic os.replace
+
 Dependencies:
-    - None - relies only on standard library (re, os, glob)
+    - None - relies only on standard library (re, os, concurrent.futures)
     - Uses shared patterns from html_cleaning_patterns.py if available
 
 Usage:
@@ -36,9 +45,13 @@ Usage:
 import sys
 import re
 import os
-import glob
+import stat
+import time
+import tempfile
 import argparse
-from typing import NamedTuple
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, NamedTuple
 
 
 class FixResult(NamedTuple):
@@ -46,6 +59,7 @@ class FixResult(NamedTuple):
 
     replacements: int
     failed: bool
+    skipped: bool = False
 
 # Try to import shared patterns, fall back to local patterns if not available
 try:
@@ -87,30 +101,138 @@ except ImportError:
             result = re.sub(pattern, '', result)
         return result
 
+def iter_html_files(root: str) -> Iterator[str]:
+    """
+    Lazily yields the paths of all .html files below a directory.
+
+    Uses os.scandir instead of a recursive glob so that files can be handed to
+    workers as soon as they are found. Symlinked directories are not followed.
+
+    Args:
+        root: Directory to walk
+
+    Yields:
+        str: Path of each HTML file found
+    """
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.name.endswith('.html') and entry.is_file():
+                            yield entry.path
+                    except OSError:
+                        continue
+        except OSError as e:
+            print(f"Could not read directory {current}: {e}")
+
+
+def may_contain_anchor(raw: bytes) -> bool:
+    """
+    Fast byte-level check for any anchor tag opening ("<a" or "<A").
+
+    Files failing this check cannot match any of the empty anchor patterns.
+    """
+    return b'<a' in raw or b'<A' in raw
+
+
+def atomic_write(file_path, content):
+    """
+    Writes text to a file atomically, preserving the original permissions.
+
+    The content is written to a temporary file in the same directory, which
+    then replaces the target with os.replace, so readers never observe a
+    partially written file.
+
+    Args:
+        file_path: Path of the file to replace
+        content: Text content to write (UTF-8)
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, temp_path = tempfile.mkstemp(prefix='.fix_anchors-', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+        try:
+            os.chmod(temp_path, stat.S_IMODE(os.stat(file_path).st_mode))
+        except OSError:
+            pass
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def fix_html_files(files: Iterable[str], jobs: int, verbose=False, dry_run=False) -> Iterator[FixResult]:
+    """
+    Cleans HTML files concurrently, yielding results in input order.
+
+    At most a few files per worker are in flight at any time, so a lazily
+    walked tree is never materialised in full.
+
+    Args:
+        files: Iterable of HTML file paths
+        jobs: Number of worker threads
+        verbose: If True, prints detailed information
+        dry_run: If True, shows changes without writing to files
+
+    Yields:
+        FixResult: Outcome for each file
+    """
+    jobs = max(1, jobs)
+    max_in_flight = jobs * 4
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        pending = deque()
+        for file in files:
+            pending.append(executor.submit(fix_html_file, file, verbose, dry_run))
+            if len(pending) >= max_in_flight:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
 def fix_html_file(file_path, verbose=False, dry_run=False):
     """
     Removes empty anchor tags from an HTML file using direct string replacement.
 
+    Files without any anchor tag are skipped after a byte search, and the file
+    is only rewritten (atomically) when its content actually changed.
+
     Args:
         file_path: Path to the HTML file to clean
         verbose: If True, prints detailed information
         dry_run: If True, shows changes without writing to file
 
     Returns:
-        FixResult: Tuple containing the approximate number of replacements and
-            whether the file processing failed due to an OSError or UnicodeError
+        FixResult: Tuple containing the approximate number of replacements,
+            whether the file processing failed due to an OSError or UnicodeError,
+            and whether the file was skipped by the byte pre-check
     """
     try:
-        # Read the file
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        # Read the file as bytes so anchor-free files never get decoded
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+
+        if verbose:
+            print(f"Processing file: {file_path}")
+
+        if not may_contain_anchor(raw):
+            if verbose:
+                print(f"  No anchor tags in {file_path}, skipping")
+            return FixResult(replacements=0, failed=False, skipped=True)
+
+        content = raw.decode('utf-8')
 
         # Store original content length for comparison
         initial_content_length = len(content)
 
-        if verbose:
-            print(f"Processing file: {file_path}")
-        
         # Apply anchor cleanup using shared patterns if available,
         # or fall back to local implementation
         if USES_SHARED_PATTERNS and 'apply_empty_anchor_cleanup' in globals():
@@ -126,26 +248,25 @@ def fix_html_file(file_path, verbose=False, dry_run=False):
                 else:
                     modified_content = re.sub(pattern, '', modified_content)
 
-        # Calculate approximate number of replacements
-        final_content_length = len(modified_content)
-        chars_removed = initial_content_length - final_content_length
-        replacements = chars_removed // 20  # Approximate size of each anchor tag
-
         # Only proceed if changes were made
-        if replacements > 0:
+        if modified_content != content:
+            # Calculate approximate number of replacements
+            chars_removed = initial_content_length - len(modified_content)
+            replacements = max(chars_removed // 20, 1)  # Approximate size of each anchor tag
+
             if verbose:
                 print(f"  Found approximately {replacements} empty anchor tags")
 
             if dry_run:
                 print(f"[DRY RUN] Would fix {file_path}: {replacements} empty anchor tags")
             else:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(modified_content)
+                atomic_write(file_path, modified_content)
                 print(f"Fixed {file_path}: removed approximately {replacements} empty anchor tags")
-        elif verbose:
+            return FixResult(replacements=replacements, failed=False)
+
+        if verbose:
             print(f"  No empty anchors found in {file_path}")
-        
-        return FixResult(replacements=replacements, failed=False)
+        return FixResult(replacements=0, failed=False)
 
     except (OSError, UnicodeError) as e:
         print(f"I/O or encoding error fixing {file_path}: {e}")
@@ -172,6 +293,12 @@ def main():
         action="store_true",
         help="Show what would be fixed without making changes"
     )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=min(32, (os.cpu_count() or 1) + 4),
+        help="Number of worker threads used to process files"
+    )
 
     args = parser.parse_args()
 
@@ -192,29 +319,34 @@ def main():
         if verbose:
             print(f"Searching for HTML files in {path} and subdirectories...")
 
-        html_files = glob.glob(os.path.join(path, '**', '*.html'), recursive=True)
-        total_files = len(html_files)
-
-        if verbose:
-            print(f"Found {total_files} HTML files")
-
+        total_files = 0
         fixed_files = 0
+        skipped_files = 0
         total_replacements = 0
         failed_files = 0
 
-        for file in html_files:
-            result = fix_html_file(file, verbose=verbose, dry_run=dry_run)
+        start_time = time.perf_counter()
+        for result in fix_html_files(iter_html_files(path), args.jobs, verbose=verbose, dry_run=dry_run):
+            total_files += 1
             if result.failed:
                 failed_files += 1
                 continue
+            if result.skipped:
+                skipped_files += 1
 
             replacements = result.replacements
             if replacements > 0:
                 fixed_files += 1
                 total_replacements += replacements
+        elapsed = time.perf_counter() - start_time
+
+        if verbose:
+            print(f"Found {total_files} HTML files ({skipped_files} without anchor tags)")
 
         action = "Would fix" if dry_run else "Fixed"
         print(f"\nSummary: {action} {fixed_files} out of {total_files} files, removing approximately {total_replacements} empty anchor tags")
+        throughput = total_files / elapsed if elapsed > 0 else float('inf')
+        print(f"Processed {total_files} files in {elapsed:.2f}s ({throughput:.1f} files/s)")
         if failed_files > 0:
             print(f"{failed_files} files failed due to I/O errors")
             sys.exit(1)
@@ -13,7 +13,8 @@ Features
 - Embeds Jupyter notebooks with nbconvert or nbviewer fallback
 - Generates SEO metadata (description, keywords) automatically
 - Creates navigation sidebar from directory structure
-- Supports incremental builds (only rebuilds changed files)
+- Supports incremental builds (only rebuilds changed files and the pages
+  that include a changed header)
 
 Architecture
 ------------
@@ -45,45 +46,49 @@ Optional:
     - nbconvert: For local Jupyter notebook rendering
     - BeautifulSoup4: For enhanced notebook HTML processing
 
+The optional dependencies are imported lazily, only once a ``.ipynb`` file is
+actually processed, and command-line parsing happens in ``main()``. Importing
+the module (e.g. from a test or benchmark) therefore only loads the standard
+library; keep it within a 250 ms budget (about 90 ms measured), checked with::
+
+    python -X importtime -c "import generate_docs"
+
 Usage
 -----
 ::
 
-    python generate_docs.py [--debug] [--force-rebuild]
+    python generate_docs.py [--debug] [--force-rebuild] [--profile [TRACE]]
 
 Options:
     --debug          Enable verbose debug output
     --force-rebuild  Rebuild all HTML files even if source unchanged
+    --profile        Record per-stage, per-file wall times and subprocess
+                     counts, write a Chrome trace (default: docs-profile.json
+                     in the repository root; open it in chrome://tracing or
+                     https://ui.perfetto.dev) and print the ten slowest pages
 
 Author: Vatsal Sanjay
 Organization: CoMPhy Lab, Durham University
 """
 import ast
+import contextlib
 import inspect
+import time
 import os, subprocess, re, shutil, argparse, html, json
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Tuple
-try:
-    from nbconvert import HTMLExporter
-    NBCONVERT_AVAILABLE = True
-except ImportError:
-    NBCONVERT_AVAILABLE = False
-    print("Warning: nbconvert not available. Falling back to nbviewer embedding.")
-
-try:
-    from bs4 import BeautifulSoup
-    BS4_AVAILABLE = True
-except ImportError:
-    BS4_AVAILABLE = False
-    print("Warning: BeautifulSoup4 not available. Some notebook rendering features may be limited.")
-
-# Parse args
-parser = argparse.ArgumentParser(description='Generate docs from source files')
-parser.add_argument('--debug', action='store_true', help='Enable debug output')
-parser.add_argument('--force-rebuild', action='store_true', help='Force rebuild all HTML files')
-args = parser.parse_args()
-DEBUG = args.debug
-FORCE_REBUILD = args.force_rebuild
+
+# Set from the command line in main(); importing the module has no side effects on them
+DEBUG = False
+FORCE_REBUILD = False
+
+# Optional notebook dependencies are imported on first use (see load_nbconvert/load_bs4),
+# so builds without any .ipynb never pay for importing nbconvert and its dependencies.
+_OPTIONAL_MODULES = {}
+
+# Build profiler, enabled by --profile (see BuildProfiler)
+PROFILER = None
 
 def debug_print(msg):
     """
@@ -94,6 +99,164 @@ def debug_print(msg):
     """
     if DEBUG: print(msg)
 
+def load_nbconvert():
+    """
+    Imports nbconvert on first use.
+
+    Returns:
+        The ``nbconvert.HTMLExporter`` class, or None if nbconvert is not installed.
+    """
+    if 'nbconvert' not in _OPTIONAL_MODULES:
+        try:
+            from nbconvert import HTMLExporter
+            _OPTIONAL_MODULES['nbconvert'] = HTMLExporter
+        except ImportError:
+            _OPTIONAL_MODULES['nbconvert'] = None
+            print("Warning: nbconvert not available. Falling back to nbviewer embedding.")
+    return _OPTIONAL_MODULES['nbconvert']
+
+def load_bs4():
+    """
+    Imports BeautifulSoup4 on first use.
+
+    Returns:
+        The ``bs4.BeautifulSoup`` class, or None if BeautifulSoup4 is not installed.
+    """
+    if 'bs4' not in _OPTIONAL_MODULES:
+        try:
+            from bs4 import BeautifulSoup
+            _OPTIONAL_MODULES['bs4'] = BeautifulSoup
+        except ImportError:
+            _OPTIONAL_MODULES['bs4'] = None
+            print("Warning: BeautifulSoup4 not available. Some notebook rendering features may be limited.")
+    return _OPTIONAL_MODULES['bs4']
+
+class BuildProfiler:
+    """
+    Records wall time per build stage and per page, plus subprocess counts.
+
+    Stages are timed with ``profile_stage()`` and attributed to the page
+    currently being generated (set with ``page()``); stages outside any page,
+    such as index and sitemap generation, are attributed to ``(site)``. The
+    recorded spans can be written as a Chrome trace and summarised as a
+    slowest-pages report.
+    """
+
+    SITE = "(site)"
+
+    def __init__(self):
+        self._origin = time.perf_counter()
+        self.events = []
+        self.current_page = None
+        self.page_totals: Dict[str, float] = {}
+        self.page_stages: Dict[str, Dict[str, float]] = {}
+        self.subprocess_counts: Dict[str, int] = {}
+
+    def _timestamp_us(self, t: float) -> float:
+        return (t - self._origin) * 1e6
+
+    @contextlib.contextmanager
+    def page(self, name: str):
+        """Times the generation of one page; stages inside are attributed to it."""
+        previous, self.current_page = self.current_page, name
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.current_page = previous
+            self.page_totals[name] = self.page_totals.get(name, 0.0) + (end - start)
+            self.events.append({
+                "name": name, "cat": "page", "ph": "X", "pid": 1, "tid": 1,
+                "ts": self._timestamp_us(start), "dur": (end - start) * 1e6,
+            })
+
+    @contextlib.contextmanager
+    def stage(self, name: str, subprocess_calls: int = 0):
+        """Times one stage of the current page and counts the subprocesses it runs."""
+        page = self.current_page or self.SITE
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            stages = self.page_stages.setdefault(page, {})
+            stages[name] = stages.get(name, 0.0) + (end - start)
+            if subprocess_calls:
+                self.subprocess_counts[name] = self.subprocess_counts.get(name, 0) + subprocess_calls
+            self.events.append({
+                "name": name, "cat": "stage", "ph": "X", "pid": 1, "tid": 1,
+                "ts": self._timestamp_us(start), "dur": (end - start) * 1e6,
+                "args": {"page": page, "subprocesses": subprocess_calls},
+            })
+
+    def write_trace(self, trace_path: Path) -> bool:
+        """
+        Writes the recorded spans in Chrome trace event format.
+
+        Returns:
+            True on success, False otherwise.
+        """
+        trace = {
+            "traceEvents": [
+                {"name": "process_name", "ph": "M", "pid": 1, "tid": 1, "args": {"name": "generate_docs"}},
+            ] + sorted(self.events, key=lambda event: event["ts"]),
+            "displayTimeUnit": "ms",
+            "otherData": {"subprocess_counts": self.subprocess_counts},
+        }
+        try:
+            with open(trace_path, 'w', encoding='utf-8') as f:
+                json.dump(trace, f)
+            return True
+        except OSError as e:
+            print(f"Error writing profile trace {trace_path}: {e}")
+            return False
+
+    def print_report(self, limit: int = 10) -> None:
+        """Prints stage totals, subprocess counts and the slowest pages with their stage breakdown."""
+        stage_totals: Dict[str, float] = {}
+        for stages in self.page_stages.values():
+            for name, seconds in stages.items():
+                stage_totals[name] = stage_totals.get(name, 0.0) + seconds
+
+        print("\nBuild profile")
+        print("  Stage totals:")
+        for name, seconds in sorted(stage_totals.items(), key=lambda item: -item[1]):
+            calls = self.subprocess_counts.get(name, 0)
+            calls_text = f" ({calls} subprocesses)" if calls else ""
+            print(f"    {name:<20} {seconds:8.3f}s{calls_text}")
+
+        slowest = sorted(self.page_totals.items(), key=lambda item: -item[1])[:limit]
+        print(f"  Slowest {len(slowest)} pages:")
+        for name, seconds in slowest:
+            breakdown = ", ".join(
+                f"{stage} {stage_seconds:.3f}s"
+                for stage, stage_seconds in sorted(self.page_stages.get(name, {}).items(), key=lambda item: -item[1])
+            )
+            print(f"    {seconds:8.3f}s  {name}")
+            if breakdown:
+                print(f"              {breakdown}")
+
+def profile_stage(name: str, subprocess_calls: int = 0):
+    """
+    Returns a context manager timing a build stage when profiling is enabled.
+
+    Args:
+        name: Stage name (e.g. "pandoc", "literate-c").
+        subprocess_calls: Number of subprocesses the stage runs.
+    """
+    if PROFILER is None:
+        return contextlib.nullcontext()
+    return PROFILER.stage(name, subprocess_calls)
+
+def profile_page(name: str):
+    """
+    Returns a context manager attributing the enclosed stages to a page when profiling is enabled.
+    """
+    if PROFILER is None:
+        return contextlib.nullcontext()
+    return PROFILER.page(name)
+
 def calculate_asset_prefix(output_path: Path, docs_dir: Path) -> str:
     """
     Returns the relative path prefix to reference assets from an HTML file based on its location within the documentation directory.
@@ -264,6 +427,8 @@ DOCS_RELATIVE_PATH = DOCS_DIR.relative_to(REPO_ROOT).as_posix()
 DOCS_URL_FRAGMENT = f"/{DOCS_RELATIVE_PATH.strip('/')}/"
 README_PATH = REPO_ROOT / 'README.md'
 INDEX_PATH = DOCS_DIR / 'index.html'
+# Build state, kept outside DOCS_DIR so it is not deployed with the site
+PAGE_METADATA_PATH = REPO_ROOT / '.github' / 'page-metadata.json'
 BASILISK_DIR = REPO_ROOT / 'basilisk'
 DARCSIT_DIR = BASILISK_DIR / 'src' / 'darcsit'
 TEMPLATE_PATH = REPO_ROOT / '.github' / 'assets' / 'custom_template.html'
@@ -448,6 +613,245 @@ def find_source_files(root_dir: Path, source_dirs: List[str]) -> List[Path]:
 
     return sorted(files)
 
+INCLUDE_DIRECTIVE_PATTERN = re.compile(r'^[ \t]*#[ \t]*include[ \t]*"([^"]+)"', re.MULTILINE)
+
+class IncludeIndex:
+    """
+    Prebuilt lookup table for ``#include`` link resolution and dependency tracking.
+
+    Built once per run from the local ``src-local/`` headers, the Basilisk
+    ``src/`` tree (when installed) and the ``#include "..."`` directives of all
+    documented source files. Resolving an include name to a documentation URL
+    is a dictionary lookup, and the reverse "included by" graph tells which
+    pages must be rebuilt when a header changes.
+
+    Attributes:
+        local_headers: Mapping of header file name to its path in ``src-local/``.
+        basilisk_headers: Set of header paths (relative to Basilisk ``src/``).
+        includes: Mapping of source file to the local files it includes.
+        included_by: Reverse mapping of local file to the files including it.
+    """
+
+    def __init__(self, repo_root: Path, docs_dir: Path):
+        self.repo_root = repo_root
+        self.docs_dir = docs_dir
+        self.local_headers: Dict[str, Path] = {}
+        self.basilisk_headers = set()
+        self.includes: Dict[Path, set] = {}
+        self.included_by: Dict[Path, set] = {}
+        self._link_cache: Dict[Tuple[str, str], Tuple[str, str]] = {}
+
+    def resolve_local(self, include_name: str, includer: Path = None) -> Path:
+        """
+        Returns the local file an include name refers to, or None.
+
+        Paths relative to the including file (e.g. ``../src-local/foo.h``) are
+        tried first, then the ``src-local/`` header of the same file name.
+        """
+        if includer is not None:
+            candidate = (includer.parent / include_name).resolve()
+            if candidate in self.includes or candidate in self.included_by:
+                return candidate
+        return self.local_headers.get(include_name.split('/')[-1])
+
+    def link_for(self, include_name: str, file_path: Path) -> Tuple[str, str]:
+        """
+        Returns the (url, title) of the link for an ``#include`` in a page.
+
+        Local headers link to their generated documentation page relative to
+        the page of ``file_path``; anything else links to the Basilisk source.
+        """
+        try:
+            page_dir = file_path.parent.relative_to(self.repo_root).as_posix()
+        except ValueError:
+            page_dir = file_path.parent.as_posix()
+        key = (include_name, page_dir)
+        cached = self._link_cache.get(key)
+        if cached is not None:
+            return cached
+
+        check_filename = include_name.split('/')[-1]
+        local_file_path = self.local_headers.get(check_filename)
+        if local_file_path is not None:
+            target_html_path = (self.docs_dir / 'src-local' / check_filename).with_suffix(local_file_path.suffix + '.html')
+            try:
+                relative_link = os.path.relpath(target_html_path, start=file_path.parent)
+                link_url = relative_link.replace('\\', '/')
+                link_url = link_url.replace(DOCS_URL_FRAGMENT, '/')
+            except ValueError:
+                link_url = target_html_path.as_uri()
+            link = (link_url, f"Link to local documentation for {include_name}")
+        else:
+            if self.basilisk_headers and include_name not in self.basilisk_headers:
+                debug_print(f"  [Debug] Include {include_name} not found in Basilisk source index")
+            link = (f"https://basilisk.fr/src/{include_name}", f"Link to Basilisk source for {include_name}")
+
+        self._link_cache[key] = link
+        return link
+
+    def dependents(self, changed_files) -> set:
+        """
+        Returns every file that directly or transitively includes one of ``changed_files``.
+        """
+        result = set()
+        stack = [Path(f).resolve() for f in changed_files]
+        while stack:
+            current = stack.pop()
+            for includer in self.included_by.get(current, ()):
+                if includer not in result:
+                    result.add(includer)
+                    stack.append(includer)
+        return result
+
+def build_include_index(repo_root: Path, basilisk_dir: Path, source_files: List[Path], docs_dir: Path) -> IncludeIndex:
+    """
+    Builds the include index for one documentation run.
+
+    Args:
+        repo_root: Path to the repository root.
+        basilisk_dir: Path to the Basilisk installation (its ``src/`` is indexed if present).
+        source_files: All source files that will be documented.
+        docs_dir: Path to the documentation output directory.
+
+    Returns:
+        The populated IncludeIndex.
+    """
+    index = IncludeIndex(repo_root, docs_dir)
+
+    local_dir = repo_root / 'src-local'
+    if local_dir.is_dir():
+        for header in local_dir.iterdir():
+            if header.is_file() and header.suffix == '.h':
+                index.local_headers[header.name] = header.resolve()
+
+    basilisk_src = basilisk_dir / 'src'
+    if basilisk_src.is_dir():
+        for dirpath, _, filenames in os.walk(basilisk_src):
+            rel_dir = Path(dirpath).relative_to(basilisk_src).as_posix()
+            for filename in filenames:
+                if filename.endswith('.h'):
+                    index.basilisk_headers.add(filename if rel_dir == '.' else f"{rel_dir}/{filename}")
+
+    resolved_sources = [f.resolve() for f in source_files]
+    for source in resolved_sources:
+        index.includes[source] = set()
+    for source in resolved_sources:
+        if source.suffix not in ('.c', '.h'):
+            continue
+        try:
+            content = source.read_text(encoding='utf-8')
+        except (OSError, UnicodeError) as e:
+            debug_print(f"  [Debug] Could not scan includes of {source}: {e}")
+            continue
+        for include_name in INCLUDE_DIRECTIVE_PATTERN.findall(content):
+            target = index.resolve_local(include_name, source)
+            if target is not None and target != source:
+                index.includes[source].add(target)
+                index.included_by.setdefault(target, set()).add(source)
+
+    debug_print(f"Include index: {len(index.local_headers)} local headers, "
+                f"{len(index.basilisk_headers)} Basilisk headers, "
+                f"{sum(len(v) for v in index.includes.values())} local include edges")
+    return index
+
+def sitemap_priority(url_path: str) -> str:
+    """
+    Returns the sitemap priority of a page: higher for index pages and local sources.
+    """
+    if 'index' in url_path or url_path.startswith('src-local/'):
+        return '0.8'
+    return '0.6'
+
+def load_page_metadata(metadata_path: Path) -> Dict[str, Dict[str, str]]:
+    """
+    Loads the page metadata table written by a previous run.
+
+    The table maps each page path (relative to the docs directory) to its
+    source path, title, description, lastmod date and sitemap priority.
+
+    Returns:
+        The metadata table, or an empty dictionary if it is missing or unreadable.
+    """
+    try:
+        with open(metadata_path, 'r', encoding='utf-8') as f:
+            table = json.load(f)
+        return table if isinstance(table, dict) else {}
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"Warning: Could not read page metadata table {metadata_path}: {e}")
+        return {}
+
+def save_page_metadata(metadata_path: Path, table: Dict[str, Dict[str, str]]) -> bool:
+    """
+    Writes the page metadata table atomically so later runs can reuse it.
+
+    Returns:
+        True on success, False otherwise.
+    """
+    temp_path = metadata_path.with_suffix('.json.tmp')
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(table, f, indent=1, sort_keys=True)
+            f.write('\n')
+        os.replace(temp_path, metadata_path)
+        return True
+    except OSError as e:
+        print(f"Warning: Could not write page metadata table {metadata_path}: {e}")
+        return False
+
+def record_page_metadata(page_metadata: Dict[str, Dict[str, str]], file_path: Path, output_html_path: Path,
+                         docs_dir: Path, repo_root: Path, title: str, description: str) -> None:
+    """
+    Records the metadata of one generated page in the page metadata table.
+
+    ``lastmod`` is taken from the source file's modification time, so the
+    sitemap only changes for pages whose source changed.
+    """
+    url_path = output_html_path.relative_to(docs_dir).as_posix()
+    try:
+        mtime = file_path.stat().st_mtime
+    except OSError:
+        mtime = datetime.now(timezone.utc).timestamp()
+    page_metadata[url_path] = {
+        "source": file_path.relative_to(repo_root).as_posix(),
+        "title": title,
+        "description": description or "",
+        "lastmod": datetime.fromtimestamp(mtime, timezone.utc).strftime('%Y-%m-%d'),
+        "source_mtime": mtime,
+        "priority": sitemap_priority(url_path),
+    }
+
+def backfill_page_metadata(page_metadata: Dict[str, Dict[str, str]], file_path: Path, output_html_path: Path,
+                           docs_dir: Path, repo_root: Path) -> None:
+    """
+    Adds a table entry for a page that was skipped by an incremental build.
+
+    Existing entries are kept when the source is unchanged. Otherwise the
+    description is read once from the page's meta tag, which is only needed
+    for pages generated before the table existed.
+    """
+    url_path = output_html_path.relative_to(docs_dir).as_posix()
+    entry = page_metadata.get(url_path)
+    try:
+        mtime = file_path.stat().st_mtime
+    except OSError:
+        mtime = None
+    if entry and entry.get("source_mtime") == mtime:
+        return
+
+    description = entry.get("description", "") if entry else ""
+    if not description:
+        try:
+            html_content = output_html_path.read_text(encoding='utf-8')
+            desc_match = re.search(r'<meta\s+name="description"\s+content="([^"]+)"', html_content)
+            if desc_match:
+                description = html.unescape(desc_match.group(1).strip())
+        except Exception as e:
+            print(f"Error extracting description from {output_html_path}: {e}")
+    title = file_path.relative_to(repo_root).as_posix().strip('- \t')
+    record_page_metadata(page_metadata, file_path, output_html_path, docs_dir, repo_root, title, description)
+
 def process_markdown_file(file_path: Path) -> str:
     """
     Reads and returns the content of a Markdown file for further processing or conversion.
@@ -559,18 +963,22 @@ def process_jupyter_notebook(file_path: Path) -> str:
         
         # Try to render notebook locally with nbconvert if available
         notebook_html_content = ""
-        if NBCONVERT_AVAILABLE:
+        with profile_stage('nbconvert-import'):
+            HTMLExporter = load_nbconvert()
+        if HTMLExporter is not None:
             try:
                 # Configure the HTML exporter
                 html_exporter = HTMLExporter()
                 html_exporter.template_name = 'classic'
                 
                 # Convert notebook to HTML
-                (body, resources) = html_exporter.from_filename(str(file_path))
+                with profile_stage('nbconvert'):
+                    (body, resources) = html_exporter.from_filename(str(file_path))
                 
                 # Extract just the notebook content (remove full HTML structure)
                 # We'll embed this within our existing page structure
-                if BS4_AVAILABLE:
+                BeautifulSoup = load_bs4()
+                if BeautifulSoup is not None:
                     soup = BeautifulSoup(body, 'html.parser')
                     
                     # Find the main notebook container
@@ -913,14 +1321,15 @@ def process_c_file(file_path: Path, literate_c_script: Path) -> str:
     literate_c_cmd = [str(literate_c_script), str(file_path), '0']
     
     try:
-        preproc_proc = subprocess.Popen(
-            literate_c_cmd, 
-            stdout=subprocess.PIPE, 
-            stderr=subprocess.PIPE, 
-            text=True, 
-            encoding='utf-8'
-        )
-        content, stderr = preproc_proc.communicate()
+        with profile_stage('literate-c', subprocess_calls=1):
+            preproc_proc = subprocess.Popen(
+                literate_c_cmd, 
+                stdout=subprocess.PIPE, 
+                stderr=subprocess.PIPE, 
+                text=True, 
+                encoding='utf-8'
+            )
+            content, stderr = preproc_proc.communicate()
 
         if preproc_proc.returncode == 0 and content.strip():
             return content.replace('~~~literatec', '~~~c')
@@ -1023,7 +1432,8 @@ def run_pandoc(pandoc_input: str, output_html_path: Path, template_path: Path,
     debug_print(f"  [Debug Pandoc] Command: {' '.join(pandoc_cmd)}")
     debug_print(f"  [Debug Pandoc] Input content length: {len(pandoc_input)} chars")
     
-    process = subprocess.run(pandoc_cmd, input=pandoc_input, text=True, capture_output=True)
+    with profile_stage('pandoc', subprocess_calls=1):
+        process = subprocess.run(pandoc_cmd, input=pandoc_input, text=True, capture_output=True)
     
     debug_print(f"  [Debug Pandoc] Return Code: {process.returncode}")
     if process.stdout: debug_print(f"  [Debug Pandoc] STDOUT:\n{process.stdout}")
@@ -1211,15 +1621,16 @@ def run_awk_post_processing(html_content: str, file_path: Path,
     try:
         with open(temp_output_path, 'w', encoding='utf-8') as f_out:
             postproc_cmd = ['awk', '-v', f'tags={relative_tags_path}', '-f', str(decl_anchors_script)]
-            postproc_proc = subprocess.Popen(
-                postproc_cmd, 
-                stdin=subprocess.PIPE, 
-                stdout=f_out, 
-                stderr=subprocess.PIPE, 
-                text=True, 
-                encoding='utf-8'
-            )
-            _, stderr = postproc_proc.communicate(input=html_content)
+            with profile_stage('awk', subprocess_calls=1):
+                postproc_proc = subprocess.Popen(
+                    postproc_cmd, 
+                    stdin=subprocess.PIPE, 
+                    stdout=f_out, 
+                    stderr=subprocess.PIPE, 
+                    text=True, 
+                    encoding='utf-8'
+                )
+                _, stderr = postproc_proc.communicate(input=html_content)
 
             if postproc_proc.returncode != 0:
                 raise RuntimeError(f"Awk post-processing failed: {stderr}")
@@ -1233,7 +1644,8 @@ def run_awk_post_processing(html_content: str, file_path: Path,
             temp_output_path.unlink()
 
 def post_process_c_html(html_content: str, file_path: Path, 
-                      repo_root: Path, darcsit_dir: Path, docs_dir: Path) -> str:
+                      repo_root: Path, darcsit_dir: Path, docs_dir: Path,
+                      include_index: IncludeIndex = None) -> str:
     """
                       Post-processes HTML generated from C or C++ source files for enhanced documentation.
                       
@@ -1247,10 +1659,14 @@ def post_process_c_html(html_content: str, file_path: Path,
                           repo_root: Path to the repository root.
                           darcsit_dir: Path to the Darcsit directory.
                           docs_dir: Path to the documentation output directory.
+                          include_index: Prebuilt include index used to resolve `#include` links. Built on demand when omitted.
                       
                       Returns:
                           The post-processed HTML content as a string.
                       """
+    if include_index is None:
+        include_index = build_include_index(repo_root, BASILISK_DIR, [], docs_dir)
+
     # Remove trailing line numbers
     cleaned_html = re.sub(
         r'(\s*(?:<span class="[^"]*">\s*\d+\s*</span>|\s+\d+)\s*)+(\s*</span>)', 
@@ -1314,22 +1730,7 @@ def post_process_c_html(html_content: str, file_path: Path,
         span_tag_close = match.group(4)
         
         original_span_tag = f'{span_tag_open}\"{filename}\"{span_tag_close}'
-        
-        check_filename = filename.split('/')[-1]
-        local_file_path = repo_root / 'src-local' / check_filename
-        
-        if local_file_path.is_file():
-            target_html_path = (docs_dir / 'src-local' / check_filename).with_suffix(local_file_path.suffix + '.html')
-            try:
-                relative_link = os.path.relpath(target_html_path, start=file_path.parent)
-                link_url = relative_link.replace('\\', '/')
-                link_url = link_url.replace(DOCS_URL_FRAGMENT, '/')
-            except ValueError:
-                link_url = target_html_path.as_uri()
-            link_title = f"Link to local documentation for {filename}"
-        else:
-            link_url = f"https://basilisk.fr/src/{filename}"
-            link_title = f"Link to Basilisk source for {filename}"
+        link_url, link_title = include_index.link_for(filename, file_path)
         
         return f'{prefix}<a href="{link_url}" title="{link_title}">{original_span_tag}</a>'
     
@@ -1515,11 +1916,13 @@ document.addEventListener('DOMContentLoaded', function() {
 
 def process_file_with_page2html_logic(file_path: Path, output_html_path: Path, repo_root: Path, 
                                      basilisk_dir: Path, darcsit_dir: Path, template_path: Path, 
-                                     base_url: str, wiki_title: str, literate_c_script: Path, docs_dir: Path) -> bool:
+                                     base_url: str, wiki_title: str, literate_c_script: Path, docs_dir: Path,
+                                     include_index: IncludeIndex = None,
+                                     page_metadata: Dict[str, Dict[str, str]] = None) -> bool:
     """
                                      Converts a source file to an HTML documentation page with type-specific post-processing.
                                      
-                                     Handles copying Jupyter notebooks, prepares input for Pandoc conversion, extracts SEO metadata, and applies appropriate post-processing for Python, shell, Markdown, Jupyter, or C/C++ files. Inserts JavaScript for code block copy functionality. Returns True on success, False on error.
+                                     Handles copying Jupyter notebooks, prepares input for Pandoc conversion, extracts SEO metadata, and applies appropriate post-processing for Python, shell, Markdown, Jupyter, or C/C++ files. Inserts JavaScript for code block copy functionality. When a page metadata table is given, records the page's title, description, lastmod and priority in it. Returns True on success, False on error.
                                      """
     
     # Function to ensure script tags are properly sanitized during the conversion process
@@ -1566,7 +1969,8 @@ def process_file_with_page2html_logic(file_path: Path, output_html_path: Path, r
         pandoc_input_content = prepare_pandoc_input(file_path, literate_c_script)
         
         # Apply additional pre-processing to sanitize input
-        pandoc_input_content = sanitize_pandoc_input(pandoc_input_content)
+        with profile_stage('sanitize-input'):
+            pandoc_input_content = sanitize_pandoc_input(pandoc_input_content)
         
         # Calculate relative URL path
         page_url = (base_url + output_html_path.relative_to(docs_dir).as_posix()).replace('//', '/')
@@ -1611,7 +2015,8 @@ def process_file_with_page2html_logic(file_path: Path, output_html_path: Path, r
             with open(output_html_path, 'r', encoding='utf-8') as f:
                 html_content = f.read()
             
-            processed_html = post_process_python_shell_html(html_content)
+            with profile_stage('post-process'):
+                processed_html = post_process_python_shell_html(html_content)
             
             with open(output_html_path, 'w', encoding='utf-8') as f:
                 f.write(processed_html)
@@ -1624,13 +2029,20 @@ def process_file_with_page2html_logic(file_path: Path, output_html_path: Path, r
             processed_html = run_awk_post_processing(html_content, file_path, repo_root, darcsit_dir)
             
             # Further post-process
-            cleaned_html = post_process_c_html(processed_html, file_path, repo_root, darcsit_dir, docs_dir)
+            with profile_stage('post-process-c'):
+                cleaned_html = post_process_c_html(processed_html, file_path, repo_root, darcsit_dir, docs_dir, include_index)
             
             with open(output_html_path, 'w', encoding='utf-8') as f:
                 f.write(cleaned_html)
         
         # Insert JavaScript for code blocks
-        insert_javascript_in_html(output_html_path)
+        with profile_stage('insert-js'):
+            insert_javascript_in_html(output_html_path)
+        
+        # Record page metadata for index pages and the sitemap
+        if page_metadata is not None:
+            record_page_metadata(page_metadata, file_path, output_html_path, docs_dir, repo_root,
+                                 page_title, seo_metadata.get("description", ""))
         
         return True
     
@@ -1742,11 +2154,12 @@ def convert_directory_tree_to_html(readme_content: str) -> str:
     
     return modified_content
 
-def generate_directory_index(directory_name: str, directory_path: Path, generated_files: Dict[Path, Path], docs_dir: Path, repo_root: Path) -> bool:
+def generate_directory_index(directory_name: str, directory_path: Path, generated_files: Dict[Path, Path], docs_dir: Path, repo_root: Path,
+                             page_metadata: Dict[str, Dict[str, str]] = None) -> bool:
     """
     Generates an index.html page for a directory, listing all generated documentation files.
     
-    Creates a directory index page that displays links to all HTML documentation files within the specified directory, including file descriptions extracted from meta tags. The output uses a template, formats the directory name for display, and includes file-type icons and descriptions. Returns True on success, or False if an error occurs.
+    Creates a directory index page that displays links to all HTML documentation files within the specified directory, including file descriptions. Descriptions come from the page metadata table when given; otherwise they are extracted from the meta tags of the generated pages. The output uses a template, formats the directory name for display, and includes file-type icons and descriptions. Returns True on success, or False if an error occurs.
     """
     try:
         index_path = directory_path / "index.html"
@@ -1766,16 +2179,21 @@ def generate_directory_index(directory_name: str, directory_path: Path, generate
                 
         # Extract descriptions
         for html_path, info in directory_files.items():
-            try:
-                html_content = html_path.read_text(encoding='utf-8')
-                desc_match = re.search(r'<meta\s+name="description"\s+content="([^"]+)"', html_content)
-                if desc_match:
-                    description = desc_match.group(1).strip()
-                    if len(description) > 120:
-                        description = description[:117] + "..."
-                    info["description"] = description
-            except Exception as e:
-                print(f"Error extracting description from {html_path}: {e}")
+            if page_metadata is not None:
+                entry = page_metadata.get(html_path.relative_to(docs_dir).as_posix(), {})
+                description = html.escape(entry.get("description", "").strip(), quote=False)
+            else:
+                description = ""
+                try:
+                    html_content = html_path.read_text(encoding='utf-8')
+                    desc_match = re.search(r'<meta\s+name="description"\s+content="([^"]+)"', html_content)
+                    if desc_match:
+                        description = desc_match.group(1).strip()
+                except Exception as e:
+                    print(f"Error extracting description from {html_path}: {e}")
+            if len(description) > 120:
+                description = description[:117] + "..."
+            info["description"] = description
         
         # Read template
         template_path = TEMPLATE_PATH
@@ -1989,7 +2407,8 @@ def generate_index(readme_path: Path, index_path: Path, generated_files: Dict[Pa
     debug_print(f"  [Debug Index] Target path: {index_path}")
     debug_print(f"  [Debug Index] Command: {' '.join(pandoc_cmd)}")
 
-    process = subprocess.run(pandoc_cmd, input=final_readme_content, text=True, capture_output=True, check=False)
+    with profile_stage('pandoc', subprocess_calls=1):
+        process = subprocess.run(pandoc_cmd, input=final_readme_content, text=True, capture_output=True, check=False)
 
     if process.returncode != 0:
         print(f"Error generating index.html: {process.stderr}")
@@ -2038,11 +2457,12 @@ def generate_robots_txt(docs_dir: Path) -> bool:
         print(f"Error generating robots.txt: {e}")
         return False
 
-def generate_sitemap(docs_dir: Path, generated_files: Dict[Path, Path]) -> bool:
+def generate_sitemap(docs_dir: Path, generated_files: Dict[Path, Path],
+                     page_metadata: Dict[str, Dict[str, str]] = None) -> bool:
     """
     Generates a sitemap.xml file listing all generated HTML documentation pages for search engines.
     
-    The sitemap includes the homepage and all generated HTML files, assigning higher priority to index pages and files in key directories. Returns True if the sitemap is created successfully, otherwise False.
+    The sitemap includes the homepage and all generated HTML files, assigning higher priority to index pages and files in key directories. When a page metadata table is given, each entry's ``lastmod`` and priority are taken from it, so unchanged pages keep their dates between builds. Entries are written as they are produced. Returns True if the sitemap is created successfully, otherwise False.
     """
     sitemap_path = docs_dir / 'sitemap.xml'
     
@@ -2062,16 +2482,16 @@ def generate_sitemap(docs_dir: Path, generated_files: Dict[Path, Path]) -> bool:
             for _, html_path in generated_files.items():
                 relative_path = html_path.relative_to(docs_dir)
                 url_path = str(relative_path).replace('\\', '/')
+                entry = page_metadata.get(url_path, {}) if page_metadata is not None else {}
                 
                 f.write('  <url>\n')
                 f.write(f'    <loc>{BASE_DOMAIN}/{url_path}</loc>\n')
+                if entry.get("lastmod"):
+                    f.write(f'    <lastmod>{entry["lastmod"]}</lastmod>\n')
                 f.write('    <changefreq>monthly</changefreq>\n')
                 
                 # Higher priority for important files
-                if 'index' in url_path or url_path.startswith('src-local/'):
-                    f.write('    <priority>0.8</priority>\n')
-                else:
-                    f.write('    <priority>0.6</priority>\n')
+                f.write(f'    <priority>{entry.get("priority") or sitemap_priority(url_path)}</priority>\n')
                     
                 f.write('  </url>\n')
             
@@ -2360,12 +2780,40 @@ def patch_basilisk_js_assets(docs_assets_js_dir: Path) -> None:
             except Exception as e:
                 print(f"Warning: Could not write {file_path}: {e}")
 
-def main():
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    """
+    Parses the command-line options of the documentation generator.
+
+    Args:
+        argv: Argument list to parse; defaults to ``sys.argv[1:]``.
+
+    Returns:
+        The parsed arguments namespace.
+    """
+    parser = argparse.ArgumentParser(description='Generate docs from source files')
+    parser.add_argument('--debug', action='store_true', help='Enable debug output')
+    parser.add_argument('--force-rebuild', action='store_true', help='Force rebuild all HTML files')
+    parser.add_argument('--profile', nargs='?', const=str(REPO_ROOT / 'docs-profile.json'), default=None,
+                        metavar='TRACE',
+                        help='Profile the build: write a Chrome trace to TRACE (default: docs-profile.json '
+                             'in the repository root) and print the slowest pages')
+    return parser.parse_args(argv)
+
+def main(argv: List[str] = None):
     """
     Generates the complete HTML documentation site for the project.
     
     Creates the documentation output directory, optionally cleans existing HTML files if force rebuild is enabled, copies all required assets, processes each supported source file into HTML with appropriate post-processing, generates index pages for directories and the main index from README.md, and creates robots.txt and sitemap.xml for search engines. Also copies additional JavaScript files required for Basilisk integration and cleans up temporary files.
+
+    Args:
+        argv: Command-line arguments; defaults to ``sys.argv[1:]``.
     """
+    global DEBUG, FORCE_REBUILD, PROFILER
+    args = parse_args(argv)
+    DEBUG = args.debug
+    FORCE_REBUILD = args.force_rebuild
+    PROFILER = BuildProfiler() if args.profile else None
+
     if not validate_config():
         return
     
@@ -2386,7 +2834,9 @@ def main():
         # Copy assets
         print("\nCopying assets...")
         assets_dir = REPO_ROOT / '.github' / 'assets'
-        if not copy_assets(assets_dir, DOCS_DIR):
+        with profile_stage('copy-assets'):
+            assets_copied = copy_assets(assets_dir, DOCS_DIR)
+        if not assets_copied:
             print("Failed to copy assets.")
             return
         
@@ -2396,50 +2846,81 @@ def main():
             print("No source files found.")
             return
         
+        # Build the include index once for link resolution and dependency tracking
+        with profile_stage('include-index'):
+            include_index = build_include_index(REPO_ROOT, BASILISK_DIR, source_files, DOCS_DIR)
+        
+        # Pages whose source, or any header they include, changed since they were generated
+        output_paths = {}
+        changed_files = set()
+        for file_path in source_files:
+            relative_path = file_path.relative_to(REPO_ROOT)
+            output_html_path = DOCS_DIR / relative_path.with_suffix(relative_path.suffix + '.html')
+            output_paths[file_path] = output_html_path
+            if output_html_path.exists() and file_path.stat().st_mtime > output_html_path.stat().st_mtime:
+                changed_files.add(file_path.resolve())
+        stale_files = changed_files | include_index.dependents(changed_files)
+        
         # Dictionary for generated files
         generated_files = {}
         
+        # Page metadata table (title, description, lastmod, priority) for index pages and the sitemap
+        page_metadata = {} if FORCE_REBUILD else load_page_metadata(PAGE_METADATA_PATH)
+        
         # Process each file
         for file_path in source_files:
             # Create output path
-            relative_path = file_path.relative_to(REPO_ROOT)
-            output_html_path = DOCS_DIR / relative_path.with_suffix(relative_path.suffix + '.html')
+            output_html_path = output_paths[file_path]
             
             # Create output directory
             output_html_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Skip if not forced and file exists
-            if not FORCE_REBUILD and output_html_path.exists():
+            # Skip if not forced, file exists and neither it nor its includes changed
+            if not FORCE_REBUILD and output_html_path.exists() and file_path.resolve() not in stale_files:
                 print(f"  Skipping existing file: {output_html_path.relative_to(DOCS_DIR)}")
                 generated_files[file_path] = output_html_path
+                backfill_page_metadata(page_metadata, file_path, output_html_path, DOCS_DIR, REPO_ROOT)
                 continue
             
             # Process file
-            if process_file_with_page2html_logic(
-                file_path, 
-                output_html_path, 
-                REPO_ROOT, 
-                BASILISK_DIR, 
-                DARCSIT_DIR, 
-                TEMPLATE_PATH, 
-                BASE_URL, 
-                WIKI_TITLE, 
-                LITERATE_C_SCRIPT,
-                DOCS_DIR
-            ):
+            with profile_page(file_path.relative_to(REPO_ROOT).as_posix()):
+                page_generated = process_file_with_page2html_logic(
+                    file_path, 
+                    output_html_path, 
+                    REPO_ROOT, 
+                    BASILISK_DIR, 
+                    DARCSIT_DIR, 
+                    TEMPLATE_PATH, 
+                    BASE_URL, 
+                    WIKI_TITLE, 
+                    LITERATE_C_SCRIPT,
+                    DOCS_DIR,
+                    include_index,
+                    page_metadata
+                )
+            if page_generated:
                 generated_files[file_path] = output_html_path
         
+        # Drop entries of pages that no longer exist and persist the table
+        current_pages = {html_path.relative_to(DOCS_DIR).as_posix() for html_path in generated_files.values()}
+        page_metadata = {url: entry for url, entry in page_metadata.items() if url in current_pages}
+        save_page_metadata(PAGE_METADATA_PATH, page_metadata)
+        
         # Generate folder index pages
         print("\nGenerating folder index pages...")
         for source_dir in SOURCE_DIRS:
             docs_source_dir = DOCS_DIR / source_dir
             if docs_source_dir.exists():
-                if not generate_directory_index(source_dir, docs_source_dir, generated_files, DOCS_DIR, REPO_ROOT):
+                with profile_stage('directory-index'):
+                    index_generated = generate_directory_index(source_dir, docs_source_dir, generated_files, DOCS_DIR, REPO_ROOT, page_metadata)
+                if not index_generated:
                     print(f"Failed to generate index for {source_dir}.")
         
         # Generate main index.html
         print("\nGenerating main index.html...")
-        if not generate_index(README_PATH, INDEX_PATH, generated_files, DOCS_DIR, REPO_ROOT):
+        with profile_page('index.html'):
+            index_generated = generate_index(README_PATH, INDEX_PATH, generated_files, DOCS_DIR, REPO_ROOT)
+        if not index_generated:
             print("Failed to generate index.html.")
             return
         
@@ -2448,7 +2929,8 @@ def main():
         generate_robots_txt(DOCS_DIR)
         
         print("\nGenerating sitemap...")
-        generate_sitemap(DOCS_DIR, generated_files)
+        with profile_stage('sitemap'):
+            generate_sitemap(DOCS_DIR, generated_files, page_metadata)
         
         print("\nDocumentation generation complete.")
         print(f"Output generated in: {DOCS_DIR}")
@@ -2476,5 +2958,12 @@ def main():
             except Exception as e:
                 print(f"Warning: Could not delete temporary template file: {e}")
 
+        # Report the build profile
+        if PROFILER is not None:
+            PROFILER.print_report()
+            trace_path = Path(args.profile)
+            if PROFILER.write_trace(trace_path):
+                print(f"Profile trace written to {trace_path}")
+
 if __name__ == "__main__":
     main()
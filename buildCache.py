@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Compile-Once Build Cache
+
+Caches compiled case binaries so that `runSimulation.sh` and `runSweep.py`
+only call `qcc` when something relevant changed. The cache key is a hash of
+
+- the case source,
+- every header it includes, directly or transitively, from the case
+  directory or `src-local` (headers from the Basilisk tree are covered by
+  the location and modification time of `qcc`),
+- the compiler flags and the `CC99` compiler override used for MPI
+  builds.
+
+Binaries are stored in a shared cache directory and hard-linked into the
+run directories (copied when the cache is on another file system), so a
+run keeps its binary even if the cache entry is evicted later. When the
+cache grows beyond its size limit, the least recently used entries are
+removed.
+
+Usage:
+    python buildCache.py --case simulationCases/dropImpact.c --output simulationCases/dropImpact/dropImpact
+
+Environment:
+    MULTIRHEOFLOW_BUILD_CACHE       Cache directory (default: ~/.cache/multirheoflow/builds)
+    MULTIRHEOFLOW_BUILD_CACHE_SIZE  Size limit, e.g. 500M or 2G (default: 2G)
+
+Dependencies:
+    - qcc (Basilisk) on PATH
+
+Author: Vatsal Sanjay
+Contact: vatsalsanjay@gmail.com
+Affiliation: Physics of Fluids Group
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent
+INCLUDE_DIRS = [REPO_ROOT / 'src-local', REPO_ROOT.parent / 'src-local']
+QCC_FLAGS = ['-O2', '-Wall', '-disable-dimensions']
+DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'multirheoflow' / 'builds'
+DEFAULT_MAX_SIZE = '2G'
+META_FILE = 'meta.json'
+
+INCLUDE_PATTERN = re.compile(rb'^\s*#\s*include\s+"([^"]+)"', re.MULTILINE)
+SIZE_UNITS = {'': 1, 'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30, 'T': 1 << 40}
+
+
+def parse_size(text):
+    """
+    Parses a size such as `500M` or `2G`.
+
+    Args:
+        text (str): Number of bytes with an optional K/M/G/T suffix
+
+    Returns:
+        int: Size in bytes
+
+    Raises:
+        ValueError: If the size cannot be parsed
+    """
+    match = re.fullmatch(r'\s*([0-9.]+)\s*([KMGT]?)i?B?\s*', text, re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Invalid size: {text}")
+    return int(float(match.group(1))*SIZE_UNITS[match.group(2).upper()])
+
+
+def local_includes(case_file):
+    """
+    Finds the headers a case includes from its own directory or
+    `src-local`, following includes transitively.
+
+    Args:
+        case_file (Path): Case source (.c)
+
+    Returns:
+        list: Resolved header paths, sorted
+    """
+    found = {}
+    stack = [Path(case_file)]
+    while stack:
+        source = stack.pop()
+        for name in INCLUDE_PATTERN.findall(source.read_bytes()):
+            name = name.decode('utf-8', 'replace')
+            for directory in [source.parent] + INCLUDE_DIRS:
+                candidate = (directory / name).resolve()
+                if candidate.is_file():
+                    if candidate not in found:
+                        found[candidate] = True
+                        stack.append(candidate)
+                    break
+    return sorted(found)
+
+
+def cache_key(case_file, flags):
+    """
+    Hashes everything that determines the compiled binary.
+
+    Args:
+        case_file (Path): Case source (.c)
+        flags (list): qcc flags
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([flags, os.environ.get('CC99', '')]).encode())
+    qcc = shutil.which('qcc')
+    if qcc:
+        digest.update(f"{qcc}:{os.stat(qcc).st_mtime_ns}".encode())
+    for path in [Path(case_file)] + local_includes(case_file):
+        digest.update(path.name.encode() + b'\0' + path.read_bytes() + b'\0')
+    return digest.hexdigest()
+
+
+def compile_into(case_file, flags, build_dir):
+    """
+    Compiles a case with qcc inside `build_dir`.
+
+    Args:
+        case_file (Path): Case source (.c)
+        flags (list): qcc flags
+        build_dir (Path): Empty directory for the source copy and binary
+
+    Returns:
+        Path: The binary
+
+    Raises:
+        RuntimeError: If qcc is missing or compilation fails
+    """
+    if shutil.which('qcc') is None:
+        raise RuntimeError("qcc not found on PATH; install Basilisk (http://basilisk.fr)")
+    shutil.copy2(case_file, build_dir / case_file.name)
+    binary = build_dir / case_file.stem
+    cmd = (['qcc'] + [f'-I{d}' for d in INCLUDE_DIRS] + list(flags) +
+           [case_file.name, '-o', binary.name, '-lm'])
+    result = subprocess.run(cmd, cwd=build_dir, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"qcc failed for {case_file.name}:\n{result.stderr}")
+    return binary
+
+
+def entry_size(entry):
+    """
+    Returns:
+        int: Bytes used by a cache entry
+    """
+    return sum(p.stat().st_size for p in entry.iterdir() if p.is_file())
+
+
+def evict(cache_dir, max_size, keep=None):
+    """
+    Removes least recently used entries until the cache fits `max_size`.
+
+    Args:
+        cache_dir (Path): Cache directory
+        max_size (int): Size limit in bytes
+        keep (Path): Entry that must not be removed
+
+    Returns:
+        list: Removed entries
+    """
+    entries = []
+    for entry in cache_dir.iterdir():
+        meta = entry / META_FILE
+        if entry.is_dir() and meta.exists():
+            entries.append((meta.stat().st_mtime, entry_size(entry), entry))
+    total = sum(size for _, size, _ in entries)
+    removed = []
+    for _, size, entry in sorted(entries):
+        if total <= max_size:
+            break
+        if keep is not None and entry == keep:
+            continue
+        shutil.rmtree(entry, ignore_errors=True)
+        total -= size
+        removed.append(entry)
+    return removed
+
+
+def cached_build(case_file, flags=QCC_FLAGS, cache_dir=None, max_size=None,
+                 verbose=True):
+    """
+    Returns the cached binary of a case, compiling it on a miss.
+
+    Entries are built in a temporary directory and renamed into place, so
+    concurrent builds of the same key are safe; the loser's build is
+    discarded.
+
+    Args:
+        case_file (Path): Case source (.c)
+        flags (list): qcc flags
+        cache_dir (Path): Cache directory (default: MULTIRHEOFLOW_BUILD_CACHE)
+        max_size (int): Size limit in bytes (default: MULTIRHEOFLOW_BUILD_CACHE_SIZE)
+        verbose (bool): Print hits and misses
+
+    Returns:
+        Path: Binary inside the cache
+    """
+    case_file = Path(case_file).resolve()
+    cache_dir = Path(cache_dir or os.environ.get('MULTIRHEOFLOW_BUILD_CACHE',
+                                                 DEFAULT_CACHE_DIR))
+    if max_size is None:
+        max_size = parse_size(os.environ.get('MULTIRHEOFLOW_BUILD_CACHE_SIZE',
+                                             DEFAULT_MAX_SIZE))
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    key = cache_key(case_file, flags)
+    entry = cache_dir / f"{case_file.stem}-{key[:16]}"
+    binary = entry / case_file.stem
+    if binary.exists():
+        os.utime(entry / META_FILE)  # mark as recently used
+        if verbose:
+            print(f"Build cache hit: {case_file.name} ({entry.name})")
+    else:
+        if verbose:
+            print(f"Build cache miss: compiling {case_file.name}")
+        build_dir = Path(tempfile.mkdtemp(dir=cache_dir, prefix='.build-'))
+        try:
+            compile_into(case_file, flags, build_dir)
+            meta = {'case': str(case_file), 'flags': list(flags), 'key': key,
+                    'created': time.time()}
+            (build_dir / META_FILE).write_text(json.dumps(meta, indent=2))
+            try:
+                os.rename(build_dir, entry)
+            except OSError:
+                if not binary.exists():
+                    raise
+        finally:
+            shutil.rmtree(build_dir, ignore_errors=True)
+
+    for removed in evict(cache_dir, max_size, keep=entry):
+        if verbose:
+            print(f"Build cache evicted {removed.name}")
+    return binary
+
+
+def link_binary(binary, dest):
+    """
+    Hard-links a cached binary to `dest`, copying it when the cache is on
+    another file system. An existing `dest` is replaced atomically.
+
+    Args:
+        binary (Path): Binary inside the cache
+        dest (Path): Path of the binary in the run directory
+    """
+    dest = Path(dest)
+    if dest.exists() and os.path.samefile(binary, dest):
+        return  # rename() would leave the temporary link behind
+    tmp = dest.with_name(f".{dest.name}.tmp{os.getpid()}")
+    if tmp.exists():
+        tmp.unlink()
+    try:
+        os.link(binary, tmp)
+    except OSError:
+        shutil.copy2(binary, tmp)
+    os.replace(tmp, dest)
+
+
+def parse_args(argv=None):
+    """
+    Parses the command line.
+
+    Args:
+        argv (list): Arguments (default: sys.argv[1:])
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Compile a case through the build cache")
+    parser.add_argument('--case', required=True, help='Case source (.c)')
+    parser.add_argument('--output', required=True,
+                        help='Where to place the binary (hard link into the cache)')
+    parser.add_argument('--flags', default=' '.join(QCC_FLAGS),
+                        help=f"qcc flags (default: '{' '.join(QCC_FLAGS)}')")
+    parser.add_argument('--cache', default=None,
+                        help='Cache directory (default: $MULTIRHEOFLOW_BUILD_CACHE or '
+                             f'{DEFAULT_CACHE_DIR})')
+    parser.add_argument('--max-size', default=None,
+                        help='Cache size limit such as 500M or 2G '
+                             f'(default: $MULTIRHEOFLOW_BUILD_CACHE_SIZE or {DEFAULT_MAX_SIZE})')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Places the cached (or freshly compiled) binary of a case at --output.
+    """
+    args = parse_args(argv)
+    case_file = Path(args.case)
+    if not case_file.is_file():
+        print(f"Case source not found: {args.case}")
+        return 1
+    try:
+        max_size = parse_size(args.max_size) if args.max_size else None
+        binary = cached_build(case_file, args.flags.split(), args.cache, max_size)
+    except (RuntimeError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+    link_binary(binary, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Snapshot Retention and Compaction
+
+`event writingFiles` dumps a full snapshot every `tsnap` into
+`intermediate/`, which adds up to tens of GB per run at high levels. This
+tool compacts the snapshots of a run directory, after the run or while it
+is still going (`--watch`):
+
+- Thinning: a retention schedule keeps snapshots densely early and
+  sparsely late, e.g. `0.5:0.01,2:0.05,inf:0.2` keeps one snapshot per
+  0.01 up to t = 0.5, one per 0.05 up to t = 2 and one per 0.2 after.
+  The first and the newest snapshot are always kept.
+- Field dropping: `--keep-fields` rewrites the dumps with only the listed
+  fields (`viz` keeps what `VideoAxi.py` needs). Such snapshots are for
+  post-processing only; restart from `restart` instead.
+- Compression: the remaining snapshots are gzip- or xz-compressed.
+
+Compacted files get a `.lite`, `.gz` or `.xz` suffix, so `resumeRun.py`
+never restarts from them. `intermediate/manifest.json` lists every frame
+with its time, file, compression and fields; `VideoAxi.py` reads it to
+find the frames. The `restart` file is never touched.
+
+Usage:
+    python compactSnapshots.py --run-dir simulationCases/dropImpact --schedule 0.5:0.01,inf:0.05 --keep-fields viz
+    python compactSnapshots.py --run-dir simulationCases/dropImpact --watch 600
+
+Dependencies:
+    - Python standard library only
+
+Author: Vatsal Sanjay
+Contact: vatsalsanjay@gmail.com
+Affiliation: Physics of Fluids Group
+"""
+
+import argparse
+import gzip
+import json
+import lzma
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from resumeRun import COMPACTED_SUFFIXES, DUMP_HEADER, dump_is_complete
+
+SNAPSHOT_DIR = 'intermediate'
+SNAPSHOT_PREFIX = 'snapshot-'
+MANIFEST_FILE = 'manifest.json'
+TIME_TOLERANCE = 1e-6  # relative slack on schedule spacings
+
+# Fields read by getFacet2D and getData-elastic-scalar2D (plus 3D variants);
+# the leading `size` field of every dump is always kept, see filtered_dump()
+VIZ_FIELDS = ['f', 'u.x', 'u.y', 'u.z', 'A11', 'A12', 'A22', 'A13', 'A23',
+              'A33', 'conform_qq']
+
+COMPRESSORS = {
+    'none': ('', None),
+    'gzip': ('.gz', lambda path: gzip.open(path, 'wb', compresslevel=6)),
+    'xz': ('.xz', lambda path: lzma.open(path, 'wb', preset=6)),
+}
+
+
+def parse_schedule(text):
+    """
+    Parses a retention schedule.
+
+    Args:
+        text (str): Comma-separated `t_end:spacing` pairs with increasing
+            `t_end`; the last `t_end` may be `inf`
+
+    Returns:
+        list: (t_end, spacing) tuples
+
+    Raises:
+        ValueError: If the schedule is malformed
+    """
+    schedule = []
+    for item in text.split(','):
+        t_end, sep, spacing = item.partition(':')
+        try:
+            t_end, spacing = float(t_end), float(spacing)
+        except ValueError:
+            raise ValueError(f"Invalid schedule entry '{item}' (expected t_end:spacing)")
+        if not sep or spacing < 0. or (schedule and t_end <= schedule[-1][0]):
+            raise ValueError(f"Invalid schedule entry '{item}'")
+        schedule.append((t_end, spacing))
+    if not schedule:
+        raise ValueError("Empty schedule")
+    return schedule
+
+
+def spacing_at(schedule, t):
+    """
+    Returns:
+        float: Retention spacing at time `t` (the last interval extends
+        beyond its end)
+    """
+    for t_end, spacing in schedule:
+        if t <= t_end:
+            return spacing
+    return schedule[-1][1]
+
+
+def select_retained(times, schedule):
+    """
+    Chooses the snapshots to keep.
+
+    Walks the times in order and keeps a snapshot when at least the
+    schedule spacing has passed since the last kept one. The choice for
+    the early snapshots does not depend on later ones, so compacting a
+    live run repeatedly gives the same result as compacting it once.
+
+    Args:
+        times (list): Snapshot times, sorted
+        schedule (list): From parse_schedule(), or None to keep all
+
+    Returns:
+        set: Indices of the retained snapshots
+    """
+    if schedule is None:
+        return set(range(len(times)))
+    keep, last = set(), None
+    for k, t in enumerate(times):
+        spacing = spacing_at(schedule, t)
+        if last is None or t - last >= spacing*(1. - TIME_TOLERANCE):
+            keep.add(k)
+            last = t
+    if times:
+        keep.add(len(times) - 1)
+    return keep
+
+
+def open_snapshot(path):
+    """
+    Opens a snapshot for reading, compressed or not.
+
+    Args:
+        path (Path): Snapshot file
+
+    Returns:
+        file: Binary file object
+    """
+    name = str(path)
+    if name.endswith('.gz'):
+        return gzip.open(path, 'rb')
+    if name.endswith('.xz'):
+        return lzma.open(path, 'rb')
+    return open(path, 'rb')
+
+
+def read_fields(path):
+    """
+    Reads the time and field names of a (possibly compressed) snapshot.
+
+    Args:
+        path (Path): Snapshot file
+
+    Returns:
+        tuple: (t, names)
+    """
+    with open_snapshot(path) as fp:
+        raw = fp.read(DUMP_HEADER.size)
+        t, nvar = DUMP_HEADER.unpack(raw)[:2]
+        names = []
+        for _ in range(nvar):
+            length, = struct.unpack('=I', fp.read(4))
+            names.append(fp.read(length).decode('utf-8', 'replace'))
+    return t, names
+
+
+def filtered_dump(path, header, keep_fields):
+    """
+    Yields the bytes of a dump restricted to some fields.
+
+    The first field is always kept: `dump()` writes the subtree size
+    (`size`) there and `restore()` skips it unread, so dropping it would
+    shift every other field by one.
+
+    Args:
+        path (Path): Complete, uncompressed dump file
+        header (dict): From read_dump_header()
+        keep_fields (list): Field names to keep
+
+    Yields:
+        bytes: Consecutive chunks of the new dump
+    """
+    names = header['names']
+    kept = [0] + [k for k, name in enumerate(names) if k and name in keep_fields]
+    with open(path, 'rb') as fp:
+        prefix = fp.read(header['data_offset'])
+        raw = bytearray(prefix[:DUMP_HEADER.size])
+        raw[8:16] = struct.pack('=q', len(kept))
+        out = [bytes(raw)]
+        for k in kept:
+            name = names[k].encode()
+            out.append(struct.pack('=I', len(name)) + name)
+        if header['origin'] is not None:
+            out.append(prefix[-32:])
+        yield b''.join(out)
+
+        # every cell record is its flags followed by one double per field
+        record = 4 + 8*len(names)
+        spans = [(0, 4)] + [(4 + 8*k, 12 + 8*k) for k in kept]
+        chunk_records = max(1, (1 << 22)//record)
+        while True:
+            data = fp.read(chunk_records*record)
+            if not data:
+                break
+            view = memoryview(data)
+            yield b''.join(view[offset + a:offset + b]
+                           for offset in range(0, len(data), record)
+                           for a, b in spans)
+
+
+def compact_snapshot(path, keep_fields, compression):
+    """
+    Rewrites one snapshot with fewer fields and/or compressed.
+
+    Args:
+        path (Path): Complete, uncompressed snapshot
+        keep_fields (list or None): Fields to keep (None keeps all)
+        compression (str): Key of COMPRESSORS
+
+    Returns:
+        Path or None: The compacted file, or None if the snapshot is
+        incomplete (it is left as is)
+    """
+    ok, header, _ = dump_is_complete(path)
+    if not ok:
+        return None
+    drop = keep_fields is not None and set(header['names'][1:]) - set(keep_fields)
+    suffix, opener = COMPRESSORS[compression]
+    if drop and not suffix:
+        suffix = '.lite'
+    if not suffix:
+        return path
+    target = path.with_name(path.name + suffix)
+
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.compact-')
+    os.close(fd)
+    try:
+        with (opener(tmp) if opener else open(tmp, 'wb')) as out:
+            if drop:
+                for chunk in filtered_dump(path, header, keep_fields):
+                    out.write(chunk)
+            else:
+                with open(path, 'rb') as src:
+                    shutil.copyfileobj(src, out, 1 << 22)
+        os.replace(tmp, target)
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+    path.unlink()
+    return target
+
+
+def snapshot_time(path):
+    """
+    Returns:
+        float or None: Time encoded in a snapshot name such as
+        `snapshot-0.0100.gz`
+    """
+    stem = path.name[len(SNAPSHOT_PREFIX):]
+    for suffix in COMPACTED_SUFFIXES:
+        if stem.endswith(suffix):
+            stem = stem[:-len(suffix)]
+    try:
+        return float(stem)
+    except ValueError:
+        return None
+
+
+def list_snapshots(snap_dir):
+    """
+    Lists the snapshots of a run, compacted or not, sorted by time.
+
+    Args:
+        snap_dir (Path): The `intermediate/` directory
+
+    Returns:
+        list: (t, path) tuples
+    """
+    snapshots = []
+    for path in snap_dir.glob(SNAPSHOT_PREFIX + '*'):
+        t = snapshot_time(path)
+        if t is not None and path.is_file():
+            snapshots.append((t, path))
+    return sorted(snapshots)
+
+
+def write_manifest(snap_dir, schedule_text=None):
+    """
+    Writes `manifest.json` describing every frame of a run.
+
+    Args:
+        snap_dir (Path): The `intermediate/` directory
+        schedule_text (str): Retention schedule recorded in the manifest
+
+    Returns:
+        list: The manifest frames
+    """
+    frames = []
+    for t, path in list_snapshots(snap_dir):
+        try:
+            t, names = read_fields(path)
+        except (OSError, EOFError, struct.error, lzma.LZMAError):
+            continue  # being written
+        compression = next((name for name, (suffix, _) in COMPRESSORS.items()
+                            if suffix and path.name.endswith(suffix)), 'none')
+        frames.append({'t': t, 'file': path.name, 'compression': compression,
+                       'fields': names, 'bytes': path.stat().st_size})
+    manifest = {'frames': frames, 'schedule': schedule_text,
+                'updated': time.time()}
+    fd, tmp = tempfile.mkstemp(dir=snap_dir, prefix='.manifest-')
+    with os.fdopen(fd, 'w') as fp:
+        json.dump(manifest, fp, indent=2)
+    os.replace(tmp, snap_dir / MANIFEST_FILE)
+    return frames
+
+
+def compact_run(run_dir, schedule=None, keep_fields=None, compression='gzip',
+                min_age=0., dry_run=False, schedule_text=None):
+    """
+    Thins and compacts the snapshots of a run directory.
+
+    Args:
+        run_dir (Path): Run directory
+        schedule (list): From parse_schedule(), or None to keep all
+        keep_fields (list): Fields to keep, or None to keep all
+        compression (str): Key of COMPRESSORS
+        min_age (float): Leave snapshots modified less than this many
+            seconds ago alone (they may still be written)
+        dry_run (bool): Only report what would be done
+        schedule_text (str): Schedule as given, recorded in the manifest
+
+    Returns:
+        dict: Bytes before and after, and the number of deleted and
+        compacted snapshots
+    """
+    snap_dir = Path(run_dir) / SNAPSHOT_DIR
+    report = {'before': 0, 'after': 0, 'deleted': 0, 'compacted': 0}
+    if not snap_dir.is_dir():
+        return report
+    snapshots = list_snapshots(snap_dir)
+    retained = select_retained([t for t, _ in snapshots], schedule)
+    newest = len(snapshots) - 1
+    now = time.time()
+    for k, (t, path) in enumerate(snapshots):
+        size = path.stat().st_size
+        report['before'] += size
+        settled = k != newest and now - path.stat().st_mtime >= min_age
+        if not settled:
+            report['after'] += size
+        elif k not in retained:
+            report['deleted'] += 1
+            if not dry_run:
+                path.unlink()
+        elif path.name.endswith(COMPACTED_SUFFIXES) or dry_run:
+            report['after'] += size
+        else:
+            target = compact_snapshot(path, keep_fields, compression)
+            target = target or path
+            report['after'] += target.stat().st_size
+            report['compacted'] += target != path
+    if not dry_run:
+        write_manifest(snap_dir, schedule_text)
+    return report
+
+
+def format_bytes(n):
+    """
+    Returns:
+        str: Size with a binary unit, e.g. `1.5 GiB`
+    """
+    for unit in ('B', 'KiB', 'MiB', 'GiB'):
+        if abs(n) < 1024 or unit == 'GiB':
+            break
+        n /= 1024.
+    return f"{n:.0f} B" if unit == 'B' else f"{n:.1f} {unit}"
+
+
+def parse_args(argv=None):
+    """
+    Parses the command line.
+
+    Args:
+        argv (list): Arguments (default: sys.argv[1:])
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Thin and compress the snapshots of a run")
+    parser.add_argument('--run-dir', required=True,
+                        help='Run directory containing intermediate/')
+    parser.add_argument('--schedule', default=None,
+                        help='Retention schedule t_end:spacing,... (default: keep all)')
+    parser.add_argument('--keep-fields', default=None,
+                        help="Comma-separated fields to keep, or 'viz' for the fields "
+                             "VideoAxi.py needs (default: keep all)")
+    parser.add_argument('--compress', choices=sorted(COMPRESSORS), default='gzip',
+                        help='Compression of the kept snapshots (default: gzip)')
+    parser.add_argument('--watch', type=float, default=None, metavar='SECONDS',
+                        help='Compact a live run every SECONDS until interrupted')
+    parser.add_argument('--min-age', type=float, default=None,
+                        help='Skip snapshots modified in the last MIN_AGE seconds '
+                             '(default: 0, or 60 with --watch)')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Report what would be deleted, change nothing')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Compacts a run directory once, or periodically with --watch.
+    """
+    args = parse_args(argv)
+    run_dir = Path(args.run_dir)
+    if not (run_dir / SNAPSHOT_DIR).is_dir():
+        print(f"No {SNAPSHOT_DIR}/ directory in {args.run_dir}")
+        return 1
+    try:
+        schedule = parse_schedule(args.schedule) if args.schedule else None
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    keep_fields = None
+    if args.keep_fields:
+        keep_fields = VIZ_FIELDS if args.keep_fields == 'viz' else \
+            [name.strip() for name in args.keep_fields.split(',') if name.strip()]
+    min_age = args.min_age if args.min_age is not None else \
+        (60. if args.watch else 0.)
+
+    while True:
+        report = compact_run(run_dir, schedule, keep_fields, args.compress,
+                             min_age, args.dry_run, args.schedule)
+        saved = report['before'] - report['after']
+        print(f"{'Would delete' if args.dry_run else 'Deleted'} {report['deleted']} "
+              f"snapshots, compacted {report['compacted']}: "
+              f"{format_bytes(report['before'])} -> {format_bytes(report['after'])} "
+              f"(saved {format_bytes(saved)})")
+        if not args.watch:
+            return 0
+        try:
+            time.sleep(args.watch)
+        except KeyboardInterrupt:
+            return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Columnar Log Store
+
+Ingests the `log*-*.dat` files the cases write in `event logWriting`
+(`i dt t ke` rows, plus `ymin` for pinchOff and the skipped polymer-free
+`free` of all `cells` for dropImpact-EVP-HB) below a directory, e.g. a
+sweep, into one columnar store:
+
+    <store>/
+        i.npy, dt.npy, t.npy, ke.npy, ...   every column of every run,
+                                            concatenated (NaN where a
+                                            case has no such column)
+        run.npy                             run index of every row
+        offsets.npy                         first row of every run (+ end)
+        catalog.json                        one entry per run: log path,
+                                            case, parameters, rows
+        runs/                               per-run parse cache
+
+The parameters of a run come from its `.params` file when present and
+from the log header otherwise. Loading ke(t) across a whole sweep is one
+memory-mapped read per column, and runs are selected by parameter:
+
+    store = LogStore('simulationCases/dropImpact-EVP-HB-sweep/logstore')
+    rows = store.select(We=10)
+    t, ke = store['t'][rows], store['ke'][rows]
+
+Rows written again after a restart (before resumeRun.py trimmed logs) are
+deduplicated: a row is dropped when a later row has an earlier time, or
+the same time and iteration. Re-ingesting only parses logs that changed.
+
+Usage:
+    python logStore.py build --root simulationCases/dropImpact-EVP-HB-sweep [--parquet]
+    python logStore.py query --store simulationCases/dropImpact-EVP-HB-sweep/logstore We=10
+
+Dependencies:
+    - numpy
+    - pyarrow (optional, for --parquet)
+
+Author: Vatsal Sanjay
+Contact: vatsalsanjay@gmail.com
+Affiliation: Physics of Fluids Group
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from resumeRun import LOG_GLOB
+from runSweep import read_params
+
+STORE_DIR = 'logstore'
+CATALOG_FILE = 'catalog.json'
+CACHE_VERSION = 1
+
+HEADER_ITEM = re.compile(r'^\s*([A-Za-z_]\w*)\s+([-+0-9.eE]+)\s*$')
+
+
+def parse_header(line):
+    """
+    Parses the parameter line a case writes at the top of its log, e.g.
+    `Level 10, Ohs 1.0e-02, We 5.0e+00`.
+
+    Args:
+        line (str): Header line
+
+    Returns:
+        dict: Name -> float (values are rounded as printed by the case)
+    """
+    params = {}
+    for item in line.split(','):
+        match = HEADER_ITEM.match(item)
+        if match:
+            try:
+                params[match.group(1)] = float(match.group(2))
+            except ValueError:
+                pass
+    return params
+
+
+def dedupe_restarts(t, i=None):
+    """
+    Marks the rows superseded by a restart.
+
+    A row is dropped when a later row has an earlier time, or the same
+    time and iteration. Consecutive steps that print the same time (`%g`)
+    are kept.
+
+    Args:
+        t (numpy.ndarray): Time column in file order
+        i (numpy.ndarray): Iteration column, optional
+
+    Returns:
+        numpy.ndarray: Boolean mask of the rows to keep
+    """
+    keep = np.ones(len(t), dtype=bool)
+    if len(t) == 0:
+        return keep
+    later_min = np.minimum.accumulate(t[::-1])[::-1]
+    keep[:-1] = t[:-1] <= later_min[1:]
+    if i is not None:
+        # keep the last of rows repeating the same (i, t)
+        pairs = np.rec.fromarrays([i, t])[::-1]
+        _, first = np.unique(pairs, return_index=True)
+        last = np.zeros(len(t), dtype=bool)
+        last[len(t) - 1 - first] = True
+        keep &= last
+    return keep
+
+
+def parse_log(path):
+    """
+    Parses a case log.
+
+    Args:
+        path (Path): `log*-*.dat` file
+
+    Returns:
+        tuple: (columns, header) with a dict name -> numpy.ndarray and the
+        header parameters
+    """
+    text = Path(path).read_text()
+    if not text.endswith('\n'):
+        text = text[:text.rfind('\n') + 1]  # drop a partially written row
+    header, names, rows = {}, None, []
+    for line in text.splitlines():
+        fields = line.split()
+        if not fields:
+            continue
+        if fields[0].lstrip('-').isdigit():
+            rows.append(line)
+        elif fields[0] == 'i':
+            names = fields
+        elif not header:
+            header = parse_header(line)
+
+    ncols = len(rows[0].split()) if rows else 0
+    rows = [row for row in rows if len(row.split()) == ncols]
+    values = np.array(' '.join(rows).split(), dtype=float).reshape(-1, ncols) \
+        if rows else np.zeros((0, ncols))
+    # the header may name more columns than the rows hold (`rM`)
+    names = (names or [])[:ncols]
+    names += [f"c{k}" for k in range(len(names), ncols)]
+    columns = {name: values[:, k] for k, name in enumerate(names)}
+    if 't' in columns:
+        keep = dedupe_restarts(columns['t'], columns.get('i'))
+        columns = {name: column[keep] for name, column in columns.items()}
+    if 'i' in columns:
+        columns['i'] = columns['i'].astype(np.int64)
+    return columns, header
+
+
+def run_params(log_path, header):
+    """
+    Parameters of the run a log belongs to.
+
+    Args:
+        log_path (Path): Log file
+        header (dict): Parameters parsed from the log header
+
+    Returns:
+        dict: Header parameters overridden by the exact values of the
+        `.params` file in the run directory (numbers as floats)
+    """
+    params = dict(header)
+    for params_file in sorted(Path(log_path).parent.glob('*.params')):
+        try:
+            _, values = read_params(params_file)
+        except (OSError, ValueError):
+            continue
+        for key, value in values.items():
+            try:
+                params[key] = float(value)
+            except ValueError:
+                params[key] = value
+        break
+    return params
+
+
+def load_run(log_path, cache_dir):
+    """
+    Parses a log, or loads it from the per-run cache when unchanged.
+
+    Args:
+        log_path (Path): Log file
+        cache_dir (Path): Cache directory of the store
+
+    Returns:
+        tuple: (columns, header)
+    """
+    stat = log_path.stat()
+    key = hashlib.sha1(str(log_path.resolve()).encode()).hexdigest()[:16]
+    cache = cache_dir / f"{key}.npz"
+    stamp = [CACHE_VERSION, stat.st_size, stat.st_mtime_ns]
+    if cache.exists():
+        with np.load(cache, allow_pickle=False) as data:
+            if list(data['__stamp__']) == stamp:
+                header = json.loads(str(data['__header__']))
+                return {name: data[name] for name in data.files
+                        if not name.startswith('__')}, header
+    columns, header = parse_log(log_path)
+    fd, tmp = tempfile.mkstemp(dir=cache_dir, prefix='.run-', suffix='.npz')
+    with os.fdopen(fd, 'wb') as fp:
+        np.savez(fp, __stamp__=np.array(stamp, dtype=np.int64),
+                 __header__=np.array(json.dumps(header)), **columns)
+    os.replace(tmp, cache)
+    return columns, header
+
+
+def find_logs(root, store_dir):
+    """
+    Finds the case logs below `root`, outside the store.
+
+    Returns:
+        list: Log paths, sorted
+    """
+    store_dir = store_dir.resolve()
+    return sorted(path for path in Path(root).rglob(LOG_GLOB)
+                  if store_dir not in path.resolve().parents)
+
+
+def save_array(path, array):
+    """
+    Writes a .npy file atomically.
+    """
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.col-', suffix='.npy')
+    with os.fdopen(fd, 'wb') as fp:
+        np.save(fp, array)
+    os.replace(tmp, path)
+
+
+def build_store(root, store_dir=None, parquet=False, verbose=True):
+    """
+    Ingests every log below `root` into a columnar store.
+
+    Args:
+        root (Path): Directory to search (e.g. a sweep output directory)
+        store_dir (Path): Store directory (default: <root>/logstore)
+        parquet (bool): Also write logs.parquet (requires pyarrow)
+        verbose (bool): Print a summary
+
+    Returns:
+        list: The catalog entries
+    """
+    root = Path(root)
+    store_dir = Path(store_dir) if store_dir else root / STORE_DIR
+    cache_dir = store_dir / 'runs'
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    runs, catalog, offset = [], [], 0
+    for log_path in find_logs(root, store_dir):
+        columns, header = load_run(log_path, cache_dir)
+        nrows = len(next(iter(columns.values()))) if columns else 0
+        catalog.append({'run': len(catalog), 'log': str(log_path.relative_to(root)),
+                        'case': log_path.parent.name, 'columns': list(columns),
+                        'params': run_params(log_path, header),
+                        'rows': nrows, 'offset': offset})
+        runs.append(columns)
+        offset += nrows
+
+    names = []
+    for columns in runs:
+        names += [name for name in columns if name not in names]
+    for name in names:
+        dtype = np.int64 if name == 'i' else float
+        fill = -1 if name == 'i' else np.nan
+        parts = [columns.get(name, np.full(entry['rows'], fill, dtype=dtype))
+                 for columns, entry in zip(runs, catalog)]
+        save_array(store_dir / f"{name}.npy",
+                   np.concatenate(parts).astype(dtype) if parts else np.zeros(0, dtype))
+    save_array(store_dir / 'run.npy', np.repeat(
+        np.arange(len(catalog), dtype=np.int32), [entry['rows'] for entry in catalog]))
+    save_array(store_dir / 'offsets.npy', np.array(
+        [entry['offset'] for entry in catalog] + [offset], dtype=np.int64))
+
+    fd, tmp = tempfile.mkstemp(dir=store_dir, prefix='.catalog-')
+    with os.fdopen(fd, 'w') as fp:
+        json.dump({'root': str(root.resolve()), 'columns': names, 'runs': catalog},
+                  fp, indent=2)
+    os.replace(tmp, store_dir / CATALOG_FILE)
+
+    if parquet:
+        write_parquet(store_dir, names)
+    if verbose:
+        print(f"Ingested {len(catalog)} logs, {offset} rows, columns "
+              f"{' '.join(names)} into {store_dir}")
+    return catalog
+
+
+def write_parquet(store_dir, names):
+    """
+    Writes the store as one Parquet table (columns plus `run`).
+
+    Raises:
+        RuntimeError: If pyarrow is not installed
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("--parquet requires pyarrow (pip install pyarrow)")
+    store = LogStore(store_dir)
+    table = pa.table({name: np.asarray(store[name]) for name in names + ['run']})
+    pq.write_table(table, Path(store_dir) / 'logs.parquet')
+
+
+class LogStore:
+    """
+    Read access to a store written by build_store(). Columns are
+    memory-mapped, so indexing a column of a large sweep reads only the
+    rows that are used.
+    """
+
+    def __init__(self, store_dir):
+        self.store_dir = Path(store_dir)
+        catalog = json.loads((self.store_dir / CATALOG_FILE).read_text())
+        self.columns = catalog['columns']
+        self.runs = catalog['runs']
+        self._cache = {}
+
+    def __getitem__(self, name):
+        """
+        Returns:
+            numpy.ndarray: Memory-mapped column (`run` gives the run
+            index of every row)
+        """
+        if name not in self._cache:
+            if name != 'run' and name not in self.columns:
+                raise KeyError(name)
+            self._cache[name] = np.load(self.store_dir / f"{name}.npy",
+                                        mmap_mode='r')
+        return self._cache[name]
+
+    def param(self, key):
+        """
+        Returns:
+            numpy.ndarray: Value of a parameter for every run (NaN when a
+            run does not define it)
+        """
+        values = [entry['params'].get(key, np.nan) for entry in self.runs]
+        return np.array([v if isinstance(v, float) else np.nan for v in values])
+
+    def find_runs(self, **conditions):
+        """
+        Selects runs by parameter value (floats compared with a relative
+        tolerance of 1e-9).
+
+        Returns:
+            numpy.ndarray: Matching run indices
+        """
+        match = np.ones(len(self.runs), dtype=bool)
+        for key, value in conditions.items():
+            match &= np.isclose(self.param(key), float(value), rtol=1e-9, atol=0.)
+        return np.flatnonzero(match)
+
+    def select(self, **conditions):
+        """
+        Returns:
+            numpy.ndarray: Boolean row mask of the runs matching
+            `conditions` (see find_runs())
+        """
+        return np.isin(self['run'], self.find_runs(**conditions))
+
+    def run(self, index):
+        """
+        Returns:
+            dict: Columns of one run (views into the memory maps)
+        """
+        entry = self.runs[index]
+        rows = slice(entry['offset'], entry['offset'] + entry['rows'])
+        return {name: self[name][rows] for name in entry['columns']}
+
+
+def parse_args(argv=None):
+    """
+    Parses the command line.
+
+    Args:
+        argv (list): Arguments (default: sys.argv[1:])
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Columnar store of case logs")
+    sub = parser.add_subparsers(dest='command', required=True)
+    build = sub.add_parser('build', help='Ingest the logs below a directory')
+    build.add_argument('--root', required=True,
+                       help='Directory to search (e.g. a sweep output directory)')
+    build.add_argument('--store', default=None,
+                       help=f'Store directory (default: <root>/{STORE_DIR})')
+    build.add_argument('--parquet', action='store_true',
+                       help='Also write logs.parquet (requires pyarrow)')
+    query = sub.add_parser('query', help='List the runs matching parameter values')
+    query.add_argument('--store', required=True, help='Store directory')
+    query.add_argument('conditions', nargs='*', metavar='KEY=VALUE',
+                       help='Parameter values to match, e.g. We=10')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Builds or queries a log store.
+    """
+    args = parse_args(argv)
+    if args.command == 'build':
+        if not Path(args.root).is_dir():
+            print(f"Directory not found: {args.root}")
+            return 1
+        try:
+            build_store(args.root, args.store, args.parquet)
+        except RuntimeError as e:
+            print(f"Error: {e}")
+            return 1
+        return 0
+
+    conditions = {}
+    for item in args.conditions:
+        key, sep, value = item.partition('=')
+        if not sep:
+            print(f"Invalid condition '{item}' (expected KEY=VALUE)")
+            return 1
+        conditions[key.strip()] = value.strip()
+    store = LogStore(args.store)
+    try:
+        runs = store.find_runs(**conditions)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    t = store['t'] if 't' in store.columns else None
+    for k in runs:
+        entry = store.runs[k]
+        t_end = t[entry['offset'] + entry['rows'] - 1] if t is not None and entry['rows'] else float('nan')
+        print(f"{k:4d}  {entry['rows']:8d} rows  t_end = {t_end:<10g} {entry['log']}")
+    print(f"{len(runs)} of {len(store.runs)} runs")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -26,6 +26,34 @@ External Dependencies:
     - ./getFacet2D: Basilisk executable for interface extraction
     - ./getData-elastic-scalar2D: Basilisk executable for field data extraction
 
+With --renderer numpy, frames are rasterized directly by rasterAxi.py
+(same layout, NumPy colormapping and line drawing, pre-rendered colorbars)
+instead of being composited by matplotlib.
+
+With --roi, the box around the interface facets (plus a margin) is sampled
+at high resolution and the rest of the window coarsely; both are drawn
+into the frame, the fine inset on top.
+
+With --views FILE, several pictures are made of every snapshot: FILE is a
+JSON list of views, each a window and the fields shown on either side,
+e.g.
+
+    [{"name": "full"},
+     {"name": "contact", "zmin": 0, "zmax": 1, "rmax": 1, "grids_per_r": 512},
+     {"name": "velocity", "left": "vel", "right": "taup", "left_limits": [0, 2]}]
+
+Each snapshot is extracted once, over the union of the windows at the
+finest requested resolution, and every view is cut from the shared
+arrays into Video/<name>/.
+
+With --queue, the frames are shared through Video/.queue/ (frameQueue.py)
+instead of being split by one Pool: start VideoAxi.py --queue on as many
+nodes as wanted, each runs --CPUs workers that claim frames until none
+are left.
+
+Snapshots compacted by compactSnapshots.py are found through
+intermediate/manifest.json and decompressed to a temporary file per frame.
+
 Author: Vatsal Sanjay
 Contact: vatsalsanjay@gmail.com
 Affiliation: Physics of Fluids Group
@@ -34,7 +62,13 @@ Last updated: Jul 24, 2024
 
 import numpy as np
 import os
+import json
+import gzip
+import lzma
+import shutil
+import tempfile
 import subprocess as sp
+from contextlib import contextmanager
 import matplotlib
 import matplotlib.pyplot as plt
 from matplotlib.collections import LineCollection
@@ -45,6 +79,9 @@ import argparse
 
 import matplotlib.colors as mcolors
 
+from rasterAxi import FrameRenderer
+from frameQueue import CLAIM_TIMEOUT, queue_worker
+
 # ===============================
 # Configuration and Settings
 # ===============================
@@ -58,6 +95,15 @@ matplotlib.rcParams['font.family'] = 'serif'
 matplotlib.rcParams['text.usetex'] = True
 matplotlib.rcParams['text.latex.preamble'] = r'\usepackage{amsmath}'
 
+TITLE_PREFIX = r'$t/\tau_\gamma$ ='
+
+# Columns of getData-elastic-scalar2D (z r D2 vel taup) and read size
+FIELD_COLUMNS = 5
+STREAM_CHUNK = 1 << 20
+
+# NumPy renderers of this process, see frame_renderer()
+_FRAME_RENDERERS = {}
+
 # Default visualization parameters
 DEFAULT_CONFIG = {
     'grids_per_r': 128,          # Grid resolution factor
@@ -69,6 +115,21 @@ DEFAULT_CONFIG = {
     'strain_vmin': -3.0,         # Minimum strain rate for colorbar
     'stress_vmax': 2.0,          # Maximum stress trace for colorbar
     'stress_vmin': -3.0,         # Minimum stress trace for colorbar
+    'roi_pad': 0.25,             # ROI margin around the interface
+    'roi_grids_per_r': 512,      # Grid resolution factor inside the ROI
+    'roi_coarsen': 4,            # Resolution divisor outside the ROI
+}
+
+# Fields of ./getData-elastic-scalar2D that views can show
+FIELD_STYLES = {
+    'D2': {'column': 0, 'cmap': 'hot_r',
+           'limits': (DEFAULT_CONFIG['strain_vmin'], DEFAULT_CONFIG['strain_vmax']),
+           'label': r'$\log_{10}\left(\|\mathcal{D}\|\right)$'},
+    'vel': {'column': 1, 'cmap': 'viridis', 'limits': (0.0, 1.0),
+            'label': r'$\|\mathbf{u}\|$'},
+    'taup': {'column': 2, 'cmap': 'custom_hot',
+             'limits': (DEFAULT_CONFIG['stress_vmin'], DEFAULT_CONFIG['stress_vmax']),
+             'label': r'$\log_{10}\left(\text{tr}\left(\mathcal{A}\right)-1\right)$'},
 }
 
 # ===============================
@@ -101,13 +162,31 @@ def gettingFacets(filename, includeCoat='true'):
         The function assumes axisymmetric geometry and creates symmetric segments
         by mirroring across r=0. This is typical for bubble/drop simulations.
     """
-    exe = ["./getFacet2D", filename, includeCoat]
     try:
-        p = sp.Popen(exe, stdout=sp.PIPE, stderr=sp.PIPE)
+        p = sp.Popen(facets_command(filename, includeCoat), stdout=sp.PIPE, stderr=sp.PIPE)
         stdout, stderr = p.communicate()
     except FileNotFoundError:
         raise FileNotFoundError(f"getFacet2D executable not found. Ensure it's compiled and in the current directory.")
+    return parse_facets(stderr)
+
+
+def facets_command(filename, includeCoat='true'):
+    """
+    Command line of getFacet2D, see gettingFacets().
+    """
+    return ["./getFacet2D", filename, includeCoat]
+
+
+def parse_facets(stderr):
+    """
+    Interface segments from the output of getFacet2D, see gettingFacets().
+
+    Args:
+        stderr (bytes): Output of the executable
 
+    Returns:
+        list: Segments ((r1, z1), (r2, z2)), mirrored copies included
+    """
     temp1 = stderr.decode("utf-8")
     temp2 = temp1.split("\n")
     segs = []
@@ -134,7 +213,7 @@ def gettingFacets(filename, includeCoat='true'):
     return segs
 
 
-def gettingfield(filename, zmin, zmax, rmax, nr):
+def gettingfield(filename, zmin, zmax, rmax, nr, rmin=0.):
     """
     Extract field data from Basilisk simulation snapshots.
 
@@ -148,6 +227,7 @@ def gettingfield(filename, zmin, zmax, rmax, nr):
         zmax (float): Maximum z-coordinate for data extraction
         rmax (float): Maximum r-coordinate for data extraction
         nr (int): Number of grid points in radial direction
+        rmin (float): Minimum r-coordinate for data extraction. Defaults to 0.
 
     Returns:
         tuple: (R, Z, D2, vel, taup, nz) where:
@@ -163,76 +243,296 @@ def gettingfield(filename, zmin, zmax, rmax, nr):
         ValueError: If the extracted data dimensions are inconsistent
 
     Note:
-        The function automatically determines nz based on the total data points
-        and the specified nr. All returned arrays are reshaped to 2D meshgrids.
+        The output is parsed while it is read, into an array preallocated for
+        the expected nz (see FieldParser); nz itself follows from the total
+        data points and the specified nr. The returned arrays are 2D
+        meshgrids viewing one (nz, nr, 5) table.
     """
-    exe = ["./getData-elastic-scalar2D", filename, str(zmin), str(0), str(zmax), str(rmax), str(nr)]
     try:
-        p = sp.Popen(exe, stdout=sp.PIPE, stderr=sp.PIPE)
-        stdout, stderr = p.communicate()
+        p = sp.Popen(field_command(filename, zmin, zmax, rmax, nr, rmin),
+                     stdout=sp.DEVNULL, stderr=sp.PIPE)
     except FileNotFoundError:
         raise FileNotFoundError(f"getData-elastic-scalar2D executable not found. Ensure it's compiled and in the current directory.")
+    # Parse the output as it arrives, never holding all of its text
+    with p.stderr:
+        field = read_field(p.stderr, nr, field_rows(zmin, zmax, rmax, nr, rmin))
+    p.wait()
+    return field
 
-    temp1 = stderr.decode("utf-8")
-    temp2 = temp1.split("\n")
 
-    # Initialize temporary lists for field data
-    Rtemp, Ztemp, D2temp, veltemp, taupTemp = [], [], [], [], []
+def field_command(filename, zmin, zmax, rmax, nr, rmin=0.):
+    """
+    Command line of getData-elastic-scalar2D, see gettingfield().
+    """
+    return ["./getData-elastic-scalar2D", filename, str(zmin), str(rmin), str(zmax), str(rmax), str(nr)]
+
+
+def read_field(stream, nr, nz=0):
+    """
+    Parse getData-elastic-scalar2D output from a binary stream (its pipe,
+    or a file it was written to) chunk by chunk.
+
+    Args:
+        stream (file): Binary file object
+        nr (int): Number of grid points in radial direction
+        nz (int): Expected number of axial grid points, see field_rows()
+
+    Returns:
+        tuple: (R, Z, D2, vel, taup, nz) as returned by gettingfield()
+    """
+    parser = FieldParser(nr, nz)
+    for chunk in iter(lambda: stream.read(STREAM_CHUNK), b''):
+        parser.feed(chunk)
+    return parser.result()
 
-    # Parse field data from executable output
-    for n1 in range(len(temp2)):
-        temp3 = temp2[n1].split(" ")
-        if temp3 == ['']:
-            pass
-        else:
-            Ztemp.append(float(temp3[0]))
-            Rtemp.append(float(temp3[1]))
-            D2temp.append(float(temp3[2]))
-            veltemp.append(float(temp3[3]))
-            taupTemp.append(float(temp3[4]))
-
-    # Convert to numpy arrays and reshape to 2D mesh
-    R = np.asarray(Rtemp)
-    Z = np.asarray(Ztemp)
-    D2 = np.asarray(D2temp)
-    vel = np.asarray(veltemp)
-    taup = np.asarray(taupTemp)
-
-    # Calculate number of axial grid points
-    nz = int(len(Z)/nr)
-    print(f"Grid dimensions: nr={nr}, nz={nz}")
-
-    # Reshape arrays to 2D mesh format
-    R.resize((nz, nr))
-    Z.resize((nz, nr))
-    D2.resize((nz, nr))
-    vel.resize((nz, nr))
-    taup.resize((nz, nr))
-
-    return R, Z, D2, vel, taup, nz
+
+def field_rows(zmin, zmax, rmax, nr, rmin=0.):
+    """
+    Number of axial grid points getData-elastic-scalar2D samples: it keeps
+    the radial spacing (rmax - rmin)/nr along the axis.
+    """
+    return max(int((zmax - zmin)/((rmax - rmin)/nr)), 0)
+
+
+class FieldParser:
+    """
+    Incremental parser of the getData-elastic-scalar2D output.
+
+    Numbers go straight into one preallocated array as the text arrives,
+    so memory is bounded by the grid, not by the size of the text (several
+    times larger, and several copies of it once decoded and split).
+
+    Args:
+        nr (int): Number of grid points in radial direction
+        nz (int): Expected number of axial grid points, see field_rows();
+                  the array grows if the helper writes more
+    """
+
+    def __init__(self, nr, nz=0):
+        self.nr = nr
+        self.values = np.empty(max(nz, 1) * nr * FIELD_COLUMNS)
+        self.filled = 0
+        self.tail = b''
+
+    def feed(self, chunk):
+        """
+        Parse a chunk of output; an incomplete last line is kept for the next.
+        """
+        data = self.tail + chunk
+        end = data.rfind(b'\n') + 1
+        self.tail = data[end:]
+        if end:
+            self._store(np.fromstring(data[:end], dtype=float, sep=' '))
+
+    def _store(self, numbers):
+        filled = self.filled + numbers.size
+        if filled > self.values.size:
+            values = np.empty(max(filled, 2 * self.values.size))
+            values[:self.filled] = self.values[:self.filled]
+            self.values = values
+        self.values[self.filled:filled] = numbers
+        self.filled = filled
+
+    def result(self):
+        """
+        Returns:
+            tuple: (R, Z, D2, vel, taup, nz) as returned by gettingfield()
+        """
+        if self.tail.strip():
+            self._store(np.fromstring(self.tail, dtype=float, sep=' '))
+            self.tail = b''
+
+        # Calculate number of axial grid points
+        nz = self.filled // (FIELD_COLUMNS * self.nr)
+        print(f"Grid dimensions: nr={self.nr}, nz={nz}")
+
+        table = self.values[:nz * self.nr * FIELD_COLUMNS].reshape(nz, self.nr, FIELD_COLUMNS)
+        Z, R, D2, vel, taup = (table[..., k] for k in range(FIELD_COLUMNS))
+        return R, Z, D2, vel, taup, nz
+
+
+# ===============================
+# Snapshot Discovery
+# ===============================
+
+def snapshot_frames(nGFS, snapDir='intermediate'):
+    """
+    List the snapshots to visualize.
+
+    Uses the manifest written by compactSnapshots.py when present, so thinned
+    and compressed snapshots are found; otherwise assumes one snapshot every
+    0.01 time units as written by the cases.
+
+    Args:
+        nGFS (int): Maximum number of frames
+        snapDir (str): Snapshot directory. Defaults to 'intermediate'.
+
+    Returns:
+        list: (t, path, compression) tuples, compression being 'none',
+              'gzip' or 'xz'
+    """
+    manifest = os.path.join(snapDir, 'manifest.json')
+    if os.path.exists(manifest):
+        with open(manifest) as fp:
+            frames = json.load(fp)['frames']
+        return [(frame['t'], os.path.join(snapDir, frame['file']), frame['compression'])
+                for frame in frames[:nGFS]]
+    return [(0.01*ti, f"{snapDir}/snapshot-{0.01*ti:.4f}", 'none') for ti in range(nGFS)]
+
+
+def frame_key(frame):
+    """
+    Name of a frame, as used for its images and queue entries.
+    """
+    return f"{int(frame[0]*1000):08d}"
+
+
+@contextmanager
+def readable_snapshot(place, compression):
+    """
+    Yield a path the Basilisk executables can restore from.
+
+    Compressed snapshots are decompressed into a temporary file that is
+    removed afterwards.
+
+    Args:
+        place (str): Snapshot path
+        compression (str): 'none', 'gzip' or 'xz'
+
+    Yields:
+        str: Path of an uncompressed snapshot
+    """
+    if compression == 'none':
+        yield place
+        return
+    opener = gzip.open if compression == 'gzip' else lzma.open
+    fd, tmp = tempfile.mkstemp(prefix='snapshot-')
+    try:
+        with os.fdopen(fd, 'wb') as out, opener(place, 'rb') as src:
+            shutil.copyfileobj(src, out, 1 << 22)
+        yield tmp
+    finally:
+        os.unlink(tmp)
+
+def interface_box(segs, pad, rmax, zmin, zmax):
+    """
+    Bounding box of the interface, used as the region of interest.
+
+    Args:
+        segs (list): Interface segments ((r1, z1), (r2, z2)), mirrored
+                     copies included
+        pad (float): Margin added on every side
+        rmax, zmin, zmax (float): Sampling window, the box is clipped to it
+
+    Returns:
+        tuple or None: (r0, r1, z0, z1), or None without interface
+    """
+    if not len(segs):
+        return None
+    points = np.asarray(segs, dtype=float).reshape(-1, 2)
+    r, z = np.abs(points[:, 0]), points[:, 1]
+    r0, r1 = max(r.min() - pad, 0.), min(r.max() + pad, rmax)
+    z0, z1 = max(z.min() - pad, zmin), min(z.max() + pad, zmax)
+    if r1 <= r0 or z1 <= z0:
+        return None
+    return r0, r1, z0, z1
+
+# ===============================
+# View Definitions
+# ===============================
+
+def colormap(name):
+    """
+    Colormap by name, 'custom_hot' being CUSTOM_CMAP.
+    """
+    return CUSTOM_CMAP if name == 'custom_hot' else matplotlib.colormaps[name]
+
+
+def make_view(name='', zmin=-4.0, zmax=4.0, rmax=2.0, left='D2', right='taup',
+              left_cmap=None, right_cmap=None, left_limits=None, right_limits=None,
+              grids_per_r=DEFAULT_CONFIG['grids_per_r']):
+    """
+    One picture of every snapshot: a window and the fields on both sides.
+
+    Args:
+        name (str): Output subfolder of Video/ ('' writes to Video/)
+        zmin, zmax, rmax (float): Window, mirrored about r = 0
+        left, right (str): Fields of FIELD_STYLES on each side
+        left_cmap, right_cmap (str): Colormaps (default: the field's)
+        left_limits, right_limits (list): Colorbar [vmin, vmax] (default:
+                                          the field's)
+        grids_per_r (float): Sampling resolution of the window
+
+    Returns:
+        dict: The view, with its output folder
+
+    Raises:
+        ValueError: If a field is unknown or the window is empty
+    """
+    for field in (left, right):
+        if field not in FIELD_STYLES:
+            raise ValueError(f"view {name!r}: unknown field {field!r}, "
+                             f"expected one of {sorted(FIELD_STYLES)}")
+    if zmax <= zmin or rmax <= 0:
+        raise ValueError(f"view {name!r}: empty window")
+    return {
+        'name': name, 'folder': os.path.join('Video', name) if name else 'Video',
+        'zmin': float(zmin), 'zmax': float(zmax), 'rmax': float(rmax),
+        'left': left, 'right': right,
+        'left_cmap': left_cmap or FIELD_STYLES[left]['cmap'],
+        'right_cmap': right_cmap or FIELD_STYLES[right]['cmap'],
+        'left_limits': tuple(left_limits or FIELD_STYLES[left]['limits']),
+        'right_limits': tuple(right_limits or FIELD_STYLES[right]['limits']),
+        'grids_per_r': float(grids_per_r),
+    }
+
+
+def load_views(path):
+    """
+    Read a JSON list of views, each an object of make_view() arguments.
+
+    Raises:
+        ValueError: On unknown keys, duplicate names or invalid windows
+    """
+    with open(path) as fp:
+        entries = json.load(fp)
+    if not isinstance(entries, list) or not entries:
+        raise ValueError(f"{path}: expected a non-empty list of views")
+    views = []
+    for entry in entries:
+        try:
+            views.append(make_view(**entry))
+        except TypeError as e:
+            raise ValueError(f"{path}: invalid view {entry}: {e}") from e
+    names = [view['name'] for view in views]
+    if len(set(names)) != len(names):
+        raise ValueError(f"{path}: view names must be unique")
+    return views
 
 # ===============================
 # Visualization Functions
 # ===============================
 
-def process_timestep(ti, folder, nGFS, GridsPerR, rmin, rmax, zmin, zmax, lw):
+def process_timestep(frame, views, lw, renderer='matplotlib', roi=None):
     """
     Process and visualize a single simulation timestep.
 
     This function handles the complete visualization pipeline for one timestep:
     extracting interface data, field data, creating dual-sided contour plots
-    with colorbars, and saving the result as a high-resolution image.
+    with colorbars, and saving the result as a high-resolution image per view.
+    The snapshot is sampled once, over the union of the view windows at the
+    finest requested resolution, and every view is cut from those arrays.
 
     Args:
-        ti (int): Timestep index (will be converted to simulation time)
-        folder (str): Output directory for saved images
-        nGFS (int): Total number of simulation files (used for validation)
-        GridsPerR (int): Grid resolution parameter (grids per unit radius)
-        rmin (float): Minimum radial coordinate for plotting
-        rmax (float): Maximum radial coordinate for plotting
-        zmin (float): Minimum axial coordinate for plotting
-        zmax (float): Maximum axial coordinate for plotting
+        frame (tuple): (t, path, compression) from snapshot_frames()
+        views (list): View dicts from make_view()
         lw (float): Line width for boundary boxes
+        renderer (str): 'matplotlib', or 'numpy' for the rasterizer of
+                        rasterAxi.py (same layout, a fraction of the cost)
+        roi (tuple): (pad, grids_per_r, coarsen) to sample the box around
+                     the interface (plus pad) at grids_per_r and the rest of
+                     the windows at grids_per_r/coarsen of the views; None
+                     samples the whole windows at their grids_per_r
 
     Returns:
         None: Function saves visualization directly to file
@@ -243,39 +543,214 @@ def process_timestep(ti, folder, nGFS, GridsPerR, rmin, rmax, zmin, zmax, lw):
         - Implements custom colormap for viscoelastic stress fields
         - Handles missing files gracefully with informative error messages
     """
-    # Convert timestep index to simulation time
-    t = 0.01 * ti
-    place = f"intermediate/snapshot-{t:.4f}"
-    name = f"{folder}/{int(t*1000):08d}.png"
+    todo = frame_plan(frame, views)
+    if not todo:
+        return
+    t, place, compression = frame
+
+    window, GridsPerR = sampling_plan(todo, roi)
+    with readable_snapshot(place, compression) as snapshot:
+        # Extract interface data with and without coating
+        segs1 = gettingFacets(snapshot)          # With coating
+        segs2 = gettingFacets(snapshot, 'false') # Without coating
+
+        # Validate interface data
+        if not segs1 and not segs2:
+            print(f"Problem in the available file {place}")
+            return
+
+        # Extract field data on uniform grid
+        sampled = stacked_field(gettingfield(snapshot, *window))
+        inset = None
+        box = roi_window(segs1 + segs2, window, roi)
+        if box is not None:
+            inset = stacked_field(gettingfield(snapshot, *box))
+
+    render_timestep(t, todo, segs1, segs2, sampled, inset, GridsPerR, lw, renderer, roi)
+
+
+def frame_plan(frame, views):
+    """
+    Views of a frame still to be rendered.
+
+    Returns:
+        list: (view, image name) pairs, empty if there is nothing to do
+    """
+    t, place, compression = frame
 
     # Check if input file exists
     if not os.path.exists(place):
         print(f"{place} File not found!")
-        return
+        return []
+
+    # Skip the views whose output already exists
+    todo = []
+    for view in views:
+        name = f"{view['folder']}/{frame_key(frame)}.png"
+        if os.path.exists(name):
+            print(f"{name} Image present!")
+        else:
+            todo.append((view, name))
+    return todo
+
+
+def sampling_plan(todo, roi=None):
+    """
+    One sampling window covering every view, at the finest resolution.
+
+    Args:
+        todo (list): (view, image name) pairs from frame_plan()
+        roi (tuple): (pad, grids_per_r, coarsen) or None, see process_timestep()
+
+    Returns:
+        tuple: ((zmin, zmax, rmax, nr) arguments of gettingfield(), GridsPerR)
+    """
+    zmin = min(view['zmin'] for view, _ in todo)
+    zmax = max(view['zmax'] for view, _ in todo)
+    rmax = max(view['rmax'] for view, _ in todo)
+    GridsPerR = max(view['grids_per_r'] for view, _ in todo)
+    if roi is not None:
+        GridsPerR = GridsPerR/roi[2]
+    return (zmin, zmax, rmax, max(int(GridsPerR * rmax), 2)), GridsPerR
+
+
+def roi_window(segs, window, roi):
+    """
+    Fine sampling of the region of interest.
+
+    Returns:
+        tuple or None: (zmin, zmax, rmax, nr, rmin) arguments of
+                       gettingfield(), or None without ROI
+    """
+    if roi is None:
+        return None
+    pad, roiGridsPerR, coarsen = roi
+    zmin, zmax, rmax, nr = window
+    box = interface_box(segs, pad, rmax, zmin, zmax)
+    if box is None:
+        return None
+    r0, r1, z0, z1 = box
+    return z0, z1, r1, max(int(roiGridsPerR * (r1 - r0)), 2), r0
+
+
+def stacked_field(field):
+    """
+    Fields of gettingfield() as (values (nz, nr, 3), z, r), None if empty.
+    """
+    R, Z, taus, vel, taup, nz = field
+    if not nz:
+        return None
+    return np.stack([taus, vel, taup], axis=-1), Z[:, 0], R[0]
+
+
+def render_timestep(t, todo, segs1, segs2, sampled, inset, GridsPerR, lw,
+                    renderer='matplotlib', roi=None):
+    """
+    Render the views of a timestep from its extracted data.
 
-    # Skip if output already exists
-    if os.path.exists(name):
-        print(f"{name} Image present!")
+    Args:
+        t (float): Simulation time
+        todo (list): (view, image name) pairs from frame_plan()
+        segs1, segs2 (list): Interface segments with and without coating
+        sampled (tuple): (values, z, r) from stacked_field()
+        inset (tuple): Finely sampled (values, z, r) of the ROI, or None
+        GridsPerR (float): Resolution of sampled
+        lw, renderer, roi: As for process_timestep()
+    """
+    if sampled is None:
+        print(f"No field data at t = {t}")
         return
+    for view, name in todo:
+        stride = max(int(GridsPerR // view['grids_per_r']), 1) if roi is None else 1
+        fields = view_fields(view, *sampled, stride)
+        if fields is None:
+            print(f"{name}: window outside the sampled data")
+            continue
+        view_inset = view_fields(view, *inset) if inset is not None else None
+        draw_frame(name, t, view, fields, segs1, segs2, lw, renderer, view_inset)
+
+
+def view_fields(view, values, z, r, stride=1):
+    """
+    Cut the fields of a view out of the shared samples.
 
-    # Extract interface data with and without coating
-    segs1 = gettingFacets(place)          # With coating
-    segs2 = gettingFacets(place, 'false') # Without coating
+    Args:
+        view (dict): View from make_view()
+        values (numpy.ndarray): (nz, nr, 3) samples of D2, vel and taup
+        z (numpy.ndarray): Axial coordinates of the rows
+        r (numpy.ndarray): Radial coordinates of the columns
+        stride (int): Keep every stride-th sample (views coarser than the
+                      shared sampling)
+
+    Returns:
+        tuple or None: (left, right, extent) with extent = (rminp, rmaxp,
+                       zminp, zmaxp), or None if the window holds no samples
+    """
+    rows = np.flatnonzero((z >= view['zmin']) & (z <= view['zmax']))
+    cols = np.flatnonzero(r <= view['rmax'])
+    if rows.size < 2 or cols.size < 2:
+        return None
+    rows = slice(rows[0], rows[-1] + 1, stride)
+    cols = slice(cols[0], cols[-1] + 1, stride)
+    block, zs, rs = values[rows, cols], z[rows], r[cols]
+    return (block[..., FIELD_STYLES[view['left']]['column']],
+            block[..., FIELD_STYLES[view['right']]['column']],
+            (rs.min(), rs.max(), zs.min(), zs.max()))
+
+
+def draw_frame(name, t, view, fields, segs1, segs2, lw, renderer, inset=None):
+    """
+    Render and save one view of a timestep.
 
-    # Validate interface data
-    if not segs1 and not segs2:
-        print(f"Problem in the available file {place}")
+    Args:
+        name (str): Output image
+        t (float): Simulation time
+        view (dict): View from make_view()
+        fields (tuple): (left, right, extent) from view_fields()
+        segs1, segs2 (list): Interface segments with and without coating
+        lw (float): Line width for boundary boxes
+        renderer (str): 'matplotlib' or 'numpy'
+        inset (tuple): Finely sampled (left, right, extent), or None
+    """
+    window = (-view['rmax'], view['rmax'], view['zmin'], view['zmax'])
+    if renderer == 'numpy':
+        frames = frame_renderer(*window, lw, view)
+        width = DEFAULT_CONFIG['interface_line_width']
+        left, right, extent = fields
+        frames.save(name, frames.render(t, left, right, extent,
+                                        [(segs2, 'green', width), (segs1, 'blue', width)],
+                                        inset=inset))
         return
 
-    # Extract field data on uniform grid
-    nr = int(GridsPerR * rmax)
-    R, Z, taus, vel, taup, nz = gettingfield(place, zmin, zmax, rmax, nr)
-    zminp, zmaxp, rminp, rmaxp = Z.min(), Z.max(), R.min(), R.max()
+    frame_figure(t, *window, lw, fields, segs1, segs2, inset, view)
 
-    # ===============================
-    # Create Visualization
-    # ===============================
+    # Save high-quality output
+    plt.savefig(name, bbox_inches="tight", dpi=300)
+    plt.close()  # Free memory
 
+
+def frame_figure(t, rmin, rmax, zmin, zmax, lw, fields=None, segs1=(), segs2=(), inset=None,
+                 view=None):
+    """
+    Build the matplotlib figure of one frame.
+
+    Args:
+        t (float): Simulation time shown in the title
+        rmin, rmax, zmin, zmax (float): Plot limits
+        lw (float): Line width for boundary boxes
+        fields (tuple): (left, right, extent) with extent = (rminp, rmaxp,
+                        zminp, zmaxp); None leaves the axes empty and only
+                        draws the colorbars (the layout used by rasterAxi.py)
+        segs1 (list): Interface segments with coating (blue)
+        segs2 (list): Interface segments without coating (green)
+        inset (tuple): (left, right, extent) sampled finely over a part of
+                       the window, drawn over fields
+        view (dict): Fields, colormaps and limits, from make_view() (default:
+                     D2 on the left, taup on the right)
+
+    Returns:
+        tuple: (fig, ax)
+    """
     AxesLabel, TickLabel = DEFAULT_CONFIG['axes_label_size'], DEFAULT_CONFIG['tick_label_size']
     fig, ax = plt.subplots()
     fig.set_size_inches(19.20, 10.80)  # High-resolution output
@@ -295,46 +770,84 @@ def process_timestep(ti, folder, nGFS, GridsPerR, rmin, rmax, zmin, zmax, lw):
                                  colors='blue', linestyle='solid')
     ax.add_collection(line_segments)
 
-    # Create strain rate contour plot (left side, mirrored)
-    cntrl1 = ax.imshow(taus, cmap="hot_r", interpolation='Bilinear', origin='lower',
-                      extent=[-rminp, -rmaxp, zminp, zmaxp],
-                      vmax=DEFAULT_CONFIG['strain_vmax'], vmin=DEFAULT_CONFIG['strain_vmin'])
-
-    # Create stress trace contour plot (right side)
-    cntrl2 = ax.imshow(taup, interpolation='Bilinear', cmap=CUSTOM_CMAP, origin='lower',
-                      extent=[rminp, rmaxp, zminp, zmaxp],
-                      vmax=DEFAULT_CONFIG['stress_vmax'], vmin=DEFAULT_CONFIG['stress_vmin'])
+    view = view or make_view()
+    styles = [(colormap(view['left_cmap']),) + view['left_limits'],
+              (colormap(view['right_cmap']),) + view['right_limits']]
+
+    if fields is None:
+        cntrl1, cntrl2 = [matplotlib.cm.ScalarMappable(mcolors.Normalize(vmin, vmax), cmap)
+                          for cmap, vmin, vmax in styles]
+    else:
+        left, right, (rminp, rmaxp, zminp, zmaxp) = fields
+
+        # Left field (mirrored)
+        cntrl1 = ax.imshow(left, cmap=styles[0][0], interpolation='Bilinear', origin='lower',
+                          extent=[-rminp, -rmaxp, zminp, zmaxp],
+                          vmin=styles[0][1], vmax=styles[0][2])
+
+        # Right field
+        cntrl2 = ax.imshow(right, cmap=styles[1][0], interpolation='Bilinear', origin='lower',
+                          extent=[rminp, rmaxp, zminp, zmaxp],
+                          vmin=styles[1][1], vmax=styles[1][2])
+
+    if inset is not None:
+        # Finely sampled region of interest over the coarse fields
+        lefti, righti, (r0, r1, z0, z1) = inset
+        ax.imshow(lefti, cmap=styles[0][0], interpolation='Bilinear', origin='lower',
+                  extent=[-r0, -r1, z0, z1], vmin=styles[0][1], vmax=styles[0][2])
+        ax.imshow(righti, cmap=styles[1][0], interpolation='Bilinear', origin='lower',
+                  extent=[r0, r1, z0, z1], vmin=styles[1][1], vmax=styles[1][2])
 
     # Set plot properties
     ax.set_aspect('equal')
     ax.set_xlim(rmin, rmax)
     ax.set_ylim(zmin, zmax)
-    ax.set_title(f'$t/\\tau_\\gamma$ = {t:4.3f}', fontsize=TickLabel)
+    ax.set_title(f'{TITLE_PREFIX} {t:4.3f}', fontsize=TickLabel)
 
     # Add colorbars
     l, b, w, h = ax.get_position().bounds
 
-    # Left colorbar for strain rate
+    # Left colorbar
     cb1 = fig.add_axes([l-0.04, b, 0.03, h])
     c1 = plt.colorbar(cntrl1, cax=cb1, orientation='vertical')
-    c1.set_label(r'$\log_{10}\left(\|\mathcal{D}\|\right)$', fontsize=TickLabel, labelpad=5)
+    c1.set_label(FIELD_STYLES[view['left']]['label'], fontsize=TickLabel, labelpad=5)
     c1.ax.tick_params(labelsize=TickLabel)
     c1.ax.yaxis.set_ticks_position('left')
     c1.ax.yaxis.set_label_position('left')
     c1.ax.yaxis.set_major_formatter(StrMethodFormatter('{x:,.1f}'))
 
-    # Right colorbar for stress trace
+    # Right colorbar
     cb2 = fig.add_axes([l+w+0.01, b, 0.03, h])
     c2 = plt.colorbar(cntrl2, cax=cb2, orientation='vertical')
     c2.ax.tick_params(labelsize=TickLabel)
-    c2.set_label(r'$\log_{10}\left(\text{tr}\left(\mathcal{A}\right)-1\right)$', fontsize=TickLabel)
+    c2.set_label(FIELD_STYLES[view['right']]['label'], fontsize=TickLabel)
     c2.ax.yaxis.set_major_formatter(StrMethodFormatter('{x:,.2f}'))
 
     ax.axis('off')  # Remove axis ticks and labels for cleaner look
 
-    # Save high-quality output
-    plt.savefig(name, bbox_inches="tight", dpi=300)
-    plt.close()  # Free memory
+    return fig, ax
+
+
+def frame_renderer(rmin, rmax, zmin, zmax, lw, view=None):
+    """
+    The NumPy renderer for frames with these limits, built once per process.
+
+    Returns:
+        rasterAxi.FrameRenderer: Renderer reusing the layout and overlays of
+        frame_figure()
+    """
+    view = view or make_view()
+    key = (rmin, rmax, zmin, zmax, lw, view['left'], view['right'],
+           view['left_cmap'], view['right_cmap'], view['left_limits'], view['right_limits'])
+    if key not in _FRAME_RENDERERS:
+        fig, ax = frame_figure(0., rmin, rmax, zmin, zmax, lw, view=view)
+        _FRAME_RENDERERS[key] = FrameRenderer(
+            fig, ax,
+            (colormap(view['left_cmap']),) + view['left_limits'],
+            (colormap(view['right_cmap']),) + view['right_limits'],
+            TITLE_PREFIX, '{:4.3f}', dpi=300)
+        plt.close(fig)
+    return _FRAME_RENDERERS[key]
 
 # ===============================
 # Main Execution Function
@@ -354,6 +867,19 @@ def main():
         --ZMAX (float): Maximum axial coordinate (default: 4.0)
         --RMAX (float): Maximum radial coordinate (default: 2.0)
         --ZMIN (float): Minimum axial coordinate (default: -4.0)
+        --renderer (str): matplotlib or numpy (default: matplotlib)
+        --views (str): JSON list of views (see make_view()) rendered from
+                       one extraction per snapshot; replaces the window
+                       options
+        --queue: Claim frames through Video/.queue/ so that workers on
+                 several nodes share one movie; --claim-timeout sets when
+                 the claims of crashed workers are taken over
+        --extractors (int): Run the facet helpers from an asyncio loop,
+                 with this many helpers in flight, ahead of the --CPUs
+                 render processes (asyncExtract.py); 0 runs all helpers
+                 inside the pool processes
+        --roi: Region-of-interest sampling around the interface, tuned by
+               --roi-pad, --roi-grids-per-r and --roi-coarsen
 
     Returns:
         None: Creates output directory and processes all timesteps
@@ -378,7 +904,29 @@ def main():
                        help='Maximum R value (default: 2.0)')
     parser.add_argument('--ZMIN', type=float, default=-4.0,
                        help='Minimum Z value (default: -4.0)')
+    parser.add_argument('--roi', action='store_true',
+                       help='Sample the box around the interface finely and the rest coarsely')
+    parser.add_argument('--roi-pad', type=float, default=DEFAULT_CONFIG['roi_pad'],
+                       help=f"ROI margin around the interface (default: {DEFAULT_CONFIG['roi_pad']})")
+    parser.add_argument('--roi-grids-per-r', type=int, default=DEFAULT_CONFIG['roi_grids_per_r'],
+                       help=f"Grids per unit length inside the ROI (default: {DEFAULT_CONFIG['roi_grids_per_r']})")
+    parser.add_argument('--roi-coarsen', type=float, default=DEFAULT_CONFIG['roi_coarsen'],
+                       help=f"Resolution divisor outside the ROI (default: {DEFAULT_CONFIG['roi_coarsen']})")
+    parser.add_argument('--renderer', choices=['matplotlib', 'numpy'], default='matplotlib',
+                       help='Frame renderer; numpy rasterizes directly (default: matplotlib)')
+    parser.add_argument('--views', default=None,
+                       help='JSON file listing the views to render (default: one view of the window)')
+    parser.add_argument('--queue', action='store_true',
+                       help='Share the frames with other VideoAxi --queue runs through Video/.queue')
+    parser.add_argument('--claim-timeout', type=float, default=CLAIM_TIMEOUT,
+                       help=f'Seconds after which a frame claim counts as abandoned (default: {CLAIM_TIMEOUT:g})')
+    parser.add_argument('--extractors', type=int, default=0,
+                       help='Helper subprocesses in flight for asynchronous extraction; '
+                            'the --CPUs processes then only sample fields and render '
+                            '(default: 0, off)')
     args = parser.parse_args()
+    if args.queue and args.extractors:
+        parser.error('--queue and --extractors cannot be combined')
 
     # Extract parameters
     CPUStoUse = args.CPUs
@@ -389,32 +937,55 @@ def main():
 
     # Set processing parameters
     num_processes = CPUStoUse
-    rmin, rmax, zmin, zmax = [-RMAX, RMAX, ZMIN, ZMAX]
-    GridsPerR = DEFAULT_CONFIG['grids_per_r']
     lw = DEFAULT_CONFIG['line_width']
-    folder = 'Video'
+    if args.views:
+        views = load_views(args.views)
+    else:
+        views = [make_view(zmin=ZMIN, zmax=ZMAX, rmax=RMAX)]
 
-    # Create output directory
-    if not os.path.isdir(folder):
-        os.makedirs(folder)
-        print(f"Created output directory: {folder}")
+    # Create output directories
+    for view in views:
+        if not os.path.isdir(view['folder']):
+            os.makedirs(view['folder'])
+            print(f"Created output directory: {view['folder']}")
 
     print(f"Starting visualization process with {num_processes} CPUs...")
-    print(f"Processing {nGFS} timesteps from {ZMIN} to {ZMAX} in Z and {-RMAX} to {RMAX} in R")
-
-    # Create multiprocessing pool and process all timesteps
-    with mp.Pool(processes=num_processes) as pool:
-        # Create partial function with fixed arguments
-        process_func = partial(process_timestep,
-                             folder=folder, nGFS=nGFS,
-                             GridsPerR=GridsPerR, rmin=rmin, rmax=rmax,
-                             zmin=zmin, zmax=zmax, lw=lw)
-
-        # Map the processing function to all timesteps
-        timesteps = list(range(nGFS))
-        pool.map(process_func, timesteps)
+    for view in views:
+        print(f"Processing {nGFS} timesteps from {view['zmin']} to {view['zmax']} in Z and "
+              f"{-view['rmax']} to {view['rmax']} in R ({view['left']}|{view['right']}) "
+              f"into {view['folder']}/")
+
+    roi = (args.roi_pad, args.roi_grids_per_r, args.roi_coarsen) if args.roi else None
+    if args.extractors:
+        # imported here: asyncExtract builds on this module
+        import asyncio
+        from asyncExtract import render_frames
+        rendered = asyncio.run(render_frames(snapshot_frames(nGFS), views, lw, args.renderer, roi,
+                                             extractors=args.extractors,
+                                             render_workers=num_processes))
+        print(f"Rendered {rendered} frames")
+    else:
+        # Create multiprocessing pool and process all timesteps
+        with mp.Pool(processes=num_processes) as pool:
+            # Create partial function with fixed arguments
+            process_func = partial(process_timestep,
+                                 views=views, lw=lw,
+                                 renderer=args.renderer,
+                                 roi=roi)
+
+            if args.queue:
+                # Every process claims frames until none are left
+                worker = partial(queue_worker, frames=snapshot_frames(nGFS), process=process_func,
+                                 folder=os.path.join('Video', '.queue'), key=frame_key,
+                                 timeout=args.claim_timeout)
+                rendered = sum(pool.map(worker, range(num_processes), chunksize=1))
+                print(f"Rendered {rendered} frames on this node, see frameQueue.py for all workers")
+            else:
+                # Map the processing function to all snapshots
+                pool.map(process_func, snapshot_frames(nGFS))
 
-    print(f"Visualization complete! Images saved in {folder}/")
+    folders = ', '.join(f"{view['folder']}/" for view in views)
+    print(f"Visualization complete! Images saved in {folders}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Asynchronous Extraction for VideoAxi Frames
+
+`VideoAxi.py` normally runs the Basilisk helpers (getFacet2D,
+getData-elastic-scalar2D) with a blocking `Popen(...).communicate()` inside
+each pool process, so a process that waits for a helper to restore its
+snapshot from a slow shared file system renders nothing meanwhile. Here the
+main process drives the facet helpers from an asyncio event loop instead,
+ahead of the rendering:
+
+- up to `extractors` helper subprocesses are in flight at any time
+  (`asyncio.create_subprocess_exec`); the two facet extractions of a
+  snapshot run concurrently and their (small) outputs are read
+  incrementally from their pipes,
+- a pool of `render_workers` processes then runs the field helpers of a
+  frame, parses their (large) output straight from the pipe into
+  preallocated arrays (VideoAxi.gettingfield()) and draws the frame; the
+  field text is never held or spooled, so memory is bounded by the arrays
+  of the frames being rendered, and a render job holds one of the
+  `extractors` slots while its field helper runs,
+- at most `backlog` frames have their facets extracted but are not yet
+  rendered, which bounds the decompressed snapshots kept meanwhile.
+
+Extraction concurrency (I/O bound) and render concurrency (CPU bound) are
+thereby tuned separately.
+
+Usage:
+    python VideoAxi.py --extractors 16 --CPUs 8
+
+Dependencies:
+    - VideoAxi.py (same directory) and its compiled helpers
+
+Author: Vatsal Sanjay
+Contact: vatsalsanjay@gmail.com
+Affiliation: Physics of Fluids Group
+"""
+
+import asyncio
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+
+import VideoAxi
+
+
+async def helper_output(command, limit):
+    """
+    Runs a helper and collects its stderr, where the helpers write their data.
+
+    Args:
+        command (list): Command line
+        limit (asyncio.Semaphore): Bounds the helpers in flight
+
+    Returns:
+        bytes: The helper's stderr
+    """
+    async with limit:
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *command, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"{command[0]} executable not found. "
+                                    "Ensure it's compiled and in the current directory.")
+        chunks = []
+        while True:
+            chunk = await proc.stderr.read(VideoAxi.STREAM_CHUNK)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        await proc.wait()
+    return b''.join(chunks)
+
+
+async def extract_timestep(snapshot, frame, todo, roi, limit):
+    """
+    Runs the facet helpers of one frame, see VideoAxi.process_timestep().
+
+    Args:
+        snapshot (str): Readable snapshot from VideoAxi.readable_snapshot()
+
+    Returns:
+        tuple or None: Arguments of render_extracted() after the snapshot,
+                       or None if the snapshot has no interface
+    """
+    t, place, compression = frame
+    window, GridsPerR = VideoAxi.sampling_plan(todo, roi)
+    outputs = await asyncio.gather(helper_output(VideoAxi.facets_command(snapshot), limit),
+                                   helper_output(VideoAxi.facets_command(snapshot, 'false'), limit))
+    segs1, segs2 = VideoAxi.parse_facets(outputs[0]), VideoAxi.parse_facets(outputs[1])
+
+    # Validate interface data
+    if not segs1 and not segs2:
+        print(f"Problem in the available file {place}")
+        return None
+
+    windows = [window]
+    box = VideoAxi.roi_window(segs1 + segs2, window, roi)
+    if box is not None:
+        windows.append(box)
+    return t, todo, segs1, segs2, windows, GridsPerR
+
+
+def render_extracted(snapshot, job, lw, renderer, roi):
+    """
+    Samples the fields of an extracted frame and renders its views (in a
+    render worker).
+
+    Args:
+        snapshot (str): Readable snapshot
+        job (tuple): From extract_timestep()
+        lw, renderer, roi: As for VideoAxi.process_timestep()
+    """
+    t, todo, segs1, segs2, windows, GridsPerR = job
+    sampled, *inset = [VideoAxi.stacked_field(VideoAxi.gettingfield(snapshot, *window))
+                       for window in windows]
+    VideoAxi.render_timestep(t, todo, segs1, segs2, sampled, inset[0] if inset else None,
+                             GridsPerR, lw, renderer, roi)
+
+
+async def render_frames(frames, views, lw, renderer='matplotlib', roi=None,
+                        extractors=8, render_workers=4, backlog=None):
+    """
+    Extracts and renders all frames.
+
+    Args:
+        frames (list): (t, path, compression) from VideoAxi.snapshot_frames()
+        views (list): Views from VideoAxi.make_view()
+        lw, renderer, roi: As for VideoAxi.process_timestep()
+        extractors (int): Helper subprocesses in flight, the field helpers
+                          of the render workers included
+        render_workers (int): Render processes
+        backlog (int): Frames extracted but not yet rendered (default:
+                       twice render_workers)
+
+    Returns:
+        int: Number of frames rendered
+    """
+    loop = asyncio.get_running_loop()
+    limit = asyncio.Semaphore(extractors)
+    pending = asyncio.Semaphore(backlog or 2*render_workers)
+
+    with ProcessPoolExecutor(max_workers=render_workers) as pool:
+        async def one(frame):
+            todo = VideoAxi.frame_plan(frame, views)
+            if not todo:
+                return 0
+            t, place, compression = frame
+            async with pending:
+                with contextlib.ExitStack() as stack:
+                    try:
+                        # decompression of compacted snapshots blocks, keep it off the loop
+                        snapshot = await asyncio.to_thread(
+                            stack.enter_context, VideoAxi.readable_snapshot(place, compression))
+                        job = await extract_timestep(snapshot, frame, todo, roi, limit)
+                        if job is None:
+                            return 0
+                        async with limit:
+                            await loop.run_in_executor(pool, render_extracted, snapshot, job,
+                                                       lw, renderer, roi)
+                    except (OSError, ValueError) as e:
+                        print(f"Skipping {place}: {e}")
+                        return 0
+                    finally:
+                        await asyncio.to_thread(stack.close)
+                return 1
+
+        return sum(await asyncio.gather(*(one(frame) for frame in frames)))
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Basilisk Dump Reader
+
+Reads the binary files written by `dump()` (the `restart` file and the
+`intermediate/snapshot-*` files of `event writingFiles`) straight into
+NumPy arrays, so post-processing needs neither `qcc` nor the compiled
+helpers.
+
+Format (Basilisk `output.h`):
+
+    struct DumpHeader { double t; long len; int i, depth, npe, version;
+                        coord n; }
+    len x { unsigned length; char name[length]; }   field names
+    double o[4]                                     X0, Y0, Z0, L0
+    cells, depth-first (`foreach_cell()`):
+        unsigned flags;                             leaf bit = 1 << 1
+        double values[len];
+        children follow non-leaf cells in the order (0,0), (0,1), (1,0),
+        (1,1) of their (x, y) offsets (z fastest in 3D)
+
+The cell records are memory-mapped (or decoded from memory for snapshots
+compressed by `compactSnapshots.py`) and the tree is rebuilt with
+vectorized operations: prefix sums of the leaf flags give the extent of
+every subtree, from which the children of all cells of one level are
+found at once.
+
+Usage:
+    from basiliskDump import BasiliskDump
+    dump = BasiliskDump('intermediate/snapshot-0.1000')
+    leaves = dump.leaf
+    x, y, f = dump.x[leaves], dump.y[leaves], dump['f'][leaves]
+    values = dump.sample('f', points)       # points: (n, dimension) array
+
+    python basiliskDump.py intermediate/snapshot-0.1000   # summary
+
+Dependencies:
+    - numpy
+
+Author: Vatsal Sanjay
+Contact: vatsalsanjay@gmail.com
+Affiliation: Physics of Fluids Group
+"""
+
+import gzip
+import lzma
+import struct
+import sys
+
+import numpy as np
+
+HEADER = struct.Struct('=dqiiiiddd')
+VERSION_NO_ORIGIN = 161020  # dumps older than this layout lack o[4]
+LEAF_FLAG = 1 << 1
+
+
+def read_header(buffer, path='dump'):
+    """
+    Parses the header, field names and origin of a dump.
+
+    Args:
+        buffer (bytes-like): Start of the file (at least up to the first
+            cell record)
+        path (str): File name used in error messages
+
+    Returns:
+        dict: t, i, depth, npe, version, names, origin ([X0, Y0, Z0, L0])
+        and data_offset
+
+    Raises:
+        ValueError: If the buffer does not hold a dump header
+    """
+    if len(buffer) < HEADER.size:
+        raise ValueError(f"{path}: truncated header")
+    t, nvar, i, depth, npe, version, *_ = HEADER.unpack_from(buffer)
+    if not 0 < nvar < 1000 or depth < 0 or npe < 1:
+        raise ValueError(f"{path}: not a Basilisk dump file")
+    offset, names = HEADER.size, []
+    for _ in range(nvar):
+        length, = struct.unpack_from('=I', buffer, offset)
+        names.append(bytes(buffer[offset + 4:offset + 4 + length]).decode('utf-8', 'replace'))
+        offset += 4 + length
+    origin = [0., 0., 0., 1.]
+    if version != VERSION_NO_ORIGIN:
+        origin = list(struct.unpack_from('=4d', buffer, offset))
+        offset += 32
+    if offset > len(buffer):
+        raise ValueError(f"{path}: truncated header")
+    return {'t': t, 'i': i, 'depth': depth, 'npe': npe, 'version': version,
+            'names': names, 'origin': origin, 'data_offset': offset}
+
+
+def subtree_ends(leaf, children):
+    """
+    Index of the last record of every subtree.
+
+    With d = -1 for leaves and children - 1 for other cells, the subtree
+    starting at record p ends at the first q >= p where the partial sum
+    of d from p reaches -1 (each step down is exactly -1, so that value
+    is hit exactly).
+
+    Args:
+        leaf (numpy.ndarray): Leaf mask of the records, in file order
+        children (int): Children per cell (4 or 8)
+
+    Returns:
+        numpy.ndarray or None: End index of every subtree, or None if the
+        records do not form one complete tree
+    """
+    n = len(leaf)
+    steps = np.where(leaf, -1, children - 1).astype(np.int64)
+    height = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(steps, out=height[1:])
+    if n == 0 or height[-1] != -1 or height[:-1].min() < 0:
+        return None
+    # first q + 1 > p with height[q + 1] == height[p] - 1, as a sorted search
+    # over keys (height, position)
+    pos = np.arange(1, n + 1, dtype=np.int64)
+    keys = (height[1:] + 1)*(n + 2) + pos
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    queries = height[:-1]*(n + 2) + np.arange(n, dtype=np.int64) + 1
+    return pos[order[np.searchsorted(sorted_keys, queries)]] - 1
+
+
+class BasiliskDump:
+    """
+    A Basilisk dump file as NumPy arrays.
+
+    Attributes:
+        t (float): Simulation time
+        i (int): Iteration
+        names (list): Dumped fields
+        dimension (int): 2 or 3
+        origin (list): X0, Y0, Z0, L0
+        level (numpy.ndarray): Level of every cell
+        leaf (numpy.ndarray): Leaf mask
+        x, y, z (numpy.ndarray): Cell centers (z only in 3D)
+        Delta (numpy.ndarray): Cell sizes
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        if self.path.endswith(('.gz', '.xz')):
+            opener = gzip.open if self.path.endswith('.gz') else lzma.open
+            with opener(self.path, 'rb') as fp:
+                data = fp.read()
+            header = read_header(data, self.path)
+            raw = np.frombuffer(data, dtype=np.uint8, offset=header['data_offset'])
+        else:
+            with open(self.path, 'rb') as fp:
+                header = read_header(fp.read(1 << 16), self.path)
+            raw = np.memmap(self.path, dtype=np.uint8, mode='r',
+                            offset=header['data_offset'])
+        self.t, self.i = header['t'], header['i']
+        self.names = header['names']
+        self.origin = header['origin']
+        self.header = header
+
+        record = np.dtype([('flags', '=u4'), ('values', '=f8', (len(self.names),))])
+        if raw.size % record.itemsize:
+            raise ValueError(f"{self.path}: truncated cell records")
+        self.records = raw.view(record)
+        self.leaf = (self.records['flags'] & LEAF_FLAG) != 0
+        for dimension in (2, 3):
+            ends = subtree_ends(self.leaf, 1 << dimension)
+            if ends is not None:
+                break
+        else:
+            raise ValueError(f"{self.path}: incomplete cell tree")
+        self.dimension = dimension
+        self._build_tree(ends)
+
+    def _build_tree(self, ends):
+        """
+        Computes the level and integer position of every cell, one level
+        at a time.
+        """
+        n, nchild = len(self.leaf), 1 << self.dimension
+        self.level = np.zeros(n, dtype=np.int8)
+        index = np.zeros((self.dimension, n), dtype=np.int64)
+        current = np.zeros(1, dtype=np.int64)
+        depth = 0
+        while current.size:
+            parents = current[~self.leaf[current]]
+            child = parents + 1
+            found = []
+            for c in range(nchild):
+                self.level[child] = depth + 1
+                for axis in range(self.dimension):
+                    bit = (c >> (self.dimension - 1 - axis)) & 1
+                    index[axis, child] = 2*index[axis, parents] + bit
+                found.append(child)
+                if c < nchild - 1:
+                    child = ends[child] + 1
+            current = np.concatenate(found) if found else child[:0]
+            depth += 1
+        self.depth = int(self.level.max())
+        L0 = self.origin[3]
+        self.Delta = L0/(1 << self.level.astype(np.int64))
+        coords = []
+        for axis in range(self.dimension):
+            coords.append(self.origin[axis] + (index[axis] + 0.5)*self.Delta)
+        self.index = index
+        self.x, self.y = coords[0], coords[1]
+        self.z = coords[2] if self.dimension == 3 else None
+
+    def __getitem__(self, name):
+        """
+        Returns:
+            numpy.ndarray: Values of a field in every cell (a view into
+            the file)
+        """
+        try:
+            return self.records['values'][:, self.names.index(name)]
+        except ValueError:
+            raise KeyError(f"{name} not in {self.path} (fields: {', '.join(self.names)})")
+
+    def __len__(self):
+        return len(self.leaf)
+
+    def locate(self, points):
+        """
+        Finds the leaf cell containing each point.
+
+        Args:
+            points (numpy.ndarray): (n, dimension) coordinates
+
+        Returns:
+            numpy.ndarray: Cell index per point, -1 outside the domain
+        """
+        points = np.atleast_2d(np.asarray(points, dtype=float))
+        if not hasattr(self, '_leaf_keys'):
+            leaves = np.flatnonzero(self.leaf)
+            keys = self._keys(self.level[leaves], self.index[:, leaves])
+            order = np.argsort(keys)
+            self._leaf_keys, self._leaf_cells = keys[order], leaves[order]
+        X0, L0 = np.array(self.origin[:self.dimension]), self.origin[3]
+        unit = (points - X0)/L0
+        inside = np.all((unit >= 0.) & (unit < 1.), axis=1)
+        cell = np.full(len(points), -1, dtype=np.int64)
+        pending = np.flatnonzero(inside)
+        for level in range(self.depth + 1):
+            if not pending.size:
+                break
+            ij = np.floor(unit[pending]*(1 << level)).astype(np.int64).T
+            keys = self._keys(np.full(pending.size, level), ij)
+            k = np.searchsorted(self._leaf_keys, keys)
+            k = np.minimum(k, len(self._leaf_keys) - 1)
+            hit = self._leaf_keys[k] == keys
+            cell[pending[hit]] = self._leaf_cells[k[hit]]
+            pending = pending[~hit]
+        return cell
+
+    def find(self, level, index):
+        """
+        Finds cells (leaf or not) by level and integer position.
+
+        Args:
+            level (numpy.ndarray): Levels
+            index (numpy.ndarray): (dimension, n) integer positions on
+                their level
+
+        Returns:
+            numpy.ndarray: Cell index, -1 where the dump has no such cell
+        """
+        if not hasattr(self, '_cell_keys'):
+            keys = self._keys(self.level, self.index)
+            self._cell_order = np.argsort(keys)
+            self._cell_keys = keys[self._cell_order]
+        level = np.asarray(level, dtype=np.int64)
+        keys = self._keys(level, index)
+        k = np.minimum(np.searchsorted(self._cell_keys, keys), len(self._cell_keys) - 1)
+        size = np.left_shift(1, level)
+        valid = np.all((index >= 0) & (index < size), axis=0) & (level <= self.depth)
+        return np.where((self._cell_keys[k] == keys) & valid, self._cell_order[k], -1)
+
+    def _keys(self, level, index):
+        """
+        Packs (level, integer position) into one int64 per cell.
+        """
+        bits = self.depth + 1
+        key = np.asarray(level, dtype=np.int64)
+        for axis in range(self.dimension):
+            key = (key << bits) | index[axis]
+        return key
+
+    def sample(self, name, points, outside=np.nan):
+        """
+        Piecewise-constant value of a field at some points.
+
+        Args:
+            name (str): Field name
+            points (numpy.ndarray): (n, dimension) coordinates
+            outside (float): Value for points outside the domain
+
+        Returns:
+            numpy.ndarray: Field value per point
+        """
+        cell = self.locate(points)
+        values = np.full(len(cell), outside, dtype=float)
+        found = cell >= 0
+        values[found] = self[name][cell[found]]
+        return values
+
+
+def main(argv=None):
+    """
+    Prints a summary of a dump file.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        print("Usage: python basiliskDump.py DUMP_FILE")
+        return 1
+    try:
+        dump = BasiliskDump(argv[0])
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+    counts = np.bincount(dump.level[dump.leaf])
+    print(f"{argv[0]}: t = {dump.t:g}, i = {dump.i}, {dump.dimension}D, "
+          f"{len(dump)} cells ({int(dump.leaf.sum())} leaves), depth {dump.depth}")
+    print(f"origin {dump.origin[:dump.dimension]}, L0 = {dump.origin[3]:g}")
+    print("leaves per level: " + ', '.join(f"{level}: {count}"
+                                           for level, count in enumerate(counts) if count))
+    for name in dump.names:
+        values = dump[name][dump.leaf]
+        print(f"  {name:<14} min {values.min():< 12.5g} max {values.max():< 12.5g}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
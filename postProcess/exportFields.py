@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Chunked Field Export of Whole Runs
+
+Samples every snapshot of a run on the uniform grid of `VideoAxi.py`
+(`gettingfield()`, i.e. ./getData-elastic-scalar2D) and appends the frames
+to one chunked, compressed array store, so later analyses slice the
+region and times they need without touching the snapshots again.
+
+Layout (HDF5 file or Zarr group):
+
+    fields   float32 (t, nz, nr, field), chunked by time and space,
+             fields D2, vel, taup as returned by gettingfield()
+    t        float64 (t,)
+    attrs    fields, z, r (grid coordinates), zmin, zmax, rmax, nr and
+             params (the run's .params file as JSON)
+
+The store is appendable: rerunning the exporter, or `--watch` while the
+simulation runs, only adds snapshots later than the last stored frame.
+
+Usage:
+    cd simulationCases/dropImpact
+    python ../../postProcess/exportFields.py --store fields.h5
+    python ../../postProcess/exportFields.py --store fields.zarr --watch 600
+
+    import h5py
+    with h5py.File('fields.h5') as store:
+        axis = store['fields'][:, :, 0, 2]     # taup on the axis, all times
+
+Dependencies:
+    - numpy
+    - h5py (for .h5 stores) or zarr >= 3 (for .zarr stores)
+    - VideoAxi.py and the compiled ./getData-elastic-scalar2D
+
+Author: Vatsal Sanjay
+Contact: vatsalsanjay@gmail.com
+Affiliation: Physics of Fluids Group
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import sys
+import time
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+
+from VideoAxi import DEFAULT_CONFIG, gettingfield, readable_snapshot, snapshot_frames
+
+FIELDS = ['D2', 'vel', 'taup']
+TIME_CHUNK = 8       # frames per chunk
+SPACE_CHUNK = 256    # grid points per chunk along z and r
+
+
+def read_run_params(run_dir='.'):
+    """
+    Parameters of the run, from the first `.params` file of its directory.
+
+    Returns:
+        dict: Values as floats where possible, otherwise strings
+    """
+    for path in sorted(Path(run_dir).glob('*.params')):
+        params = {}
+        for line in path.read_text().splitlines():
+            key, sep, value = line.split('#', 1)[0].partition('=')
+            if sep and key.strip():
+                try:
+                    params[key.strip()] = float(value)
+                except ValueError:
+                    params[key.strip()] = value.strip()
+        return params
+    return {}
+
+
+class FieldStore:
+    """
+    Appendable (t, nz, nr, field) store in HDF5 (.h5) or Zarr (.zarr).
+
+    Args:
+        path (str): Store path; the suffix selects the format
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.zarr = self.path.rstrip('/').endswith('.zarr')
+        try:
+            if self.zarr:
+                import zarr
+                self.root = zarr.open_group(self.path, mode='a')
+            else:
+                import h5py
+                self.root = h5py.File(self.path, 'a')
+        except ImportError as e:
+            raise ImportError(f"{self.path} needs the {e.name} package") from e
+
+    def times(self):
+        """
+        Returns:
+            numpy.ndarray: Times of the stored frames
+        """
+        return np.asarray(self.root['t'][:]) if 't' in self.root else np.zeros(0)
+
+    def _create(self, nz, nr, attrs):
+        chunks = (TIME_CHUNK, min(nz, SPACE_CHUNK), min(nr, SPACE_CHUNK), len(FIELDS))
+        shape = (0, nz, nr, len(FIELDS))
+        if self.zarr:
+            self.root.create_array('fields', shape=shape, chunks=chunks, dtype='f4')
+            self.root.create_array('t', shape=(0,), chunks=(1024,), dtype='f8')
+        else:
+            self.root.create_dataset('fields', shape=shape, maxshape=(None,) + shape[1:],
+                                     chunks=chunks, dtype='f4', compression='gzip',
+                                     compression_opts=4, shuffle=True)
+            self.root.create_dataset('t', shape=(0,), maxshape=(None,), chunks=(1024,),
+                                     dtype='f8')
+        for key, value in attrs.items():
+            self.root.attrs[key] = value
+
+    def append(self, t, frame, attrs):
+        """
+        Adds one frame, creating the arrays on first use.
+
+        Args:
+            t (float): Time
+            frame (numpy.ndarray): (nz, nr, field) values
+            attrs (dict): Attributes stored with the arrays on creation
+
+        Raises:
+            ValueError: If the grid differs from the stored one
+        """
+        if 'fields' not in self.root:
+            self._create(frame.shape[0], frame.shape[1], attrs)
+        fields = self.root['fields']
+        if tuple(fields.shape[1:]) != frame.shape:
+            raise ValueError(f"{self.path}: frame grid {frame.shape} differs from "
+                             f"the stored {tuple(fields.shape[1:])}")
+        if self.zarr:
+            fields.append(frame[None].astype(np.float32), axis=0)
+            self.root['t'].append(np.array([t]))
+        else:
+            n = fields.shape[0]
+            fields.resize(n + 1, axis=0)
+            fields[n] = frame
+            self.root['t'].resize(n + 1, axis=0)
+            self.root['t'][n] = t
+            self.root.flush()
+
+    def close(self):
+        if not self.zarr:
+            self.root.close()
+
+
+def sample_frame(frame, zmin, zmax, rmax, nr):
+    """
+    Samples one snapshot on the uniform grid.
+
+    Returns:
+        tuple or None: (t, values (nz, nr, field), z, r), or None if the
+        snapshot could not be sampled
+    """
+    t, place, compression = frame
+    try:
+        with readable_snapshot(place, compression) as snapshot:
+            R, Z, D2, vel, taup, nz = gettingfield(snapshot, zmin, zmax, rmax, nr)
+    except (OSError, ValueError) as e:
+        print(f"Skipping {place}: {e}")
+        return None
+    if nz == 0:
+        print(f"Skipping {place}: no data")
+        return None
+    return t, np.stack([D2, vel, taup], axis=-1), Z[:, 0], R[0]
+
+
+def export(store, frames, zmin, zmax, rmax, nr, CPUs, params):
+    """
+    Appends the frames later than the last stored one.
+
+    Returns:
+        int: Number of appended frames
+    """
+    stored = store.times()
+    last = stored.max() if stored.size else -np.inf
+    frames = [frame for frame in frames if frame[0] > last and Path(frame[1]).exists()]
+    if not frames:
+        return 0
+    count = 0
+    work = partial(sample_frame, zmin=zmin, zmax=zmax, rmax=rmax, nr=nr)
+    with mp.Pool(processes=CPUs) as pool:
+        # ordered, so the store stays sorted by time
+        for result in pool.imap(work, frames):
+            if result is None:
+                continue
+            t, values, z, r = result
+            attrs = {'fields': FIELDS, 'z': z.tolist(), 'r': r.tolist(),
+                     'zmin': zmin, 'zmax': zmax, 'rmax': rmax, 'nr': nr,
+                     'params': json.dumps(params)}
+            store.append(t, values, attrs)
+            count += 1
+    return count
+
+
+def main(argv=None):
+    """
+    Exports the sampled fields of all snapshots of a run.
+    """
+    parser = argparse.ArgumentParser(description="Export sampled fields of a run to HDF5 or Zarr")
+    parser.add_argument('--store', default='fields.h5',
+                        help='Output store, .h5 or .zarr (default: fields.h5)')
+    parser.add_argument('--CPUs', type=int, default=mp.cpu_count(),
+                        help='Number of CPUs to use (default: all available)')
+    parser.add_argument('--nGFS', type=int, default=550,
+                        help='Number of restart files to process (default: 550)')
+    parser.add_argument('--ZMAX', type=float, default=4.0,
+                        help='Maximum Z value (default: 4.0)')
+    parser.add_argument('--RMAX', type=float, default=2.0,
+                        help='Maximum R value (default: 2.0)')
+    parser.add_argument('--ZMIN', type=float, default=-4.0,
+                        help='Minimum Z value (default: -4.0)')
+    parser.add_argument('--watch', type=float, default=0., metavar='SECONDS',
+                        help='Keep appending new snapshots, polling at this interval')
+    args = parser.parse_args(argv)
+
+    nr = int(DEFAULT_CONFIG['grids_per_r']*args.RMAX)
+    params = read_run_params()
+    try:
+        store = FieldStore(args.store)
+    except ImportError as e:
+        print(f"Error: {e}")
+        return 1
+    try:
+        while True:
+            frames = [frame for frame in snapshot_frames(args.nGFS)
+                      if Path(frame[1]).exists()]
+            added = export(store, frames, args.ZMIN, args.ZMAX, args.RMAX, nr,
+                           args.CPUs, params)
+            print(f"{args.store}: added {added} frames, {len(store.times())} in total")
+            if args.watch <= 0:
+                break
+            time.sleep(args.watch)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+File-System Work Queue for Frame Rendering
+
+Lets any number of `VideoAxi.py --queue` workers, on any hosts sharing the
+run directory, render the frames of one movie together. There is no
+server: workers coordinate through files in Video/.queue/:
+
+    <frame>.claim   created with O_CREAT | O_EXCL by the worker rendering
+                    the frame (host, pid, time as JSON); exclusive creation
+                    is atomic on local file systems and NFSv3+
+    <frame>.done    written when the frame is finished (whether or not it
+                    produced an image, so broken snapshots are not retried
+                    forever), with its render time
+    worker-<host>-<pid>.json
+                    timing report of each worker, rewritten after every
+                    frame
+
+A claim is stale, and taken over by the next worker that sees it, when it
+is older than the claim timeout or when its worker was on this host and
+no longer runs. Stale claims are first renamed away, which only one worker
+can do, so a frame is taken over once. A timed-out worker that was only
+slow still finishes its frame; rendering twice is harmless.
+
+Usage:
+    cd simulationCases/dropImpact
+    # on every node (each starts --CPUs workers)
+    python ../../postProcess/VideoAxi.py --queue --CPUs 16
+    # merged timing of all workers
+    python ../../postProcess/frameQueue.py Video/.queue
+
+Dependencies:
+    - Python standard library only
+
+Author: Vatsal Sanjay
+Contact: vatsalsanjay@gmail.com
+Affiliation: Physics of Fluids Group
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+CLAIM_TIMEOUT = 1800.  # seconds after which a claim counts as abandoned
+
+
+def _write_json(path, data):
+    """Writes JSON atomically."""
+    fd, tmp = tempfile.mkstemp(dir=Path(path).parent, prefix='.queue-')
+    with os.fdopen(fd, 'w') as fp:
+        json.dump(data, fp)
+    os.replace(tmp, path)
+
+
+def _read_json(path):
+    """JSON content of a file, or None if it is missing or partial."""
+    try:
+        with open(path) as fp:
+            return json.load(fp)
+    except (OSError, ValueError):
+        return None
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class FrameQueue:
+    """
+    Claims and completion markers of the frames of one movie.
+
+    Args:
+        folder (str): Queue directory, shared by all workers
+        timeout (float): Age in seconds after which a claim is stale
+    """
+
+    def __init__(self, folder, timeout=CLAIM_TIMEOUT):
+        self.folder = Path(folder)
+        self.folder.mkdir(parents=True, exist_ok=True)
+        self.timeout = timeout
+        self.host = socket.gethostname()
+        self.pid = os.getpid()
+
+    def _owner(self):
+        return {'host': self.host, 'pid': self.pid, 'time': time.time()}
+
+    def is_done(self, key):
+        return (self.folder / f"{key}.done").exists()
+
+    def is_stale(self, path):
+        """
+        Args:
+            path (Path): Claim file
+
+        Returns:
+            bool: Whether the claiming worker is gone or timed out
+        """
+        claim = _read_json(path)
+        if claim is None:
+            # partially written (or already removed): judge by the file age
+            try:
+                return time.time() - os.path.getmtime(path) > self.timeout
+            except OSError:
+                return False
+        if time.time() - claim.get('time', 0.) > self.timeout:
+            return True
+        return claim.get('host') == self.host and not _pid_alive(claim.get('pid', 0))
+
+    def claim(self, key):
+        """
+        Tries to take a frame.
+
+        Args:
+            key (str): Frame name
+
+        Returns:
+            bool: True if this worker now owns the frame
+        """
+        if self.is_done(key):
+            return False
+        path = self.folder / f"{key}.claim"
+        for _ in range(2):
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                if not self._take_over(path):
+                    return False
+                continue
+            with os.fdopen(fd, 'w') as fp:
+                json.dump(self._owner(), fp)
+            # a worker may have finished the frame between the checks
+            if self.is_done(key):
+                path.unlink(missing_ok=True)
+                return False
+            return True
+        return False
+
+    def _take_over(self, path):
+        """Moves a stale claim out of the way; True if this worker did."""
+        if not self.is_stale(path):
+            return False
+        aside = path.with_name(f"{path.name}.stale-{self.host}-{self.pid}")
+        try:
+            os.rename(path, aside)
+        except FileNotFoundError:
+            return False
+        # another worker may have replaced the stale claim since it was read
+        if not self.is_stale(aside):
+            try:
+                os.link(aside, path)
+            except FileExistsError:
+                pass
+            os.unlink(aside)
+            return False
+        print(f"Reclaiming {path.stem} from {_read_json(aside)}")
+        os.unlink(aside)
+        return True
+
+    def finish(self, key, record):
+        """
+        Marks a claimed frame as done.
+
+        Args:
+            key (str): Frame name
+            record (dict): Timing entry stored in the marker
+        """
+        _write_json(self.folder / f"{key}.done", dict(self._owner(), **record))
+        (self.folder / f"{key}.claim").unlink(missing_ok=True)
+
+    def report_path(self):
+        return self.folder / f"worker-{self.host}-{self.pid}.json"
+
+
+def run_worker(frames, process, queue, key):
+    """
+    Renders frames until none are left to claim.
+
+    Args:
+        frames (list): Frames in rendering order
+        process (callable): Renders one frame
+        queue (FrameQueue): Shared queue
+        key (callable): Frame name of a frame
+
+    Returns:
+        dict: Timing report of this worker
+    """
+    report = {'host': queue.host, 'pid': queue.pid, 'started': time.time(), 'frames': []}
+    for frame in frames:
+        name = key(frame)
+        if not queue.claim(name):
+            continue
+        start = time.perf_counter()
+        process(frame)
+        seconds = time.perf_counter() - start
+        queue.finish(name, {'frame': name, 'seconds': seconds})
+        report['frames'].append({'frame': name, 'seconds': seconds})
+        report['finished'] = time.time()
+        _write_json(queue.report_path(), report)
+    return report
+
+
+def queue_worker(index, frames, process, folder, key, timeout=CLAIM_TIMEOUT):
+    """
+    Pool entry point: one worker per call, with its own claims.
+
+    Args:
+        index (int): Worker number on this host (unused, for Pool.map)
+        folder (str): Queue directory
+        (other arguments as for run_worker())
+
+    Returns:
+        int: Number of frames rendered by this worker
+    """
+    return len(run_worker(frames, process, FrameQueue(folder, timeout), key)['frames'])
+
+
+def merge_reports(folder):
+    """
+    Combines the timing reports of all workers of a queue.
+
+    Args:
+        folder (str): Queue directory
+
+    Returns:
+        dict: Per-worker and total frame counts and render times
+    """
+    workers = []
+    for path in sorted(Path(folder).glob('worker-*.json')):
+        report = _read_json(path)
+        if not report or not report['frames']:
+            continue
+        seconds = [entry['seconds'] for entry in report['frames']]
+        workers.append({'worker': f"{report['host']}:{report['pid']}",
+                        'frames': len(seconds), 'seconds': sum(seconds),
+                        'started': report['started'], 'finished': report['finished']})
+    frames = sum(worker['frames'] for worker in workers)
+    busy = sum(worker['seconds'] for worker in workers)
+    wall = (max(worker['finished'] for worker in workers) -
+            min(worker['started'] for worker in workers)) if workers else 0.
+    return {'workers': workers, 'frames': frames, 'seconds': busy, 'wall': wall,
+            'done': len(list(Path(folder).glob('*.done')))}
+
+
+def main(argv=None):
+    """
+    Prints the merged timing of the workers of a queue.
+    """
+    parser = argparse.ArgumentParser(description="Merged timing of frame queue workers")
+    parser.add_argument('folder', nargs='?', default='Video/.queue',
+                        help='Queue directory (default: Video/.queue)')
+    parser.add_argument('--json', default=None, metavar='FILE',
+                        help='Also write the merged report to FILE')
+    args = parser.parse_args(argv)
+
+    if not Path(args.folder).is_dir():
+        print(f"No queue in {args.folder}")
+        return 1
+    merged = merge_reports(args.folder)
+    for worker in merged['workers']:
+        print(f"{worker['worker']:>32}: {worker['frames']:5d} frames, "
+              f"{worker['seconds']:9.1f} s, {worker['seconds']/worker['frames']:6.2f} s/frame")
+    print(f"{'total':>32}: {merged['frames']:5d} frames, {merged['seconds']:9.1f} s busy, "
+          f"{merged['wall']:.1f} s wall, {merged['done']} frames done")
+    if args.json:
+        _write_json(args.json, merged)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Interface Diagnostics Time Series
+
+Streams over all snapshots of a run, reconstructs the PLIC facets of each
+one (plicFacets.py, in parallel over snapshots) and reduces them and the
+volume fraction to a few numbers per frame, written as one table per run:
+
+    t        simulation time
+    n        number of facets
+    rmax     spreading radius: largest radial coordinate of the interface
+    xmax     apex height: largest axial coordinate of the interface
+    rneck    neck radius: smallest radial coordinate of a facet midpoint
+             (the `ymin` of pinchOff.c, from position() of the interface)
+    xneck    axial position of that facet
+    length   interface length in the (x, r) plane
+    volume   volume of the f = 1 phase, sum over the leaf cells of
+             2 pi r f Delta^2 (exact for the volume fraction field, as
+             r is the centroid radius of the cell)
+
+With --planar the last column is the area of the f = 1 phase instead
+(sum of f Delta^2). The PLIC facets of neighbouring cells do not join,
+so an integral over them is not taken.
+
+Axisymmetric cases use x as the axis and y as the radius. Snapshots
+compacted by compactSnapshots.py are read directly, as long as they keep
+`f`.
+
+Usage:
+    cd simulationCases/dropImpact
+    python ../../postProcess/interfaceMetrics.py [--CPUs 8] [--output interfaceMetrics.dat]
+
+Dependencies:
+    - numpy
+    - basiliskDump.py, plicFacets.py (same directory)
+
+Author: Vatsal Sanjay
+Contact: vatsalsanjay@gmail.com
+Affiliation: Physics of Fluids Group
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+
+from basiliskDump import BasiliskDump
+from plicFacets import facets
+
+SNAPSHOT_GLOB = 'snapshot-*'
+COLUMNS = ['t', 'n', 'rmax', 'xmax', 'rneck', 'xneck', 'length', 'volume']
+
+
+def list_snapshots(snapDir='intermediate'):
+    """
+    Snapshot files of a run, compacted ones included.
+
+    Args:
+        snapDir (str): Snapshot directory
+
+    Returns:
+        list: Paths, ignoring partial writes and temporary files
+    """
+    return sorted(path for path in Path(snapDir).glob(SNAPSHOT_GLOB)
+                  if path.is_file() and not path.name.endswith('~'))
+
+
+def phase_volume(dump, name='f', planar=False):
+    """
+    Volume (area with planar) of the phase a volume fraction marks.
+
+    Args:
+        dump (BasiliskDump): Snapshot
+        name (str): Volume fraction field
+        planar (bool): Area instead of axisymmetric volume
+
+    Returns:
+        float: Sum over the leaf cells of f Delta^2, weighted by 2 pi r
+        unless planar
+    """
+    leaf = dump.leaf
+    cells = dump[name][leaf]*dump.Delta[leaf]**2
+    if planar:
+        return float(np.sum(cells))
+    return float(2.*np.pi*np.sum(cells*dump.y[leaf]))
+
+
+def interface_metrics(segments):
+    """
+    Reduces facets to the interface diagnostics of one frame.
+
+    Args:
+        segments (numpy.ndarray): (N, 2, 2) facets in (x, r)
+
+    Returns:
+        list: Values of COLUMNS[1:-1] (NaN for empty interfaces)
+    """
+    if not len(segments):
+        return [0] + [np.nan]*(len(COLUMNS) - 3)
+    x, r = segments[:, :, 0], segments[:, :, 1]
+    dx = x[:, 1] - x[:, 0]
+    mid = r.mean(axis=1)
+    neck = np.argmin(mid)
+    length = np.hypot(dx, r[:, 1] - r[:, 0]).sum()
+    return [len(segments), r.max(), x.max(), mid[neck], x[neck].mean(), length]
+
+
+def snapshot_metrics(path, planar=False):
+    """
+    Diagnostics of one snapshot.
+
+    Returns:
+        list or None: Row of COLUMNS, or None if the snapshot is unreadable
+    """
+    try:
+        dump = BasiliskDump(path)
+        return ([dump.t] + interface_metrics(facets(dump)) +
+                [phase_volume(dump, planar=planar)])
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Skipping {path}: {e}")
+        return None
+
+
+def write_table(rows, output):
+    """
+    Writes the rows sorted by time, atomically.
+
+    Args:
+        rows (list): Rows of COLUMNS
+        output (Path): Table file
+    """
+    rows = sorted(rows, key=lambda row: row[0])
+    fd, tmp = tempfile.mkstemp(dir=Path(output).parent, prefix='.metrics-')
+    with os.fdopen(fd, 'w') as fp:
+        fp.write(' '.join(COLUMNS) + '\n')
+        for row in rows:
+            fp.write(f"{row[0]:.8g} {int(row[1])} " +
+                     ' '.join(f"{value:.8g}" for value in row[2:]) + '\n')
+    os.replace(tmp, output)
+
+
+def main(argv=None):
+    """
+    Computes the interface diagnostics of every snapshot of a run.
+    """
+    parser = argparse.ArgumentParser(description="Interface diagnostics of all snapshots of a run")
+    parser.add_argument('--CPUs', type=int, default=mp.cpu_count(),
+                        help='Number of CPUs to use (default: all available)')
+    parser.add_argument('--snapDir', default='intermediate',
+                        help='Snapshot directory (default: intermediate)')
+    parser.add_argument('--output', default='interfaceMetrics.dat',
+                        help='Table to write (default: interfaceMetrics.dat)')
+    parser.add_argument('--planar', action='store_true',
+                        help='Planar 2D run: report the enclosed area instead of the volume')
+    args = parser.parse_args(argv)
+
+    snapshots = list_snapshots(args.snapDir)
+    if not snapshots:
+        print(f"No snapshots in {args.snapDir}")
+        return 1
+    print(f"Processing {len(snapshots)} snapshots with {args.CPUs} CPUs...")
+
+    rows = []
+    work = partial(snapshot_metrics, planar=args.planar)
+    with mp.Pool(processes=args.CPUs) as pool:
+        for row in pool.imap_unordered(work, snapshots, chunksize=4):
+            if row is not None:
+                rows.append(row)
+    write_table(rows, args.output)
+    print(f"Wrote {len(rows)} frames to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Vectorized PLIC Facet Reconstruction
+
+NumPy version of Basilisk's `output_facets()` for 2D volume fractions:
+for every interfacial leaf cell (1e-6 < f < 1 - 1e-6) at once, it
+
+1. gathers the 3x3 stencil of f on the level of the cell (finer
+   neighbours give their stored, restricted value; coarser ones are
+   prolongated bilinearly as in `refine_bilinear()`; the domain boundary
+   is symmetric, the default of the post-processing helpers),
+2. estimates the normal with the Mixed-Youngs-Centered scheme
+   (`mycs()` in myc2d.h),
+3. places the line with `line_alpha()` and intersects it with the cell
+   as `facets()` in geometry.h.
+
+The result is the (N, 2, 2) segment array `LineCollection` expects,
+matching `getFacet2D` up to the `%g` rounding of its output.
+
+Usage:
+    from basiliskDump import BasiliskDump
+    from plicFacets import facets, axi_segments
+    segs = axi_segments(facets(BasiliskDump('intermediate/snapshot-0.1000')))
+
+    # benchmark against the compiled helper (prints timings and max error)
+    python plicFacets.py intermediate/snapshot-0.1000 --compare ./getFacet2D
+
+Dependencies:
+    - numpy
+    - basiliskDump.py (same directory)
+
+Author: Vatsal Sanjay
+Contact: vatsalsanjay@gmail.com
+Affiliation: Physics of Fluids Group
+"""
+
+import argparse
+import subprocess as sp
+import sys
+import time
+
+import numpy as np
+
+from basiliskDump import BasiliskDump
+
+F_EPS = 1e-6       # interfacial cells: F_EPS < f < 1 - F_EPS
+NOT_ZERO = 1e-30   # as in myc2d.h
+FACET_EPS = 1e-4   # normal components below this do not cut a cell side
+
+
+def _mirror(index, level):
+    """
+    Maps integer positions outside the domain onto their symmetric image.
+    """
+    size = np.left_shift(1, level.astype(np.int64))
+    index = np.where(index < 0, -index - 1, index)
+    return np.where(index >= size, 2*size - index - 1, index)
+
+
+def values_at(dump, values, level, index):
+    """
+    Field values on given levels and positions, as a Basilisk stencil sees
+    them.
+
+    Cells present in the dump give their stored value (leaf value or
+    restriction). Missing cells are prolongated from their parent level
+    with `refine_bilinear()`, recursively.
+
+    Args:
+        dump (BasiliskDump): Snapshot
+        values (numpy.ndarray): Field value of every cell of the dump
+        level (numpy.ndarray): Levels
+        index (numpy.ndarray): (2, n) positions, possibly outside the domain
+
+    Returns:
+        numpy.ndarray: Values
+    """
+    index = _mirror(index, level)
+    cell = dump.find(level, index)
+    out = np.empty(len(level))
+    found = cell >= 0
+    out[found] = values[cell[found]]
+    missing = np.flatnonzero(~found & (level > 0))
+    out[~found & (level == 0)] = 0.
+    if missing.size:
+        lm, im = level[missing] - 1, index[:, missing]
+        parent = im >> 1
+        child = 2*(im & 1) - 1  # +-1: side of the parent the child lies on
+        coarse = lambda dx, dy: values_at(
+            dump, values, lm, parent + np.array([dx, dy])[:, None]*child)
+        out[missing] = (9.*coarse(0, 0) + 3.*(coarse(1, 0) + coarse(0, 1)) +
+                        coarse(1, 1))/16.
+    return out
+
+
+def stencils(dump, values, cells):
+    """
+    The 3x3 neighbourhoods of some cells.
+
+    Args:
+        dump (BasiliskDump): Snapshot
+        values (numpy.ndarray): Field value of every cell
+        cells (numpy.ndarray): Cell indices
+
+    Returns:
+        numpy.ndarray: (n, 3, 3) values, indexed [i + 1, j + 1] for the
+        neighbour at offset (i, j)
+    """
+    level = dump.level[cells].astype(np.int64)
+    index = dump.index[:, cells]
+    out = np.empty((len(cells), 3, 3))
+    for i in (-1, 0, 1):
+        for j in (-1, 0, 1):
+            if i == 0 and j == 0:
+                out[:, 1, 1] = values[cells]
+                continue
+            out[:, i + 1, j + 1] = values_at(dump, values, level,
+                                             index + np.array([[i], [j]]))
+    return out
+
+
+def mycs(c):
+    """
+    Mixed-Youngs-Centered normals of many cells (myc2d.h).
+
+    Args:
+        c (numpy.ndarray): (n, 3, 3) stencils
+
+    Returns:
+        numpy.ndarray: (n, 2) normals with |nx| + |ny| = 1, pointing away
+        from the f = 1 phase
+    """
+    c_t = c[:, 0, 2] + c[:, 1, 2] + c[:, 2, 2]
+    c_b = c[:, 0, 0] + c[:, 1, 0] + c[:, 2, 0]
+    c_r = c[:, 2, 0] + c[:, 2, 1] + c[:, 2, 2]
+    c_l = c[:, 0, 0] + c[:, 0, 1] + c[:, 0, 2]
+
+    # central scheme in the direction of largest variation
+    mx0, my0 = 0.5*(c_l - c_r), 0.5*(c_b - c_t)
+    ix = np.abs(mx0) <= np.abs(my0)
+    my0 = np.where(ix, np.where(my0 > 0., 1., -1.), my0)
+    mx0 = np.where(ix, mx0, np.where(mx0 > 0., 1., -1.))
+
+    # Youngs' scheme
+    mx1 = (c[:, 0, 0] + 2.*c[:, 0, 1] + c[:, 0, 2]) - \
+        (c[:, 2, 0] + 2.*c[:, 2, 1] + c[:, 2, 2]) + NOT_ZERO
+    my1 = (c[:, 0, 0] + 2.*c[:, 1, 0] + c[:, 2, 0]) - \
+        (c[:, 0, 2] + 2.*c[:, 1, 2] + c[:, 2, 2]) + NOT_ZERO
+
+    # keep the central normal unless Youngs' is steeper across it
+    youngs = np.where(ix, np.abs(mx1)/np.abs(my1) > np.abs(mx0),
+                      np.abs(my1)/np.abs(mx1) > np.abs(my0))
+    mx, my = np.where(youngs, mx1, mx0), np.where(youngs, my1, my0)
+    norm = np.abs(mx) + np.abs(my)
+    return np.stack([mx/norm, my/norm], axis=1)
+
+
+def line_alpha(c, n):
+    """
+    Line constant alpha of n.x x + n.y y = alpha cutting fraction c of the
+    centred unit cell (geometry.h).
+
+    Args:
+        c (numpy.ndarray): Volume fractions
+        n (numpy.ndarray): (n, 2) normals
+
+    Returns:
+        numpy.ndarray: alpha
+    """
+    n1 = np.minimum(np.abs(n[:, 0]), np.abs(n[:, 1]))
+    n2 = np.maximum(np.abs(n[:, 0]), np.abs(n[:, 1]))
+    c = np.clip(c, 0., 1.)
+    v1 = n1/2.
+    with np.errstate(divide='ignore', invalid='ignore'):
+        alpha = np.where(
+            c <= v1/n2, np.sqrt(2.*c*n1*n2),
+            np.where(c <= 1. - v1/n2, c*n2 + v1,
+                     n1 + n2 - np.sqrt(np.maximum(2.*n1*n2*(1. - c), 0.))))
+    alpha += np.minimum(n[:, 0], 0.) + np.minimum(n[:, 1], 0.)
+    return alpha - (n[:, 0] + n[:, 1])/2.
+
+
+def cell_segments(n, alpha):
+    """
+    Intersections of the lines with the centred unit cell, in the order of
+    `facets()` (geometry.h): sides x = -1/2, y = -1/2, x = 1/2, y = 1/2.
+
+    Args:
+        n (numpy.ndarray): (n, 2) normals
+        alpha (numpy.ndarray): Line constants
+
+    Returns:
+        tuple: (segments, ok) with (n, 2, 2) endpoints in cell units and a
+        mask of the cells where the line crosses two sides
+    """
+    candidates, valid = [], []
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for s in (-0.5, 0.5):
+            for axis in (0, 1):
+                other = 1 - axis
+                a = (alpha - s*n[:, axis])/n[:, other]
+                point = np.empty((len(alpha), 2))
+                point[:, axis], point[:, other] = s, a
+                candidates.append(point)
+                valid.append((np.abs(n[:, other]) > FACET_EPS) &
+                             (a >= -0.5) & (a <= 0.5))
+    candidates, valid = np.stack(candidates, axis=1), np.stack(valid, axis=1)
+    rank = np.cumsum(valid, axis=1)
+    first = np.argmax(valid & (rank == 1), axis=1)
+    second = np.argmax(valid & (rank == 2), axis=1)
+    rows = np.arange(len(alpha))
+    segments = np.stack([candidates[rows, first], candidates[rows, second]], axis=1)
+    return segments, rank[:, -1] >= 2
+
+
+def facets(dump, name='f', oriented=False):
+    """
+    PLIC facets of a volume fraction field, like `output_facets()`.
+
+    Args:
+        dump (BasiliskDump): 2D snapshot
+        name (str): Volume fraction field
+        oriented (bool): Order the end points so that the f = 1 phase lies
+            to the left of every segment (counter-clockwise around it),
+            instead of the order of `output_facets()`
+
+    Returns:
+        numpy.ndarray: (N, 2, 2) segments, [k, point, (x, y)]
+    """
+    if dump.dimension != 2:
+        raise ValueError("facets() supports 2D snapshots only")
+    values = np.asarray(dump[name], dtype=float)
+    cells = np.flatnonzero(dump.leaf & (values > F_EPS) & (values < 1. - F_EPS))
+    n = mycs(stencils(dump, values, cells))
+    alpha = line_alpha(values[cells], n)
+    segments, ok = cell_segments(n, alpha)
+    if oriented:
+        # n points out of the f = 1 phase: keep it on the right of p0 -> p1
+        d = segments[:, 1] - segments[:, 0]
+        flip = d[:, 1]*n[:, 0] - d[:, 0]*n[:, 1] < 0.
+        segments[flip] = segments[flip, ::-1]
+    centers = np.stack([dump.x[cells], dump.y[cells]], axis=1)
+    return (centers[:, None, :] + segments*dump.Delta[cells, None, None])[ok]
+
+
+def axi_segments(segments):
+    """
+    Converts (x, y) facets of an axisymmetric run to the (r, z) segments
+    drawn by `VideoAxi.py`, each followed by its mirror image across r = 0.
+
+    Args:
+        segments (numpy.ndarray): (N, 2, 2) facets from facets()
+
+    Returns:
+        numpy.ndarray: (2N, 2, 2) segments
+    """
+    rz = segments[:, :, ::-1]
+    mirrored = rz*np.array([-1., 1.])
+    return np.stack([rz, mirrored], axis=1).reshape(-1, 2, 2)
+
+
+def read_helper_facets(helper, snapshot):
+    """
+    Runs the compiled helper and parses its `output_facets()` output.
+
+    Returns:
+        numpy.ndarray: (N, 2, 2) segments
+    """
+    result = sp.run([helper, snapshot], capture_output=True, text=True)
+    blocks = [block.split() for block in result.stderr.split('\n\n') if block.strip()]
+    return np.array([[float(v) for v in block[:4]] for block in blocks
+                     if len(block) >= 4]).reshape(-1, 2, 2)
+
+
+def compare(ours, theirs):
+    """
+    Matches segments by midpoint and returns the largest endpoint distance.
+
+    Returns:
+        tuple: (max_error, unmatched)
+    """
+    if len(ours) == 0 or len(theirs) == 0:
+        return (0. if len(ours) == len(theirs) else np.inf), abs(len(ours) - len(theirs))
+    mid_o, mid_t = ours.mean(axis=1), theirs.mean(axis=1)
+    key = lambda m: np.lexsort((np.round(m[:, 1], 5), np.round(m[:, 0], 5)))
+    o, t = ours[key(mid_o)], theirs[key(mid_t)]
+    if len(o) != len(t):
+        return np.inf, abs(len(o) - len(t))
+    error = np.minimum(np.abs(o - t).max(axis=(1, 2)),
+                       np.abs(o - t[:, ::-1]).max(axis=(1, 2)))
+    return float(error.max()), 0
+
+
+def main(argv=None):
+    """
+    Reconstructs the facets of a snapshot, optionally benchmarking against
+    the compiled `getFacet2D`.
+    """
+    parser = argparse.ArgumentParser(description="Vectorized PLIC facets of a snapshot")
+    parser.add_argument('snapshot', help='2D dump file')
+    parser.add_argument('--compare', default=None, metavar='HELPER',
+                        help='Compiled helper to compare with, e.g. ./getFacet2D')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    dump = BasiliskDump(args.snapshot)
+    loaded = time.perf_counter()
+    segments = facets(dump)
+    done = time.perf_counter()
+    print(f"{len(segments)} facets: read {1e3*(loaded - start):.1f} ms, "
+          f"facets {1e3*(done - loaded):.1f} ms")
+    if args.compare:
+        start = time.perf_counter()
+        reference = read_helper_facets(args.compare, args.snapshot)
+        elapsed = time.perf_counter() - start
+        error, unmatched = compare(segments, reference)
+        print(f"{args.compare}: {len(reference)} facets in {1e3*elapsed:.1f} ms; "
+              f"max endpoint difference {error:.2e}, unmatched {unmatched}")
+        return 0 if unmatched == 0 and error < 1e-4*dump.origin[3] else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Direct NumPy Rasterizer for VideoAxi Frames
+
+Renders the frames of `VideoAxi.py` without compositing them through
+matplotlib. The figure is laid out by matplotlib once per process; the
+static parts (box, symmetry axis, colorbars and their labels) are kept as
+an RGBA overlay and the title is assembled from pre-rendered glyphs. Each
+frame then only costs:
+
+- the two field layers, normalized and bilinearly upsampled with
+  separable NumPy interpolation (the left half samples the mirrored
+  radius) and mapped through 256-entry colormap LUTs into a uint8 RGB
+  buffer,
+- the interface facets, drawn by a vectorized anti-aliased rasterizer of
+  thick, butt-capped segments,
+- one PNG encoding at a fast compression level.
+
+The output has the size and layout of `savefig(..., bbox_inches='tight',
+dpi=300)` of the matplotlib frame and matches it up to anti-aliasing
+details.
+
+Usage:
+    python VideoAxi.py --renderer numpy
+
+    # render a synthetic frame both ways, report timings and differences
+    python rasterAxi.py --benchmark
+
+Dependencies:
+    - numpy
+    - matplotlib (layout, overlays and colormaps, built once)
+    - Pillow (PNG encoding, installed with matplotlib)
+
+Author: Vatsal Sanjay
+Contact: vatsalsanjay@gmail.com
+Affiliation: Physics of Fluids Group
+"""
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import matplotlib
+import matplotlib.colors as mcolors
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from PIL import Image
+
+LUT_SIZE = 256
+PNG_COMPRESS_LEVEL = 1   # zlib level; matplotlib's PNGs use 6
+TITLE_GLYPHS = '0123456789.-'
+# bound for normalized values so that +-inf (log10 of 0) interpolate finitely
+NORM_LIMIT = 1e6
+
+
+def colormap_lut(cmap, n=LUT_SIZE):
+    """
+    Samples a colormap into a uint8 lookup table.
+
+    Args:
+        cmap (str or Colormap): Colormap
+        n (int): Entries
+
+    Returns:
+        numpy.ndarray: (n + 1, 3) uint8 colors, the last one white for
+        missing data
+    """
+    cmap = matplotlib.colormaps[cmap] if isinstance(cmap, str) else cmap
+    rgba = cmap(np.linspace(0., 1., n))
+    return np.vstack([np.round(rgba[:, :3]*255.), [255., 255., 255.]]).astype(np.uint8)
+
+
+def bilinear_weights(coord, size):
+    """
+    Lower sample index and weight of the upper one for fractional sample
+    coordinates, clamped at the edges.
+    """
+    coord = np.clip(coord, 0., size - 1.)
+    lower = np.minimum(np.floor(coord).astype(np.int64), max(size - 2, 0))
+    upper = np.minimum(lower + 1, size - 1)
+    return lower, upper, coord - lower
+
+
+def text_mask(text, prop, dpi):
+    """
+    Renders black text into an alpha mask.
+
+    Args:
+        text (str): Text (math and TeX as rcParams dictate)
+        prop (FontProperties): Font
+        dpi (float): Resolution
+
+    Returns:
+        tuple: (mask, anchor_x, anchor_row, width) with the float32 alpha
+        mask cropped to the ink, the position of the left end of the
+        baseline in it and the layout width in pixels
+    """
+    size = prop.get_size_in_points()/72.
+    fig = Figure(figsize=(size*(len(text) + 4), 4*size), dpi=dpi)
+    fig.patch.set_alpha(0.)
+    label = fig.text(0.05, 0.5, text, fontproperties=prop, ha='left', va='baseline')
+    canvas = FigureCanvasAgg(fig)
+    canvas.draw()
+    alpha = np.asarray(canvas.buffer_rgba())[..., 3].astype(np.float32)/255.
+    width = label.get_window_extent(canvas.get_renderer()).width
+    height = alpha.shape[0]
+    anchor_x, anchor_row = 0.05*alpha.shape[1], height - 0.5*height
+    rows, cols = np.flatnonzero(alpha.any(axis=1)), np.flatnonzero(alpha.any(axis=0))
+    if not rows.size:
+        return np.zeros((0, 0), np.float32), 0., 0., width
+    mask = alpha[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1]
+    return mask, anchor_x - cols[0], anchor_row - rows[0], width
+
+
+def blend(canvas, alpha, color, row, col):
+    """
+    Blends a solid color through an alpha mask into the uint8 canvas, in place,
+    with the mask's top left corner at (row, col); parts outside are cut.
+    """
+    h, w = alpha.shape
+    r0, c0 = max(row, 0), max(col, 0)
+    r1, c1 = min(row + h, canvas.shape[0]), min(col + w, canvas.shape[1])
+    if r0 >= r1 or c0 >= c1:
+        return
+    a = alpha[r0 - row:r1 - row, c0 - col:c1 - col, None]
+    region = canvas[r0:r1, c0:c1]
+    region[...] = region*(1. - a) + np.asarray(color, dtype=np.float32)*255.*a + 0.5
+
+
+def segment_coverage(p0, p1, half_width, clip):
+    """
+    Anti-aliased coverage of thick, butt-capped segments.
+
+    Every segment enumerates the pixels of its (widened) bounding box; the
+    ragged enumeration is flattened with repeat/cumsum so all segments are
+    handled in one pass. Coverage is the product of the perpendicular and
+    lengthwise box-filter overlaps, combined across segments with max.
+
+    Args:
+        p0, p1 (numpy.ndarray): (N, 2) end points in pixels (col, row)
+        half_width (float): Half the line width in pixels
+        clip (tuple): (row0, col0, row1, col1) drawable box
+
+    Returns:
+        tuple: (alpha, row, col) mask and position of its top left corner,
+        or None when nothing is drawn
+    """
+    d = p1 - p0
+    length = np.hypot(d[:, 0], d[:, 1])
+    keep = length > 0.
+    p0, d, length = p0[keep], d[keep], length[keep]
+    if not len(length):
+        return None
+    unit = d/length[:, None]
+    pad = half_width + 1.
+    lo = np.floor(np.minimum(p0, p0 + d) - pad).astype(np.int64)
+    hi = np.ceil(np.maximum(p0, p0 + d) + pad).astype(np.int64)
+    lo = np.maximum(lo, [clip[1], clip[0]])
+    hi = np.minimum(hi, [clip[3], clip[2]])
+    size = np.maximum(hi - lo, 0)
+    counts = size[:, 0]*size[:, 1]
+    if not counts.sum():
+        return None
+    seg = np.repeat(np.arange(len(counts)), counts)
+    k = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    width = size[seg, 0]
+    col, row = lo[seg, 0] + k % width, lo[seg, 1] + k//width
+    rel = np.stack([col + 0.5, row + 0.5], axis=1) - p0[seg]
+    along = rel[:, 0]*unit[seg, 0] + rel[:, 1]*unit[seg, 1]
+    across = np.abs(rel[:, 0]*unit[seg, 1] - rel[:, 1]*unit[seg, 0])
+    coverage = np.clip(half_width + 0.5 - across, 0., 1.) * \
+        np.clip(np.minimum(along, length[seg] - along) + 0.5, 0., 1.)
+    drawn = coverage > 0.
+    col, row, coverage = col[drawn], row[drawn], coverage[drawn]
+    if not coverage.size:
+        return None
+    r0, c0 = row.min(), col.min()
+    alpha = np.zeros((row.max() - r0 + 1, col.max() - c0 + 1), dtype=np.float32)
+    np.maximum.at(alpha, (row - r0, col - c0), coverage.astype(np.float32))
+    return alpha, int(r0), int(c0)
+
+
+class FrameRenderer:
+    """
+    Renders frames laid out like a given matplotlib figure.
+
+    Args:
+        fig (Figure): Frame figure without field images and facets but with
+            its colorbars, box lines and a representative title
+        ax (Axes): Axes the fields and facets go into
+        left, right (tuple): (cmap, vmin, vmax) of the mirrored left field
+            and of the right field
+        title_prefix (str): Title text before the time
+        title_format (str): Format of the time in the title
+        dpi (float): Output resolution
+        pad_inches (float): Padding of the tight bounding box
+    """
+
+    def __init__(self, fig, ax, left, right, title_prefix, title_format='{:4.3f}',
+                 dpi=300, pad_inches=0.1):
+        self.dpi = dpi
+        self.layers = []
+        for cmap, vmin, vmax in (left, right):
+            self.layers.append((colormap_lut(cmap), float(vmin), float(vmax)))
+        self.title_format = title_format
+
+        fig.set_dpi(dpi)
+        canvas = FigureCanvasAgg(fig)
+        canvas.draw()
+        renderer = canvas.get_renderer()
+        box = fig.get_tightbbox(renderer).padded(pad_inches)
+        self.shape = (int(box.height*dpi), int(box.width*dpi))
+
+        # display -> pixel (col, row) of the cropped frame; savefig shifts the
+        # figure by the (fractional) corner of the tight box
+        shift = np.array([box.x0*dpi, box.y0*dpi])
+        to_frame = lambda xy: (xy[0] - shift[0], self.shape[0] - (xy[1] - shift[1]))
+
+        (x0, y0), (x1, y1) = ax.transData.transform([[0., 0.], [1., 1.]])
+        self.scale = np.array([x1 - x0, y0 - y1])
+        self.offset = np.array(to_frame((x0, y0)))
+        bbox = ax.get_window_extent(renderer)
+        left, top = to_frame((bbox.x0, bbox.y1))
+        right, bottom = to_frame((bbox.x1, bbox.y0))
+        self.clip = (int(round(top)), int(round(left)), int(round(bottom)), int(round(right)))
+
+        title = ax.title
+        prop = title.get_fontproperties()
+        self.title_anchor = to_frame(title.get_transform().transform(title.get_position()))
+        self.glyphs = {c: text_mask(c, prop, dpi) for c in TITLE_GLYPHS}
+        self.advance = {c: text_mask(c + c, prop, dpi)[3] - self.glyphs[c][3]
+                        for c in TITLE_GLYPHS}
+        self.prefix = text_mask(title_prefix, prop, dpi)
+        self.space = text_mask(title_prefix + ' 0', prop, dpi)[3] - \
+            self.prefix[3] - self.advance['0']
+
+        # everything static, saved once exactly as savefig crops it, with a
+        # clear background and an invisible title (which still sizes the box)
+        title.set_alpha(0.)
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='rgba', dpi=dpi, bbox_inches='tight',
+                    pad_inches=pad_inches, transparent=True)
+        title.set_alpha(None)
+        rgba = np.frombuffer(buffer.getbuffer(), dtype=np.uint8).reshape(-1, 4)
+        if len(rgba) != self.shape[0]*self.shape[1]:
+            raise ValueError("frame layout changed while rendering the overlay")
+        self.overlay_index = np.flatnonzero(rgba[:, 3])  # a few percent of the frame
+        alpha = rgba[self.overlay_index, 3:].astype(np.float32)/255.
+        self.overlay_keep = 1. - alpha
+        self.overlay_color = rgba[self.overlay_index, :3]*alpha + 0.5
+
+    def to_pixels(self, points):
+        """
+        Converts data coordinates (..., 2) to pixel coordinates (col, row).
+        """
+        return np.asarray(points, dtype=float)*self.scale + self.offset
+
+    def _field(self, canvas, values, layer, extent, mirrored):
+        """
+        Draws one field layer into its half of the axes.
+        """
+        lut, vmin, vmax = self.layers[layer]
+        nz, nr = values.shape
+        rminp, rmaxp, zminp, zmaxp = extent
+        row0, col0, row1, col1 = self.clip
+        cols = np.arange(col0, col1)
+        r = (cols + 0.5 - self.offset[0])/self.scale[0]
+        r = -r if mirrored else r
+        inside = (r >= rminp) & (r <= rmaxp)
+        cols, r = cols[inside], r[inside]
+        rows = np.arange(row0, row1)
+        z = (rows + 0.5 - self.offset[1])/self.scale[1]
+        inside = (z >= zminp) & (z <= zmaxp)
+        rows, z = rows[inside], z[inside]
+        if not cols.size or not rows.size:
+            return
+
+        norm = np.clip((np.asarray(values, dtype=np.float32) - vmin)/(vmax - vmin),
+                       -NORM_LIMIT, NORM_LIMIT)
+        c_lo, c_hi, wc = bilinear_weights((r - rminp)/(rmaxp - rminp)*nr - 0.5, nr)
+        r_lo, r_hi, wr = bilinear_weights((z - zminp)/(zmaxp - zminp)*nz - 0.5, nz)
+        wc, wr = wc.astype(np.float32), wr.astype(np.float32)[:, None]
+        along_r = norm[:, c_lo]*(1. - wc) + norm[:, c_hi]*wc
+        image = along_r[r_lo]*(1. - wr) + along_r[r_hi]*wr
+
+        image *= LUT_SIZE
+        np.clip(image, 0, LUT_SIZE - 1, out=image)
+        image[np.isnan(image)] = LUT_SIZE   # background, as masked data in imshow
+        canvas[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1] = lut[image.astype(np.intp)]
+
+    def _title(self, canvas, t):
+        """
+        Writes the title from the pre-rendered glyphs.
+        """
+        number = self.title_format.format(t)
+        if any(c not in self.glyphs for c in number):
+            return
+        total = self.prefix[3] + self.space + sum(self.advance[c] for c in number)
+        x, baseline = self.title_anchor[0] - total/2., self.title_anchor[1]
+        pieces = [(self.prefix, x)]
+        x += self.prefix[3] + self.space
+        for c in number:
+            pieces.append((self.glyphs[c], x))
+            x += self.advance[c]
+        for (mask, anchor_x, anchor_row, _), pen in pieces:
+            blend(canvas, mask, (0., 0., 0.), int(round(baseline - anchor_row)),
+                  int(round(pen - anchor_x)))
+
+    def render(self, t, left, right, extent, lines=(), inset=None):
+        """
+        Renders one frame.
+
+        Args:
+            t (float): Time shown in the title
+            left (numpy.ndarray): (nz, nr) field drawn mirrored at r < 0
+            right (numpy.ndarray): (nz, nr) field drawn at r > 0
+            extent (tuple): (rminp, rmaxp, zminp, zmaxp) of the samples
+            lines (list): (segments, color, width in points) drawn in order,
+                segments being (N, 2, 2) in data coordinates
+            inset (tuple): (left, right, extent) of a finer sampling of a
+                part of the window, drawn over the fields
+
+        Returns:
+            numpy.ndarray: (height, width, 3) uint8 image
+        """
+        canvas = np.full(self.shape + (3,), 255, dtype=np.uint8)
+        self._field(canvas, left, 0, extent, True)
+        self._field(canvas, right, 1, extent, False)
+        if inset is not None:
+            self._field(canvas, inset[0], 0, inset[2], True)
+            self._field(canvas, inset[1], 1, inset[2], False)
+
+        pixels = canvas.reshape(-1, 3)
+        pixels[self.overlay_index] = pixels[self.overlay_index]*self.overlay_keep + \
+            self.overlay_color
+        for segments, color, width in lines:
+            segments = np.asarray(segments, dtype=float).reshape(-1, 2, 2)
+            if not len(segments):
+                continue
+            pixels = self.to_pixels(segments)
+            drawn = segment_coverage(pixels[:, 0], pixels[:, 1],
+                                     0.5*width*self.dpi/72., self.clip)
+            if drawn is not None:
+                alpha, row, col = drawn
+                blend(canvas, alpha, mcolors.to_rgb(color), row, col)
+        self._title(canvas, t)
+        return canvas
+
+    def save(self, name, image):
+        """
+        Writes a rendered frame as PNG.
+        """
+        Image.fromarray(image).save(name, dpi=(self.dpi, self.dpi),
+                                    compress_level=PNG_COMPRESS_LEVEL)
+
+
+def synthetic_frame(rmax, zmin, zmax, nr):
+    """
+    Smooth test fields and a circular interface on the VideoAxi grid.
+
+    Returns:
+        tuple: (taus, taup, extent, segments)
+    """
+    nz = int(nr*(zmax - zmin)/rmax)
+    r = (np.arange(nr) + 0.5)*rmax/nr
+    z = zmin + (np.arange(nz) + 0.5)*(zmax - zmin)/nz
+    R, Z = np.meshgrid(r, z)
+    taus = 2. - 5.*np.exp(-((R - 0.5)**2 + Z**2))
+    taup = np.log10(np.exp(-(R**2 + (Z - 1.)**2)) + 1e-4)
+    theta = np.linspace(0., np.pi, 400)
+    circle = np.stack([np.sin(theta), np.cos(theta) - 0.5], axis=1)
+    segments = np.stack([circle[:-1], circle[1:]], axis=1)
+    segments = np.concatenate([segments, segments*[-1., 1.]])
+    return taus, taup, (r.min(), r.max(), z.min(), z.max()), segments
+
+
+def main(argv=None):
+    """
+    Benchmarks the NumPy renderer against the matplotlib frame.
+    """
+    parser = argparse.ArgumentParser(description="NumPy rasterizer for VideoAxi frames")
+    parser.add_argument('--benchmark', action='store_true',
+                        help='Render a synthetic frame with both renderers and compare')
+    parser.add_argument('--frames', type=int, default=5,
+                        help='Frames per renderer in the benchmark (default: 5)')
+    args = parser.parse_args(argv)
+    if not args.benchmark:
+        parser.print_help()
+        return 0
+
+    import matplotlib.pyplot as plt
+    import VideoAxi
+
+    rmin, rmax, zmin, zmax = -2., 2., -4., 4.
+    lw = VideoAxi.DEFAULT_CONFIG['line_width']
+    nr = int(VideoAxi.DEFAULT_CONFIG['grids_per_r']*rmax)
+    taus, taup, extent, segments = synthetic_frame(rmax, zmin, zmax, nr)
+    lines = [(segments, 'blue', VideoAxi.DEFAULT_CONFIG['interface_line_width'])]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        reference = os.path.join(tmp, 'matplotlib.png')
+        start = time.perf_counter()
+        for _ in range(args.frames):
+            fig, ax = VideoAxi.frame_figure(0.5, rmin, rmax, zmin, zmax, lw,
+                                            fields=(taus, taup, extent), segs1=segments)
+            fig.savefig(reference, bbox_inches='tight', dpi=300)
+            plt.close(fig)
+        slow = (time.perf_counter() - start)/args.frames
+
+        start = time.perf_counter()
+        renderer = VideoAxi.frame_renderer(rmin, rmax, zmin, zmax, lw)
+        setup = time.perf_counter() - start
+        ours = os.path.join(tmp, 'numpy.png')
+        start = time.perf_counter()
+        for _ in range(args.frames):
+            renderer.save(ours, renderer.render(0.5, taus, taup, extent, lines))
+        fast = (time.perf_counter() - start)/args.frames
+
+        a = np.asarray(Image.open(reference).convert('RGB'), dtype=np.int16)
+        b = np.asarray(Image.open(ours).convert('RGB'), dtype=np.int16)
+    h, w = min(a.shape[0], b.shape[0]), min(a.shape[1], b.shape[1])
+    diff = np.abs(a[:h, :w] - b[:h, :w]).max(axis=2)
+    print(f"matplotlib: {a.shape[1]}x{a.shape[0]} px, {slow:.3f} s/frame")
+    print(f"numpy:      {b.shape[1]}x{b.shape[0]} px, {fast:.3f} s/frame "
+          f"(+{setup:.2f} s setup per process), {slow/fast:.1f}x faster")
+    print(f"difference: mean {diff.mean():.2f}, 99th percentile {np.percentile(diff, 99):.0f}, "
+          f"pixels off by > 32: {100.*np.mean(diff > 32):.2f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
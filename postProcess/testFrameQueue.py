@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Multi-Process Check of the Frame Queue
+
+Starts several `queue_worker`s from a multiprocessing pool on one temporary
+queue directory, as `VideoAxi.py --queue --CPUs N` does on a node. Each
+worker renders frames with a dummy `process` that records the frame in a
+shared file. Before the start, a claim of a worker that has already exited
+on this host is planted on one frame. The check fails unless
+
+- every frame is rendered exactly once,
+- the stale claim is taken over and its frame is rendered,
+- no `.claim` (or set-aside stale claim) files are left,
+- `merge_reports()` counts every frame once, in agreement with the workers.
+
+Usage:
+    python testFrameQueue.py [--workers 6] [--frames 50]
+
+Dependencies:
+    - frameQueue.py (same directory)
+
+Author: Vatsal Sanjay
+Contact: vatsalsanjay@gmail.com
+Affiliation: Physics of Fluids Group
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from functools import partial
+from pathlib import Path
+
+from frameQueue import merge_reports, queue_worker
+
+STALE_FRAME = 7
+
+
+def frame_name(frame):
+    return f"frame-{frame:04d}"
+
+
+def render(frame, log_path):
+    """
+    Dummy renderer: appends the frame to the shared log (one O_APPEND write
+    per frame, so lines of different workers do not interleave).
+    """
+    time.sleep(0.002)
+    fd = os.open(log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, f"{frame_name(frame)} {os.getpid()}\n".encode())
+    finally:
+        os.close(fd)
+
+
+def dead_pid():
+    """Pid of a process of this host that has exited."""
+    proc = subprocess.Popen([sys.executable, '-c', ''])
+    proc.wait()
+    return proc.pid
+
+
+def main(argv=None):
+    """
+    Renders all frames with several queue workers and checks the result.
+    """
+    parser = argparse.ArgumentParser(description="Multi-process check of frameQueue.py")
+    parser.add_argument('--workers', type=int, default=6, help='Queue workers (default: 6)')
+    parser.add_argument('--frames', type=int, default=50, help='Frames (default: 50)')
+    args = parser.parse_args(argv)
+
+    frames = list(range(args.frames))
+    errors = []
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = Path(tmp) / '.queue'
+        folder.mkdir()
+        log_path = Path(tmp) / 'renders.txt'
+        stale = folder / f"{frame_name(STALE_FRAME)}.claim"
+        stale.write_text(json.dumps({'host': socket.gethostname(), 'pid': dead_pid(),
+                                     'time': time.time()}))
+
+        worker = partial(queue_worker, frames=frames, process=partial(render, log_path=log_path),
+                         folder=str(folder), key=frame_name)
+        with mp.Pool(processes=args.workers) as pool:
+            per_worker = pool.map(worker, range(args.workers))
+
+        renders = Counter(line.split()[0] for line in log_path.read_text().splitlines())
+        renderers = {line.split()[1] for line in log_path.read_text().splitlines()}
+        missing = [frame_name(frame) for frame in frames if renders[frame_name(frame)] == 0]
+        twice = [name for name, count in renders.items() if count > 1]
+        if missing:
+            errors.append(f"not rendered: {' '.join(missing)}")
+        if twice:
+            errors.append(f"rendered more than once: {' '.join(twice)}")
+        if not (folder / f"{frame_name(STALE_FRAME)}.done").exists():
+            errors.append("stale claim not taken over")
+        leftovers = sorted(path.name for path in folder.glob('*.claim*'))
+        if leftovers:
+            errors.append(f"claims left: {' '.join(leftovers)}")
+
+        merged = merge_reports(folder)
+        if merged['frames'] != args.frames or merged['done'] != args.frames:
+            errors.append(f"merged report has {merged['frames']} frames, "
+                          f"{merged['done']} done, expected {args.frames}")
+        if sum(per_worker) != merged['frames'] or \
+                sum(worker['frames'] for worker in merged['workers']) != merged['frames']:
+            errors.append(f"workers report {per_worker}, merged {merged['frames']}")
+
+    print(f"{args.frames} frames, {args.workers} workers ({len(renderers)} rendered), "
+          f"per worker {per_worker}"
+          f"{'' if not errors else '  FAILED: ' + '; '.join(errors)}")
+    return 0 if not errors else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
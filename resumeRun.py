@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Checkpoint-Aware Resume
+
+Prepares a run directory so that a case restarts from its latest complete
+checkpoint. Every case restores `restart` in `event init` when the file
+exists; this tool makes sure the file it finds there is the right one:
+
+- `restart` and `intermediate/snapshot-*` are checked for completeness by
+  walking the cell tree of the Basilisk dump format, so files cut short by
+  preemption, a full disk or a crashed MPI rank are detected.
+- The complete checkpoint with the latest time is installed as `restart`
+  (atomically), and incomplete checkpoints are moved to `incomplete/`.
+- Rows of `log*-*.dat` at or after the checkpoint time are removed, so
+  the resumed run appends to the log without duplicating rows.
+
+The cases themselves skip the snapshot times that were already written
+and append to their log after a successful restore.
+
+Usage:
+    python resumeRun.py --run-dir simulationCases/dropImpact
+
+Dependencies:
+    - Python standard library only
+
+Author: Vatsal Sanjay
+Contact: vatsalsanjay@gmail.com
+Affiliation: Physics of Fluids Group
+"""
+
+import argparse
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+
+RESTART_FILE = 'restart'
+SNAPSHOT_GLOB = 'intermediate/snapshot-*'
+LOG_GLOB = 'log*-*.dat'
+INCOMPLETE_DIR = 'incomplete'
+# Snapshots rewritten by compactSnapshots.py; not usable as checkpoints
+COMPACTED_SUFFIXES = ('.lite', '.gz', '.xz')
+
+# struct DumpHeader in Basilisk's output.h: t, len, i, depth, npe, version, n
+DUMP_HEADER = struct.Struct('=dqiiiiddd')
+DUMP_VERSION_NO_ORIGIN = 161020  # dumps older than this layout lack o[4]
+LEAF_FLAG = 1 << 1  # `leaf` flag of tree.h, set on leaf cell records
+
+
+def read_dump_header(path):
+    """
+    Reads the header of a Basilisk dump file.
+
+    Args:
+        path (Path): Dump file
+
+    Returns:
+        dict: t, i, depth, npe, version, names (list of the dumped
+        fields), origin ([X0, Y0, Z0, L0] or None) and data_offset (byte
+        offset of the first cell record)
+
+    Raises:
+        ValueError: If the file is too short or not a dump file
+    """
+    with open(path, 'rb') as fp:
+        raw = fp.read(DUMP_HEADER.size)
+        if len(raw) < DUMP_HEADER.size:
+            raise ValueError(f"{path}: truncated header")
+        t, nvar, i, depth, npe, version, *_ = DUMP_HEADER.unpack(raw)
+        if not 0 < nvar < 1000 or depth < 0 or npe < 1:
+            raise ValueError(f"{path}: not a Basilisk dump file")
+        names = []
+        for _ in range(nvar):
+            raw = fp.read(4)
+            if len(raw) < 4:
+                raise ValueError(f"{path}: truncated field names")
+            length, = struct.unpack('=I', raw)
+            name = fp.read(length)
+            if len(name) < length:
+                raise ValueError(f"{path}: truncated field names")
+            names.append(name.decode('utf-8', 'replace'))
+        origin = None
+        if version != DUMP_VERSION_NO_ORIGIN:
+            raw = fp.read(32)
+            if len(raw) < 32:
+                raise ValueError(f"{path}: truncated origin")
+            origin = list(struct.unpack('=4d', raw))
+        return {'t': t, 'i': i, 'depth': depth, 'npe': npe, 'version': version,
+                'names': names, 'origin': origin, 'data_offset': fp.tell()}
+
+
+def count_cells(flags, children):
+    """
+    Walks the depth-first cell records of a dump.
+
+    Args:
+        flags (sequence): Flags of every record, in file order
+        children (int): Children per cell (4 for quadtrees, 8 for octrees)
+
+    Returns:
+        int or None: Number of records forming a complete tree, or None if
+        the records end before the tree does
+    """
+    expected = 1
+    for k, flag in enumerate(flags):
+        expected += -1 if flag & LEAF_FLAG else children - 1
+        if expected == 0:
+            return k + 1
+    return None
+
+
+def dump_is_complete(path):
+    """
+    Checks that a dump file holds a complete cell tree and nothing more.
+
+    Args:
+        path (Path): Dump file
+
+    Returns:
+        tuple: (complete, header or None, reason)
+    """
+    try:
+        header = read_dump_header(path)
+    except (OSError, ValueError) as e:
+        return False, None, str(e)
+    record = 4 + 8*len(header['names'])
+    payload = Path(path).stat().st_size - header['data_offset']
+    if payload <= 0 or payload % record:
+        return False, header, 'truncated cell records'
+    with open(path, 'rb') as fp:
+        fp.seek(header['data_offset'])
+        words = array('I')
+        words.frombytes(fp.read(payload))
+    flags = words[::record//4]
+    for children in (4, 8):
+        if count_cells(flags, children) == len(flags):
+            return True, header, 'complete'
+    return False, header, 'incomplete cell tree'
+
+
+def find_checkpoints(run_dir):
+    """
+    Checks `restart` and the snapshots of a run directory.
+
+    Args:
+        run_dir (Path): Run directory
+
+    Returns:
+        tuple: (complete, incomplete) lists; complete holds (t, path)
+        sorted by time, incomplete holds (path, reason)
+    """
+    run_dir = Path(run_dir)
+    candidates = sorted(run_dir.glob(SNAPSHOT_GLOB))
+    if (run_dir / RESTART_FILE).is_file():
+        candidates.append(run_dir / RESTART_FILE)
+    complete, incomplete = [], []
+    for path in candidates:
+        if not path.is_file() or path.name.endswith(('~',) + COMPACTED_SUFFIXES):
+            continue
+        ok, header, reason = dump_is_complete(path)
+        if ok:
+            complete.append((header['t'], path))
+        else:
+            incomplete.append((path, reason))
+    # restart sorts last among equal times: it is the file the case restores
+    complete.sort(key=lambda item: (item[0], item[1].name == RESTART_FILE))
+    return complete, incomplete
+
+
+def install_restart(checkpoint, run_dir):
+    """
+    Makes `checkpoint` the restart file of the run, atomically.
+
+    Args:
+        checkpoint (Path): Complete dump file
+        run_dir (Path): Run directory
+    """
+    restart = Path(run_dir) / RESTART_FILE
+    if restart.exists() and os.path.samefile(checkpoint, restart):
+        return
+    fd, tmp = tempfile.mkstemp(dir=run_dir, prefix='.restart-')
+    os.close(fd)
+    shutil.copy2(checkpoint, tmp)
+    os.replace(tmp, restart)
+
+
+def trim_log(path, t_restart):
+    """
+    Removes the log rows the resumed run will write again.
+
+    The case logs `i dt t ke` rows with `%g`; rows whose time is at or
+    after the checkpoint time (at that precision) are dropped, header
+    lines are kept.
+
+    Args:
+        path (Path): Log file
+        t_restart (float): Time of the checkpoint
+
+    Returns:
+        int: Number of removed rows
+    """
+    cutoff = float(f"{t_restart:g}")
+    kept, removed = [], 0
+    with open(path) as fp:
+        for line in fp:
+            fields = line.split()
+            try:
+                stale = int(fields[0]) >= 0 and float(fields[2]) >= cutoff
+            except (ValueError, IndexError):
+                stale = False  # header line
+            if stale:
+                removed += 1
+            else:
+                kept.append(line)
+    if removed:
+        fd, tmp = tempfile.mkstemp(dir=Path(path).parent, prefix='.log-')
+        with os.fdopen(fd, 'w') as fp:
+            fp.writelines(kept)
+        os.replace(tmp, path)
+    return removed
+
+
+def prepare_resume(run_dir, verbose=True):
+    """
+    Prepares a run directory for resuming from its latest checkpoint.
+
+    Args:
+        run_dir (Path): Run directory
+        verbose (bool): Print what was done
+
+    Returns:
+        float or None: Time of the checkpoint, or None when the run has no
+        complete checkpoint and will start from t = 0
+    """
+    run_dir = Path(run_dir)
+    complete, incomplete = find_checkpoints(run_dir)
+    for path, reason in incomplete:
+        target = run_dir / INCOMPLETE_DIR / path.relative_to(run_dir)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(path, target)
+        if verbose:
+            print(f"Incomplete checkpoint {path.relative_to(run_dir)} "
+                  f"({reason}); moved to {target.relative_to(run_dir)}")
+    if not complete:
+        if verbose:
+            print(f"No complete checkpoint in {run_dir}; starting from t = 0")
+        return None
+
+    t_restart, checkpoint = complete[-1]
+    install_restart(checkpoint, run_dir)
+    if verbose:
+        print(f"Resuming from {checkpoint.relative_to(run_dir)} (t = {t_restart:g})")
+    for log in sorted(run_dir.glob(LOG_GLOB)):
+        removed = trim_log(log, t_restart)
+        if removed and verbose:
+            print(f"Removed {removed} rows at t >= {t_restart:g} from {log.name}")
+    return t_restart
+
+
+def parse_args(argv=None):
+    """
+    Parses the command line.
+
+    Args:
+        argv (list): Arguments (default: sys.argv[1:])
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Prepare a run directory for resuming")
+    parser.add_argument('--run-dir', required=True,
+                        help='Run directory (e.g. simulationCases/dropImpact)')
+    parser.add_argument('--check', action='store_true',
+                        help='Only report the checkpoints, change nothing')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Installs the latest complete checkpoint of a run as its restart file.
+    """
+    args = parse_args(argv)
+    run_dir = Path(args.run_dir)
+    if not run_dir.is_dir():
+        print(f"Run directory not found: {args.run_dir}")
+        return 1
+    if args.check:
+        complete, incomplete = find_checkpoints(run_dir)
+        for t, path in complete:
+            print(f"complete    t = {t:<10g} {path.relative_to(run_dir)}")
+        for path, reason in incomplete:
+            print(f"incomplete  {reason:<24} {path.relative_to(run_dir)}")
+        return 0
+    prepare_resume(run_dir)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
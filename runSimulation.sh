@@ -5,11 +5,17 @@ set -euo pipefail
 usage() {
   cat <<'EOF'
 Usage: runSimulation.sh [--case simulationCases/SOME_CASE.c] [--input file.params]
+                        [--omp N | --mpi N] [--cpus LIST] [--resume] [--no-cache]
 
 Options:
-  --case    Path to case source file (.c), optional.
-  --input   Path to params file, optional.
-  --help    Show this help.
+  --case      Path to case source file (.c), optional.
+  --input     Path to params file, optional.
+  --omp N     Compile with -fopenmp and run with N OpenMP threads.
+  --mpi N     Compile with -D_MPI=1 and run with mpirun -np N.
+  --cpus LIST Pin the run to these cores (taskset list, e.g. 0-7).
+  --resume    Continue from the latest complete checkpoint (resumeRun.py).
+  --no-cache  Always compile with qcc instead of using the build cache.
+  --help      Show this help.
 
 Notes:
   - Defaults:
@@ -20,6 +26,16 @@ Notes:
     dropImpact-EVP -> default-EVP.params
     dropImpact-EVP-HB -> default-EVP-HB.params
   - Default params are expected at repository root.
+  - MPI builds use CC99 (default: 'mpicc -std=c99 -D_GNU_SOURCE=1') and
+    launch with $MPIRUN (default: mpirun) plus $MPIRUN_FLAGS. With --cpus,
+    set MPIRUN_FLAGS='--bind-to none' so ranks stay inside the core list.
+  - Cases restore the restart file of their run directory when it exists.
+    --resume first checks restart and intermediate/snapshot-* for
+    completeness, installs the latest complete one as restart and trims
+    the log rows the resumed run will write again.
+  - Binaries are cached by buildCache.py (keyed by the case source, its
+    src-local headers and the qcc flags) and hard-linked into the run
+    directory. Set MULTIRHEOFLOW_BUILD_CACHE to share the cache.
 EOF
 }
 
@@ -56,6 +72,21 @@ default_params_for_case() {
 
 CASE_ARG="simulationCases/dropImpact.c"
 INPUT_ARG=""
+USE_CACHE=1
+RESUME=0
+PARALLEL_MODE=""
+NPROCS=1
+CPU_LIST=""
+
+require_count() {
+  case "$2" in
+    ''|*[!0-9]*|0)
+      echo "Invalid value for $1: '$2' (expected a positive integer)"
+      usage
+      exit 1
+      ;;
+  esac
+}
 
 while [ "$#" -gt 0 ]; do
   case "$1" in
@@ -77,6 +108,38 @@ while [ "$#" -gt 0 ]; do
       INPUT_ARG="$2"
       shift 2
       ;;
+    --omp|--mpi)
+      if [ "$#" -lt 2 ]; then
+        echo "Missing value for $1"
+        usage
+        exit 1
+      fi
+      if [ -n "$PARALLEL_MODE" ]; then
+        echo "--omp and --mpi are mutually exclusive"
+        exit 1
+      fi
+      require_count "$1" "$2"
+      PARALLEL_MODE="${1#--}"
+      NPROCS="$2"
+      shift 2
+      ;;
+    --cpus)
+      if [ "$#" -lt 2 ]; then
+        echo "Missing value for --cpus"
+        usage
+        exit 1
+      fi
+      CPU_LIST="$2"
+      shift 2
+      ;;
+    --resume)
+      RESUME=1
+      shift
+      ;;
+    --no-cache)
+      USE_CACHE=0
+      shift
+      ;;
     --help|-h)
       usage
       exit 0
@@ -130,11 +193,47 @@ fi
 
 cd "$RUN_DIR"
 
-qcc -I"${REPO_ROOT}/src-local" -I"${REPO_ROOT}/../src-local" -O2 -Wall \
-  -disable-dimensions "$CASE_FILE_NAME" -o "$CASE_NAME" -lm
+QCC_FLAGS=(-O2 -Wall -disable-dimensions)
+LAUNCH=()
+case "$PARALLEL_MODE" in
+  omp)
+    QCC_FLAGS+=(-fopenmp)
+    export OMP_NUM_THREADS="$NPROCS"
+    ;;
+  mpi)
+    QCC_FLAGS+=(-D_MPI=1)
+    export CC99="${CC99:-mpicc -std=c99 -D_GNU_SOURCE=1}"
+    MPIRUN="${MPIRUN:-mpirun}"
+    if ! command -v "$MPIRUN" >/dev/null 2>&1; then
+      echo "MPI launcher not found: ${MPIRUN}"
+      exit 1
+    fi
+    read -r -a MPIRUN_ARGS <<< "${MPIRUN_FLAGS:-}"
+    LAUNCH=("$MPIRUN" -np "$NPROCS" ${MPIRUN_ARGS[@]+"${MPIRUN_ARGS[@]}"})
+    ;;
+esac
+if [ -n "$CPU_LIST" ]; then
+  LAUNCH=(taskset -c "$CPU_LIST" ${LAUNCH[@]+"${LAUNCH[@]}"})
+fi
+
+if [ "$USE_CACHE" -eq 1 ] && command -v python3 >/dev/null 2>&1; then
+  python3 "${REPO_ROOT}/buildCache.py" --case "$CASE_FILE_NAME" \
+    --output "$CASE_NAME" --flags="${QCC_FLAGS[*]}"
+else
+  qcc -I"${REPO_ROOT}/src-local" -I"${REPO_ROOT}/../src-local" \
+    "${QCC_FLAGS[@]}" "$CASE_FILE_NAME" -o "$CASE_NAME" -lm
+fi
+
+if [ "$RESUME" -eq 1 ]; then
+  if ! command -v python3 >/dev/null 2>&1; then
+    echo "--resume requires python3"
+    exit 1
+  fi
+  python3 "${REPO_ROOT}/resumeRun.py" --run-dir "$RUN_DIR"
+fi
 
 if [ -n "$PARAM_BASENAME" ]; then
-  ./"$CASE_NAME" "$PARAM_BASENAME"
+  ${LAUNCH[@]+"${LAUNCH[@]}"} ./"$CASE_NAME" "$PARAM_BASENAME"
 else
-  ./"$CASE_NAME"
+  ${LAUNCH[@]+"${LAUNCH[@]}"} ./"$CASE_NAME"
 fi
@@ -0,0 +1,588 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Parameter Sweep Runner
+
+Expands a sweep specification into one `.params` file per grid point,
+compiles each case once (through the build cache of `buildCache.py`) and
+runs all points through a bounded local process pool, pinning every run
+to its own set of cores.
+
+Usage:
+    python runSweep.py --case simulationCases/dropImpact-EVP-HB.c --sweep sweep.params [-j 4]
+    python runSweep.py --case simulationCases/dropImpact-EVP-HB.c --sweep sweep.params --mpi 4
+
+With `--omp N` or `--mpi N` every run is an OpenMP (N threads) or MPI
+(N ranks) job on its own N cores, and the number of concurrent runs
+defaults to the available cores divided by N. MPI builds use `CC99`
+(default `mpicc -std=c99 -D_GNU_SOURCE=1`) and launch with `$MPIRUN`
+(default `mpirun`) and `$MPIRUN_FLAGS` (default `--bind-to none`, so the
+ranks stay inside the cores of their run).
+
+The sweep specification uses the `key = value` format of the
+`default-*.params` files; a comma-separated list sweeps that key and
+the points are the Cartesian product of all lists, e.g.
+
+    We = 5, 10, 20
+    Ec = 0.5, 1.0
+    J = 0.1
+
+Keys that are not swept keep the values of the base parameter file
+(`--input`, or the case default used by `runSimulation.sh`).
+
+Layout of the output directory (default `simulationCases/<case>-sweep/`):
+
+    <NNNN>-<key><value>.../ one run directory per point with its .params
+                            file, a hard link to the cached binary and
+                            run.log (stdout and stderr)
+    sweep-status.json       state of every point (pending, running,
+                            done, failed, interrupted)
+
+With `--resume`, points marked done are skipped and the others continue
+from their latest complete checkpoint (see `resumeRun.py`); their
+run.log is appended to after a marker line.
+
+Dependencies:
+    - qcc (Basilisk) on PATH
+
+Author: Vatsal Sanjay
+Contact: vatsalsanjay@gmail.com
+Affiliation: Physics of Fluids Group
+"""
+
+import argparse
+import itertools
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from buildCache import QCC_FLAGS, cached_build, link_binary
+from resumeRun import prepare_resume
+
+REPO_ROOT = Path(__file__).resolve().parent
+STATUS_FILE = 'sweep-status.json'
+POLL_INTERVAL = 0.5  # seconds between checks of running processes
+MPI_CC99 = 'mpicc -std=c99 -D_GNU_SOURCE=1'
+
+# Same mapping as default_params_for_case() in runSimulation.sh
+DEFAULT_PARAMS = {
+    'dropImpact': 'default-VE.params',
+    'dropImpact-EVP': 'default-EVP.params',
+    'dropImpact-EVP-HB': 'default-EVP-HB.params',
+}
+
+
+def strip_param_comment(line):
+    """
+    Removes comments and surrounding whitespace from a parameter line,
+    following parseCaseParams() in case-params.h.
+
+    Args:
+        line (str): Raw line of a parameter file
+
+    Returns:
+        str: The `key = value` text, or an empty string for comments and
+        blank lines
+    """
+    text = line.strip()
+    if not text or text[0] in '#;':
+        return ''
+    text = text.split('#', 1)[0].split('//', 1)[0]
+    return text.strip()
+
+
+def read_params(path):
+    """
+    Reads a `key = value` parameter file.
+
+    Args:
+        path (Path): Parameter file
+
+    Returns:
+        tuple: (lines, values) with the raw lines of the file and a dict
+        mapping each key to its value string
+
+    Raises:
+        ValueError: If a line is not of the form `key = value`
+    """
+    lines = Path(path).read_text().splitlines()
+    values = {}
+    for line_no, line in enumerate(lines, 1):
+        text = strip_param_comment(line)
+        if not text:
+            continue
+        key, sep, value = text.partition('=')
+        if not sep or not key.strip() or not value.strip():
+            raise ValueError(f"Malformed line {line_no} in {path}")
+        values[key.strip()] = value.strip()
+    return lines, values
+
+
+def parse_sweep_spec(path):
+    """
+    Reads a sweep specification.
+
+    Args:
+        path (Path): Sweep file in `key = v1, v2, ...` format
+
+    Returns:
+        dict: Key -> list of value strings, in file order
+
+    Raises:
+        ValueError: If a value is not a number or a key is repeated
+    """
+    spec = {}
+    for line_no, line in enumerate(Path(path).read_text().splitlines(), 1):
+        text = strip_param_comment(line)
+        if not text:
+            continue
+        key, sep, value = text.partition('=')
+        key = key.strip()
+        values = [v.strip() for v in value.split(',') if v.strip()]
+        if not sep or not key or not values:
+            raise ValueError(f"Malformed line {line_no} in {path}")
+        if key in spec:
+            raise ValueError(f"Key '{key}' repeated at line {line_no} in {path}")
+        for v in values:
+            try:
+                float(v)
+            except ValueError:
+                raise ValueError(f"Invalid number '{v}' for {key} at line {line_no} in {path}")
+        spec[key] = values
+    return spec
+
+
+def expand_points(spec):
+    """
+    Expands a sweep specification into its grid points.
+
+    Args:
+        spec (dict): Key -> list of value strings
+
+    Returns:
+        list: One dict (key -> value string) per point
+    """
+    keys = list(spec)
+    return [dict(zip(keys, combo)) for combo in itertools.product(*spec.values())]
+
+
+def render_params(lines, overrides, header):
+    """
+    Renders a parameter file with some values replaced.
+
+    Args:
+        lines (list): Raw lines of the base parameter file
+        overrides (dict): Key -> value string
+        header (str): Comment placed at the top of the file
+
+    Returns:
+        str: File contents; keys absent from the base are appended
+    """
+    out = [f"# {header}"]
+    pending = dict(overrides)
+    for line in lines:
+        text = strip_param_comment(line)
+        key = text.partition('=')[0].strip() if text else ''
+        if key in pending:
+            out.append(f"{key} = {pending.pop(key)}")
+        else:
+            out.append(line)
+    out.extend(f"{key} = {value}" for key, value in pending.items())
+    return '\n'.join(out) + '\n'
+
+
+def point_name(index, point, swept_keys):
+    """
+    Directory name of a point: index followed by the swept values.
+
+    Args:
+        index (int): Position of the point in the sweep
+        point (dict): Key -> value string
+        swept_keys (list): Keys with more than one value
+
+    Returns:
+        str: Name such as `0003-We10-Ec0.5`
+    """
+    label = '-'.join(f"{key}{point[key]}" for key in swept_keys)
+    label = re.sub(r'[^A-Za-z0-9.+-]', '_', label)
+    return f"{index:04d}-{label}" if label else f"{index:04d}"
+
+
+def default_params_for_case(case_name):
+    """
+    Base parameter file used when `--input` is not given.
+
+    Args:
+        case_name (str): Case name without extension
+
+    Returns:
+        Path: Parameter file at the repository root
+    """
+    return REPO_ROOT / DEFAULT_PARAMS.get(case_name, 'default-VE.params')
+
+
+def cpu_slots(jobs, cores_per_run):
+    """
+    Splits the cores available to this process between concurrent runs.
+
+    Args:
+        jobs (int): Number of concurrent runs
+        cores_per_run (int): Cores pinned to each run
+
+    Returns:
+        list: One list of core ids per slot, or None entries when pinning
+        is unavailable or there are not enough cores
+    """
+    if not hasattr(os, 'sched_getaffinity'):
+        return [None]*jobs
+    cores = sorted(os.sched_getaffinity(0))
+    if jobs*cores_per_run > len(cores):
+        print(f"Warning: {jobs} runs x {cores_per_run} cores exceed the "
+              f"{len(cores)} available cores; not pinning")
+        return [None]*jobs
+    return [cores[k*cores_per_run:(k + 1)*cores_per_run] for k in range(jobs)]
+
+
+def launch_mode(omp=None, mpi=None):
+    """
+    Build flags, launcher and environment of the runs, matching the
+    `--omp`/`--mpi` options of runSimulation.sh.
+
+    Args:
+        omp (int or None): OpenMP threads per run
+        mpi (int or None): MPI ranks per run
+
+    Returns:
+        tuple: (flags, launcher, env) with the qcc flags, the command
+        prefix of every run and the environment of the runs
+
+    Raises:
+        RuntimeError: If the MPI launcher is not on PATH
+    """
+    env = dict(os.environ)
+    if omp:
+        env['OMP_NUM_THREADS'] = str(omp)
+        return QCC_FLAGS + ['-fopenmp'], [], env
+    if mpi:
+        mpirun = os.environ.get('MPIRUN', 'mpirun')
+        if shutil.which(mpirun) is None:
+            raise RuntimeError(f"MPI launcher not found: {mpirun}")
+        extra = os.environ.get('MPIRUN_FLAGS', '--bind-to none').split()
+        return QCC_FLAGS + ['-D_MPI=1'], [mpirun, '-np', str(mpi)] + extra, env
+    return list(QCC_FLAGS), [], env
+
+
+class SweepStatus:
+    """
+    Per-point state of a sweep, saved to `sweep-status.json` after every
+    change so that other processes can follow the sweep.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.points = {}
+        if self.path.exists():
+            self.points = json.loads(self.path.read_text())
+
+    def update(self, name, **fields):
+        """
+        Updates the fields of one point and saves the table.
+
+        Args:
+            name (str): Point name
+            **fields: Fields to set (state, returncode, ...)
+        """
+        self.points.setdefault(name, {}).update(fields)
+        self.save()
+
+    def save(self):
+        """
+        Writes the table atomically.
+        """
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix='.sweep-status-')
+        with os.fdopen(fd, 'w') as fp:
+            json.dump(self.points, fp, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+
+    def counts(self):
+        """
+        Returns:
+            dict: Number of points per state
+        """
+        counts = {}
+        for entry in self.points.values():
+            counts[entry.get('state')] = counts.get(entry.get('state'), 0) + 1
+        return counts
+
+
+def prepare_points(cases, spec, base_input, out_dir, status, resume=False):
+    """
+    Writes the run directory and `.params` file of every point.
+
+    Args:
+        cases (list): Case sources (Path)
+        spec (dict): Sweep specification
+        base_input (Path or None): Base parameter file (`--input`)
+        out_dir (Path): Sweep output directory
+        status (SweepStatus): Status table
+        resume (bool): Leave out the points already marked done
+
+    Returns:
+        list: One dict per run with keys name, case, run_dir and params
+    """
+    points = expand_points(spec)
+    swept_keys = [key for key, values in spec.items() if len(values) > 1]
+    runs = []
+    for case_file in cases:
+        base = base_input or default_params_for_case(case_file.stem)
+        lines, values = read_params(base)
+        unknown = [key for key in spec if key not in values]
+        if unknown:
+            print(f"Warning: {', '.join(unknown)} not in {base.name}; appending")
+        for index, point in enumerate(points):
+            name = point_name(index, point, swept_keys)
+            if len(cases) > 1:
+                name = f"{case_file.stem}/{name}"
+            if resume and status.points.get(name, {}).get('state') == 'done':
+                continue
+            run_dir = out_dir / name
+            run_dir.mkdir(parents=True, exist_ok=True)
+            params = run_dir / f"{case_file.stem}.params"
+            params.write_text(render_params(
+                lines, point, f"Generated by runSweep.py from {base.name}"))
+            runs.append({'name': name, 'case': case_file, 'run_dir': run_dir,
+                         'params': params})
+            status.update(name, state='pending', case=case_file.name,
+                          params=point)
+    return runs
+
+
+def open_run_log(run):
+    """
+    Opens the log a run writes its stdout and stderr to.
+
+    The log of a point continued from a checkpoint is appended to, after a
+    marker line, so the output of the interrupted run is kept.
+
+    Args:
+        run (dict): Run from prepare_points(), with `resumed_from` set by
+                    --resume
+
+    Returns:
+        file: The open log
+    """
+    path = run['run_dir'] / 'run.log'
+    t_restart = run.get('resumed_from')
+    if t_restart is None:
+        return open(path, 'w')
+    log = open(path, 'a')
+    log.write(f"\n# runSweep.py: resumed from t = {t_restart:g} at "
+              f"{time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+    log.flush()
+    return log
+
+
+def run_pool(runs, binaries, slots, status, launcher=(), env=None):
+    """
+    Runs the points with at most len(slots) processes at a time.
+
+    Args:
+        runs (list): Runs from prepare_points()
+        binaries (dict): Case source -> cached binary
+        slots (list): Core lists from cpu_slots()
+        status (SweepStatus): Status table
+        launcher (list): Command prefix of every run (e.g. mpirun -np 4)
+        env (dict): Environment of the runs (default: inherited)
+
+    Returns:
+        int: Number of failed runs
+    """
+    queue = list(runs)
+    running = {}  # slot -> (run, process, log file)
+    free_slots = list(range(len(slots)))
+    failed = 0
+    try:
+        while queue or running:
+            while queue and free_slots:
+                slot = free_slots.pop(0)
+                run = queue.pop(0)
+                cores = slots[slot]
+                binary = run['run_dir'] / run['case'].stem
+                link_binary(binaries[run['case']], binary)
+                log = open_run_log(run)
+                preexec = (lambda c=cores: os.sched_setaffinity(0, c)) if cores else None
+                try:
+                    proc = subprocess.Popen(
+                        list(launcher) + [f"./{binary.name}", run['params'].name],
+                        cwd=run['run_dir'], stdout=log, stderr=subprocess.STDOUT,
+                        env=env, preexec_fn=preexec)
+                except BaseException:
+                    log.close()
+                    raise
+                running[slot] = (run, proc, log)
+                status.update(run['name'], state='running', pid=proc.pid,
+                              cores=cores, start=time.time())
+                print(f"[start] {run['name']} (pid {proc.pid}, cores {cores})")
+            time.sleep(POLL_INTERVAL)
+            for slot, (run, proc, log) in list(running.items()):
+                returncode = proc.poll()
+                if returncode is None:
+                    continue
+                log.close()
+                state = 'done' if returncode == 0 else 'failed'
+                failed += returncode != 0
+                status.update(run['name'], state=state, returncode=returncode,
+                              end=time.time())
+                print(f"[{state}] {run['name']} (exit {returncode})")
+                del running[slot]
+                free_slots.append(slot)
+    except BaseException:
+        # interrupted, or the next point failed to start: stop the others
+        for run, proc, log in running.values():
+            proc.terminate()
+        for run, proc, log in running.values():
+            proc.wait()
+            log.close()
+            status.update(run['name'], state='interrupted',
+                          returncode=proc.returncode, end=time.time())
+        raise
+    return failed
+
+
+def parse_args(argv=None):
+    """
+    Parses the command line.
+
+    Args:
+        argv (list): Arguments (default: sys.argv[1:])
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Run a parameter sweep of a simulation case")
+    parser.add_argument('--case', action='append', required=True,
+                        help='Case source (.c); repeat to sweep several case variants')
+    parser.add_argument('--sweep', required=True,
+                        help='Sweep specification (key = v1, v2, ...)')
+    parser.add_argument('--input', default=None,
+                        help='Base parameter file (default: the case default of runSimulation.sh)')
+    parser.add_argument('--output', default=None,
+                        help='Output directory (default: simulationCases/<case>-sweep)')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='Concurrent runs (default: available cores / cores per run)')
+    parser.add_argument('--cores-per-run', type=int, default=None,
+                        help='Cores pinned to each run (default: 1, or N with --omp/--mpi)')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--omp', type=int, default=None, metavar='N',
+                      help='Build with OpenMP and run each point with N threads')
+    mode.add_argument('--mpi', type=int, default=None, metavar='N',
+                      help='Build with MPI and run each point with mpirun -np N')
+    parser.add_argument('--resume', action='store_true',
+                        help='Skip finished points and continue the others from '
+                             'their latest complete checkpoint')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Write the .params files and status table only')
+    return parser.parse_args(argv)
+
+
+def resolve_file(candidate):
+    """
+    Resolves a path relative to the working directory or the repository
+    root, like resolve_file() in runSimulation.sh.
+
+    Args:
+        candidate (str): Path given on the command line
+
+    Returns:
+        Path or None: Existing file, or None
+    """
+    for path in (Path(candidate), REPO_ROOT / candidate):
+        if path.is_file():
+            return path.resolve()
+    return None
+
+
+def main(argv=None):
+    """
+    Expands the sweep, compiles each case once and runs all points.
+    """
+    args = parse_args(argv)
+    nprocs = args.omp or args.mpi or 1
+    if args.cores_per_run is None:
+        args.cores_per_run = nprocs
+    if args.jobs is None:
+        available = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') \
+            else os.cpu_count() or 1
+        args.jobs = max(1, available//args.cores_per_run)
+    if min(args.jobs, args.cores_per_run, nprocs) < 1:
+        print("Error: --jobs, --cores-per-run, --omp and --mpi must be at least 1")
+        return 1
+
+    cases = []
+    for candidate in args.case:
+        case_file = resolve_file(candidate)
+        if case_file is None:
+            print(f"Case source not found: {candidate}")
+            return 1
+        cases.append(case_file)
+    sweep_file = resolve_file(args.sweep)
+    if sweep_file is None:
+        print(f"Sweep specification not found: {args.sweep}")
+        return 1
+    base_input = None
+    if args.input:
+        base_input = resolve_file(args.input)
+        if base_input is None:
+            print(f"Parameter file not found: {args.input}")
+            return 1
+
+    try:
+        spec = parse_sweep_spec(sweep_file)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+
+    out_dir = Path(args.output).resolve() if args.output else \
+        REPO_ROOT / 'simulationCases' / f"{cases[0].stem}-sweep"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    status = SweepStatus(out_dir / STATUS_FILE)
+
+    runs = prepare_points(cases, spec, base_input, out_dir, status, args.resume)
+    print(f"{len(runs)} runs in {out_dir}")
+    if args.dry_run or not runs:
+        return 0
+    if args.resume:
+        for run in runs:
+            t_restart = prepare_resume(run['run_dir'], verbose=False)
+            run['resumed_from'] = t_restart
+            status.update(run['name'], resumed_from=t_restart)
+            if t_restart is not None:
+                print(f"[resume] {run['name']} from t = {t_restart:g}")
+
+    if args.mpi:
+        os.environ.setdefault('CC99', MPI_CC99)
+    binaries = {}
+    try:
+        flags, launcher, env = launch_mode(args.omp, args.mpi)
+        for case_file in cases:
+            binaries[case_file] = cached_build(case_file, flags)
+    except (RuntimeError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+
+    slots = cpu_slots(min(args.jobs, len(runs)), args.cores_per_run)
+    start = time.time()
+    failed = run_pool(runs, binaries, slots, status, launcher, env)
+    print(f"Finished {len(runs)} runs in {time.time() - start:.1f} s: {status.counts()}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -74,6 +74,7 @@ int max_level;
 
 double We, Ohs, Oha, ohp, De, Ec, J, n_hb0, tmax, l_domain;
 char name_out[80], dump_file[80];
+double restart_time = -1.; // time of the restored dump, -1 for a fresh run
 
 static int loadInputParams (const char * params_file) {
   paramEntry params[] = {
@@ -158,7 +159,9 @@ int main(int argc, char const *argv[]) {
 }
 
 event init (t = 0) {
-  if (!restore (file = dump_file)){
+  if (restore (file = dump_file))
+    restart_time = t;
+  else {
    refine(R2(x,y,z) < (1.1) && R2(x,y,z) > (0.9)
           && level < max_level);
    fraction (f, (1-R2(x,y,z)));
@@ -195,9 +198,12 @@ event adapt(i++){
 /**
 ## Dumping Snapshots
 
-Writes restart and time-stamped snapshot dumps.
+Writes restart and time-stamped snapshot dumps. After a restart, the
+snapshot times already written are skipped.
 */
 event writingFiles (t = 0; t += tsnap; t <= tmax) {
+  if (t <= restart_time)
+    return 0; // written before the restart
   p.nodump = false;
   dump (file = dump_file);
   sprintf (name_out, "intermediate/snapshot-%5.4f", t);
@@ -233,7 +239,7 @@ event logWriting (i++) {
 
   static FILE * fp;
   if (pid() == 0) {
-    const char* mode = (i == 0) ? "w" : "a";
+    const char* mode = (i == 0 && restart_time < 0.) ? "w" : "a";
     fp = fopen(logFile, mode);
     if (fp == NULL) {
       fprintf(ferr, "Error opening log file '%s': %s\n",
@@ -241,25 +247,28 @@ event logWriting (i++) {
       return 1;
     }
 
-    if (i == 0) {
+    if (i == 0 && restart_time < 0.) {
       fprintf(ferr,
               "Level %d, Ohs %2.1e, We %2.1e, Oha %2.1e, "
               "ohp %2.1e, De %2.1e, Ec %2.1e, J %2.1e,"
               " n %2.1e\n",
               max_level, Ohs, We, Oha, ohp, De, Ec, J,
               n_hb0);
-      fprintf(ferr, "i dt t ke\n");
+      fprintf(ferr, "i dt t ke free cells\n");
       fprintf(fp,
               "Level %d, Ohs %2.1e, We %2.1e, Oha %2.1e, "
               "ohp %2.1e, De %2.1e, Ec %2.1e, J %2.1e,"
               " n %2.1e\n",
               max_level, Ohs, We, Oha, ohp, De, Ec, J,
               n_hb0);
-      fprintf(fp, "i dt t ke rM\n");
+      fprintf(fp, "i dt t ke free cells\n");
     }
 
-    fprintf(fp, "%d %g %g %g\n", i, dt, t, ke);
-    fprintf(ferr, "%d %g %g %g\n", i, dt, t, ke);
+    // polymer-free cells skipped in the relaxation step, of all cells
+    fprintf(fp, "%d %g %g %g %g %g\n", i, dt, t, ke,
+            polymer_free_cells, relaxation_cells);
+    fprintf(ferr, "%d %g %g %g %g %g\n", i, dt, t, ke,
+            polymer_free_cells, relaxation_cells);
 
     fflush(fp);
     fclose(fp);
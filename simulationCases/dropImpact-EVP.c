@@ -72,6 +72,7 @@ int max_level;
 
 double We, Ohs, Oha, De, Ec, tmax, l_domain;
 char name_out[80], dump_file[80];
+double restart_time = -1.; // time of the restored dump, -1 for a fresh run
 
 static int loadInputParams (const char * params_file) {
   paramEntry params[] = {
@@ -143,7 +144,9 @@ int main(int argc, char const *argv[]) {
 }
 
 event init (t = 0) {
-  if (!restore (file = dump_file)){
+  if (restore (file = dump_file))
+    restart_time = t;
+  else {
    refine(R2(x,y,z) < (1.1) && R2(x,y,z) > (0.9)
           && level < max_level);
    fraction (f, (1-R2(x,y,z)));
@@ -180,9 +183,12 @@ event adapt(i++){
 /**
 ## Dumping Snapshots
 
-Writes restart and time-stamped snapshot dumps.
+Writes restart and time-stamped snapshot dumps. After a restart, the
+snapshot times already written are skipped.
 */
 event writingFiles (t = 0; t += tsnap; t <= tmax) {
+  if (t <= restart_time)
+    return 0; // written before the restart
   p.nodump = false;
   dump (file = dump_file);
   sprintf (name_out, "intermediate/snapshot-%5.4f", t);
@@ -216,7 +222,7 @@ event logWriting (i++) {
 
   static FILE * fp;
   if (pid() == 0) {
-    const char* mode = (i == 0) ? "w" : "a";
+    const char* mode = (i == 0 && restart_time < 0.) ? "w" : "a";
     fp = fopen(logFile, mode);
     if (fp == NULL) {
       fprintf(ferr, "Error opening log file '%s': %s\n",
@@ -224,7 +230,7 @@ event logWriting (i++) {
       return 1;
     }
 
-    if (i == 0) {
+    if (i == 0 && restart_time < 0.) {
       fprintf(ferr,
               "Level %d, Ohs %2.1e, We %2.1e, Oha %2.1e, "
               "De %2.1e, Ec %2.1e\n",
@@ -75,6 +75,7 @@ int MAXlevel;
 
 double We, Ohs, Oha, De, Ec, tmax, Ldomain;
 char nameOut[80], dumpFile[80];
+double restartTime = -1.; // time of the restored dump, -1 for a fresh run
 
 /**
 ### main()
@@ -144,7 +145,9 @@ int main(int argc, char const *argv[]) {
 }
 
 event init (t = 0) {
-  if (!restore (file = dumpFile)){
+  if (restore (file = dumpFile))
+    restartTime = t;
+  else {
    refine(R2(x,y,z) < (1.1) && R2(x,y,z) > (0.9) && level < MAXlevel);
    fraction (f, (1-R2(x,y,z)));
    foreach(){
@@ -180,9 +183,12 @@ event adapt(i++){
 /**
 ## Dumping Snapshots
 
-Writes restart and time-stamped snapshot dumps.
+Writes restart and time-stamped snapshot dumps. After a restart, the
+snapshot times already written are skipped.
 */
 event writingFiles (t = 0; t += tsnap; t <= tmax) {
+  if (t <= restartTime)
+    return 0; // written before the restart
   p.nodump = false;
   dump (file = dumpFile);
   sprintf (nameOut, "intermediate/snapshot-%5.4f", t);
@@ -216,14 +222,14 @@ event logWriting (i++) {
 
   static FILE * fp;
   if (pid() == 0) {
-    const char* mode = (i == 0) ? "w" : "a";
+    const char* mode = (i == 0 && restartTime < 0.) ? "w" : "a";
     fp = fopen(logFile, mode);
     if (fp == NULL) {
       fprintf(ferr, "Error opening log file\n");
       return 1;
     }
 
-    if (i == 0) {
+    if (i == 0 && restartTime < 0.) {
       fprintf(ferr,
               "Level %d, Ohs %2.1e, We %2.1e, Oha %2.1e, "
               "De %2.1e, Ec %2.1e\n",
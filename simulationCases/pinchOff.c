@@ -72,6 +72,7 @@ int MAXlevel;
 
 double Oh, Oha, De, Ec, tmax;
 char nameOut[80], dumpFile[80];
+double restartTime = -1.; // time of the restored dump, -1 for a fresh run
 
 /**
 ### main()
@@ -111,7 +112,9 @@ int main(int argc, char const *argv[]) {
 }
 
 event init (t = 0) {
-  if (!restore (file = dumpFile)){
+  if (restore (file = dumpFile))
+    restartTime = t;
+  else {
     refine(R2(x,y,z,epsilon) < (1+epsilon) && R2(x,y,z,epsilon) > (1-epsilon) && level < MAXlevel);
    fraction (f, (1-R2(x,y,z,epsilon)));
   }
@@ -133,9 +136,12 @@ event adapt(i++){
 /**
 ## Dumping Snapshots
 
-Writes restart and time-stamped snapshot dumps.
+Writes restart and time-stamped snapshot dumps. After a restart, the
+snapshot times already written are skipped.
 */
 event writingFiles (t = 0; t += tsnap; t <= tmax) {
+  if (t <= restartTime)
+    return 0; // written before the restart
   dump (file = dumpFile);
   sprintf (nameOut, "intermediate/snapshot-%5.4f", t);
   dump(file=nameOut);
@@ -165,7 +171,7 @@ event logWriting (i++) {
 
   static FILE * fp;
   if (pid() == 0) {
-    const char* mode = (i == 0) ? "w" : "a";
+    const char* mode = (i == 0 && restartTime < 0.) ? "w" : "a";
     fp = fopen(logFile, mode);
     if (fp == NULL) {
       fprintf(ferr, "Error opening log file\n");
@@ -176,7 +182,7 @@ event logWriting (i++) {
     position (f, pos, {0,1,0});
     double ymin = statsf(pos).min;
 
-    if (i == 0) {
+    if (i == 0 && restartTime < 0.) {
       fprintf(ferr, "Level %d, Oh %2.1e, Oha %2.1e, De %2.1e, Ec %2.1e\n", MAXlevel, Oh, Oha, De, Ec);
       fprintf(ferr, "i dt t ke ymin\n");
       fprintf(fp, "Level %d, Oh %2.1e, Oha %2.1e, De %2.1e, Ec %2.1e\n", MAXlevel, Oh, Oha, De, Ec);
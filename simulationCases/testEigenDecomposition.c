@@ -1,19 +1,31 @@
 /**
 # Eigen-Decomposition Test (3x3 Symmetric)
 
-Validates `compute_eigensystem_symmetric_3x3()` using diagnostic
-checks for orthonormality, diagonalization, and reconstruction.
+Validates `compute_eigensystem_symmetric_3x3_analytic()` (the solver
+used by `diagonalization_3D()` in the 3D log-conform headers) using
+diagnostic checks for orthonormality, diagonalization, and
+reconstruction.
 
 ## Usage
 
 `./testEigenDecomposition a11 a12 a13 a22 a23 a33`
 
 If no arguments are provided, a default test matrix is used.
+
+`./testEigenDecomposition --benchmark [ncells]`
+
+Compares the closed-form solver with the QL iteration on `ncells`
+random symmetric positive definite (conformation-like) tensors,
+reporting cells/s and the worst orthonormality and reconstruction
+errors of each. `testEigenDecomposition.py` is a batched NumPy
+reference of the same algorithm.
 */
 
 #include <stdio.h>
 #include <math.h>
 #include <stdlib.h>
+#include <string.h>
+#include <time.h>
 #include "../src-local/eigen_decomposition.h"
 
 #define EPSILON 1e-9
@@ -26,7 +38,7 @@ typedef struct { pseudo_v3d x, y, z; } pseudo_t3d;
 /**
 ### diagonalization_3D()
 
-Wrapper around `compute_eigensystem_symmetric_3x3()` that fills
+Wrapper around `compute_eigensystem_symmetric_3x3_analytic()` that fills
 `Lambda` and `R` for the test structures.
 */
 static void diagonalization_3D(pseudo_v3d* Lambda, pseudo_t3d* R,
@@ -49,7 +61,7 @@ static void diagonalization_3D(pseudo_v3d* Lambda, pseudo_t3d* R,
     double eigenvectors[3][3];
     double eigenvalues[3];
 
-    compute_eigensystem_symmetric_3x3(matrix, eigenvectors, eigenvalues);
+    compute_eigensystem_symmetric_3x3_analytic(matrix, eigenvectors, eigenvalues);
 
     // Corrected: Store eigenvalues and eigenvectors with proper index mapping
     Lambda->x = eigenvalues[0];
@@ -277,6 +289,113 @@ int verify_reconstruction(const pseudo_t3d* A, const pseudo_t3d* R, const pseudo
     return 1;
 }
 
+/**
+### decomposition_errors()
+
+Returns the worst deviation from orthonormality of the eigenvectors and
+the worst entry of $\mathbf{A} - \mathbf{R}\Lambda\mathbf{R}^T$,
+relative to the largest entry of $\mathbf{A}$.
+*/
+static void decomposition_errors(double A[3][3], double R[3][3], double Lambda[3],
+                                 double * orthonormality, double * reconstruction)
+{
+    double scale = 0.;
+    for (int i = 0; i < 3; i++)
+        for (int j = 0; j < 3; j++)
+            scale = fmax(scale, fabs(A[i][j]));
+    *orthonormality = *reconstruction = 0.;
+    for (int i = 0; i < 3; i++) {
+        for (int j = 0; j < 3; j++) {
+            double dot = 0., entry = 0.;
+            for (int k = 0; k < 3; k++) {
+                dot += R[k][i]*R[k][j];
+                entry += R[i][k]*Lambda[k]*R[j][k];
+            }
+            *orthonormality = fmax(*orthonormality, fabs(dot - (i == j)));
+            *reconstruction = fmax(*reconstruction, fabs(entry - A[i][j])/scale);
+        }
+    }
+}
+
+typedef int (* eigensolver_3x3)(double [3][3], double [3][3], double [3]);
+
+/**
+### benchmark_solver()
+
+Decomposes `ncells` tensors with `solver`, prints cells/s and the worst
+errors. The solver may overwrite its input, so each tensor is copied
+first (as `diagonalization_3D()` does).
+*/
+static void benchmark_solver(const char * name, eigensolver_3x3 solver,
+                             double (* tensors)[3][3], long ncells)
+{
+    double R[3][3], Lambda[3], matrix[3][3];
+    double checksum = 0.;
+    clock_t start = clock();
+    for (long n = 0; n < ncells; n++) {
+        memcpy(matrix, tensors[n], sizeof(matrix));
+        solver(matrix, R, Lambda);
+        checksum += Lambda[0] + Lambda[1] + Lambda[2];
+    }
+    double seconds = (double)(clock() - start)/CLOCKS_PER_SEC;
+
+    double worst_orthonormality = 0., worst_reconstruction = 0.;
+    for (long n = 0; n < ncells; n++) {
+        double orthonormality, reconstruction;
+        memcpy(matrix, tensors[n], sizeof(matrix));
+        solver(matrix, R, Lambda);
+        decomposition_errors(tensors[n], R, Lambda, &orthonormality, &reconstruction);
+        worst_orthonormality = fmax(worst_orthonormality, orthonormality);
+        worst_reconstruction = fmax(worst_reconstruction, reconstruction);
+    }
+
+    printf("%-10s %12.4e cells/s  max |R^T R - I| = %.3e  max |A - R Lambda R^T|/|A| = %.3e%s  (checksum %.6e)\n",
+           name, seconds > 0. ? ncells/seconds : INFINITY, worst_orthonormality, worst_reconstruction,
+           (worst_orthonormality > EPSILON || worst_reconstruction > EPSILON) ? "  FAILED" : "", checksum);
+}
+
+/**
+### run_benchmark()
+
+Builds `ncells` random conformation-like tensors
+$\mathbf{A} = \mathbf{I} + s\,\mathbf{M}\mathbf{M}^T$, with $s$ spanning
+several decades, plus a share of nearly degenerate ones, and benchmarks
+both solvers on them.
+*/
+static int run_benchmark(long ncells)
+{
+    double (* tensors)[3][3] = malloc(ncells*sizeof(*tensors));
+    if (!tensors) {
+        fprintf(stderr, "Could not allocate %ld tensors\n", ncells);
+        return 1;
+    }
+
+    srand(12345);
+    for (long n = 0; n < ncells; n++) {
+        double M[3][3];
+        for (int i = 0; i < 3; i++)
+            for (int j = 0; j < 3; j++)
+                M[i][j] = rand()/(double)RAND_MAX - 0.5;
+        double s = pow(10., -4. + 6.*rand()/(double)RAND_MAX);
+        if (n % 16 == 0)
+            M[1][0] = M[1][1] = M[1][2] = M[2][0] = M[2][1] = M[2][2] = 0.; // rank-one stretch: double eigenvalue 1
+        for (int i = 0; i < 3; i++)
+            for (int j = 0; j < 3; j++) {
+                double mm = 0.;
+                for (int k = 0; k < 3; k++)
+                    mm += M[i][k]*M[j][k];
+                tensors[n][i][j] = (i == j) + s*mm;
+            }
+    }
+
+    printf("Benchmarking %ld symmetric 3x3 tensors\n", ncells);
+    benchmark_solver("QL", compute_eigensystem_symmetric_3x3, tensors, ncells);
+    benchmark_solver("analytic", compute_eigensystem_symmetric_3x3_analytic, tensors, ncells);
+
+    free(tensors);
+    return 0;
+}
+
 /**
 ### main()
 
@@ -286,6 +405,9 @@ int main(int argc, char *argv[]) {
     pseudo_t3d A, R;
     pseudo_v3d Lambda;
 
+    if (argc >= 2 && strcmp(argv[1], "--benchmark") == 0)
+        return run_benchmark(argc >= 3 ? atol(argv[2]) : 1000000);
+
     // Initialize A with the given values
 
     /*
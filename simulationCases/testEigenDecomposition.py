@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Batched NumPy Reference for the Closed-Form Eigen-Decomposition
+
+This script is a vectorized reference implementation of the closed-form
+eigen-solvers used by the log-conformation headers:
+
+- `diagonalization_2D()` (trace/discriminant formula for 2x2 tensors)
+- `compute_eigensystem_symmetric_3x3_analytic()` from
+  `src-local/eigen_decomposition.h` (trigonometric eigenvalues,
+  cross-product eigenvectors, fallback for near-degenerate eigenvalues)
+
+It decomposes whole batches of tensors at once, checks them against
+`numpy.linalg.eigh` with the same diagnostics as `testEigenDecomposition.c`
+(orthonormality of R and reconstruction A = R Lambda R^T), and reports the
+throughput in cells/s. The compiled counterpart is
+`./testEigenDecomposition --benchmark [ncells]`.
+
+Usage:
+    python testEigenDecomposition.py [--ncells 1000000] [--seed 12345]
+
+Dependencies:
+    - numpy: Numerical array operations
+
+Author: Vatsal Sanjay
+Contact: vatsalsanjay@gmail.com
+Affiliation: Physics of Fluids Group
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+# Same thresholds as the C implementation
+DIAGONAL_TOL = 1e-15          # squared off-diagonal norm treated as diagonal
+EIGEN_ANALYTIC_GAP_TOL = 1e-5 # relative eigenvalue gap below which QL/eigh is used
+EPSILON = 1e-9                # tolerance of testEigenDecomposition.c
+
+
+def eigensystem_2x2(A):
+    """
+    Closed-form eigen-decomposition of a batch of symmetric 2x2 tensors.
+
+    Mirrors `diagonalization_2D()`: eigenvalues from the trace and
+    sqrt((a - d)^2/4 + b^2), the first eigenvector from the row of
+    A - lambda_1 I with the larger norm (accurate when the off-diagonal term
+    b is small), the second one the first rotated by 90 degrees. The
+    eigenvectors are stored column-wise.
+
+    Args:
+        A (numpy.ndarray): Symmetric tensors, shape (N, 2, 2)
+
+    Returns:
+        tuple: (Lambda, R) with shapes (N, 2) and (N, 2, 2)
+    """
+    a, b, d = A[:, 0, 0], A[:, 0, 1], A[:, 1, 1]
+    diagonal = b**2 < DIAGONAL_TOL
+    Lambda = np.stack([a, d], axis=1)
+    R = np.zeros_like(A)
+    R[:, 0, 0] = R[:, 1, 1] = 1.
+
+    work = ~diagonal
+    a, b, d = a[work, None], b[work, None], d[work, None]
+    H = np.sqrt((a - d)**2/4. + b**2)
+    lam = (a + d)/2. + np.array([1., -1.])*H
+    vx, vy = b[:, 0], lam[:, 0] - a[:, 0]
+    wx, wy = lam[:, 0] - d[:, 0], b[:, 0]
+    other = wx**2 + wy**2 > vx**2 + vy**2
+    vx, vy = np.where(other, wx, vx), np.where(other, wy, vy)
+    mod = np.hypot(vx, vy)
+    Lambda[work] = lam
+    R[work] = np.stack([np.stack([vx, -vy], axis=1), np.stack([vy, vx], axis=1)], axis=1)/mod[:, None, None]
+    return Lambda, R
+
+
+def _cross_eigenvectors(A, lam):
+    """
+    Unit eigenvectors of simple eigenvalues as the largest cross product
+    of two rows of A - lambda I.
+
+    Args:
+        A (numpy.ndarray): Symmetric tensors, shape (N, 3, 3)
+        lam (numpy.ndarray): One eigenvalue per tensor, shape (N,)
+
+    Returns:
+        tuple: (vectors, ok) where vectors has shape (N, 3) and ok flags the
+        tensors for which a non-zero cross product was found
+    """
+    M = A - lam[:, None, None]*np.eye(3)
+    crosses = np.stack([
+        np.cross(M[:, 0], M[:, 1]),
+        np.cross(M[:, 0], M[:, 2]),
+        np.cross(M[:, 1], M[:, 2]),
+    ], axis=1)
+    norms = np.einsum('nki,nki->nk', crosses, crosses)
+    best = norms.argmax(axis=1)
+    idx = np.arange(len(A))
+    vectors = crosses[idx, best]
+    best_norm = norms[idx, best]
+    ok = best_norm > 0.
+    vectors[ok] /= np.sqrt(best_norm[ok])[:, None]
+    return vectors, ok
+
+
+def eigensystem_3x3(A):
+    """
+    Closed-form eigen-decomposition of a batch of symmetric 3x3 tensors.
+
+    Mirrors `compute_eigensystem_symmetric_3x3_analytic()`. Tensors whose
+    eigenvalues are closer than `EIGEN_ANALYTIC_GAP_TOL` (relative) are
+    decomposed with `numpy.linalg.eigh` instead, in place of the QL fallback.
+
+    Args:
+        A (numpy.ndarray): Symmetric tensors, shape (N, 3, 3)
+
+    Returns:
+        tuple: (Lambda, R, fallback) with shapes (N, 3), (N, 3, 3) and (N,);
+        eigenvectors are stored column-wise, fallback flags the tensors that
+        were not handled in closed form
+    """
+    A = np.asarray(A, dtype=float)
+    n = len(A)
+    Lambda = np.empty((n, 3))
+    R = np.empty((n, 3, 3))
+
+    off = A[:, 0, 1]**2 + A[:, 0, 2]**2 + A[:, 1, 2]**2
+    diagonal = off < DIAGONAL_TOL
+    Lambda[diagonal] = np.diagonal(A[diagonal], axis1=1, axis2=2)
+    R[diagonal] = np.eye(3)
+
+    work = ~diagonal
+    Aw = A[work]
+    q = np.trace(Aw, axis1=1, axis2=2)/3.
+    B = Aw - q[:, None, None]*np.eye(3)
+    p = np.sqrt((np.einsum('nij,nij->n', B, B))/6.)
+    r = np.clip(np.linalg.det(B)/(2.*p**3), -1., 1.)
+    phi = np.arccos(r)/3.
+    lam_max = q + 2.*p*np.cos(phi)
+    lam_min = q + 2.*p*np.cos(phi + 2.*np.pi/3.)
+    lam_mid = 3.*q - lam_max - lam_min
+
+    scale = np.maximum(np.abs(lam_max), np.abs(lam_min))
+    gap = np.minimum(lam_max - lam_mid, lam_mid - lam_min)
+    v_max, ok_max = _cross_eigenvectors(Aw, lam_max)
+    v_min, ok_min = _cross_eigenvectors(Aw, lam_min)
+    closed_form = (gap > EIGEN_ANALYTIC_GAP_TOL*scale) & ok_max & ok_min
+
+    v_min -= np.einsum('ni,ni->n', v_min, v_max)[:, None]*v_max
+    v_min /= np.linalg.norm(v_min, axis=1, keepdims=True)
+    v_mid = np.cross(v_min, v_max)
+
+    Lw = np.stack([lam_max, lam_mid, lam_min], axis=1)
+    Rw = np.stack([v_max, v_mid, v_min], axis=2)
+
+    fallback_w = ~closed_form
+    if fallback_w.any():
+        # eigh sorts ascending; keep the descending order of the closed form
+        values, vectors = np.linalg.eigh(Aw[fallback_w])
+        Lw[fallback_w] = values[:, ::-1]
+        Rw[fallback_w] = vectors[:, :, ::-1]
+
+    Lambda[work] = Lw
+    R[work] = Rw
+    fallback = np.zeros(n, dtype=bool)
+    fallback[work] = fallback_w
+    return Lambda, R, fallback
+
+
+def decomposition_errors(A, Lambda, R):
+    """
+    Per-tensor errors with the same definitions as `testEigenDecomposition.c`.
+
+    Args:
+        A (numpy.ndarray): Tensors, shape (N, d, d)
+        Lambda (numpy.ndarray): Eigenvalues, shape (N, d)
+        R (numpy.ndarray): Column-wise eigenvectors, shape (N, d, d)
+
+    Returns:
+        tuple: (orthonormality, reconstruction) arrays of shape (N,): the worst
+        entry of |R^T R - I| and of |A - R Lambda R^T| / max|A|
+    """
+    d = A.shape[-1]
+    orthonormality = np.abs(np.einsum('nki,nkj->nij', R, R) - np.eye(d)).max(axis=(1, 2))
+    reconstructed = np.einsum('nik,nk,njk->nij', R, Lambda, R)
+    scale = np.abs(A).max(axis=(1, 2))
+    reconstruction = np.abs(reconstructed - A).max(axis=(1, 2))/scale
+    return orthonormality, reconstruction
+
+
+def conformation_like_tensors(ncells, dim=3, seed=12345):
+    """
+    Random symmetric positive definite tensors A = I + s M M^T.
+
+    The stretch s spans six decades and every 16th tensor is a rank-one
+    stretch (double eigenvalue 1), matching the C benchmark.
+
+    Args:
+        ncells (int): Number of tensors
+        dim (int): Tensor dimension (2 or 3)
+        seed (int): Random seed
+
+    Returns:
+        numpy.ndarray: Tensors of shape (ncells, dim, dim)
+    """
+    rng = np.random.default_rng(seed)
+    M = rng.random((ncells, dim, dim)) - 0.5
+    M[::16, 1:, :] = 0.
+    s = 10.**(-4. + 6.*rng.random(ncells))
+    return np.eye(dim) + s[:, None, None]*np.einsum('nik,njk->nij', M, M)
+
+
+def diagonal_shortcut(A):
+    """
+    Tensors the solvers treat as diagonal (squared off-diagonal norm below
+    `DIAGONAL_TOL`).
+
+    Args:
+        A (numpy.ndarray): Tensors, shape (N, d, d)
+
+    Returns:
+        numpy.ndarray: Boolean mask, shape (N,)
+    """
+    upper = np.triu(np.ones(A.shape[1:], dtype=bool), 1)
+    return (A[:, upper]**2).sum(axis=1) < DIAGONAL_TOL
+
+
+def reconstruction_tolerance(A):
+    """
+    Per-tensor bound on the reconstruction error.
+
+    `EPSILON`, except for the diagonal_shortcut() tensors: dropping their
+    off-diagonal terms costs up to the largest of them relative to max|A|,
+    at most sqrt(DIAGONAL_TOL) = 3.2e-8 for the unit-scale tensors used
+    here.
+
+    Args:
+        A (numpy.ndarray): Tensors, shape (N, d, d)
+
+    Returns:
+        numpy.ndarray: Tolerances, shape (N,)
+    """
+    upper = np.triu(np.ones(A.shape[1:], dtype=bool), 1)
+    dropped = np.abs(A[:, upper]).max(axis=1)/np.abs(A).max(axis=(1, 2))
+    return np.where(diagonal_shortcut(A), np.maximum(EPSILON, dropped), EPSILON)
+
+
+def benchmark(name, solver, A):
+    """
+    Times one batched solver and prints cells/s and the worst errors.
+
+    Args:
+        name (str): Label of the solver
+        solver (callable): Function A -> (Lambda, R, ...)
+        A (numpy.ndarray): Tensors, shape (N, d, d)
+
+    Returns:
+        bool: True if all tensors pass the `EPSILON` checks (the
+        reconstruction one relaxed by reconstruction_tolerance())
+    """
+    start = time.perf_counter()
+    result = solver(A)
+    seconds = time.perf_counter() - start
+    Lambda, R = result[0], result[1]
+    orthonormality, reconstruction = decomposition_errors(A, Lambda, R)
+    tolerance = reconstruction_tolerance(A)
+    passed = orthonormality.max() <= EPSILON and np.all(reconstruction <= tolerance)
+    extra = f"  fallback {result[2].mean()*100:.2f}%" if len(result) > 2 else ""
+    exact = ~diagonal_shortcut(A)
+    if exact.any() and reconstruction[exact].max() < reconstruction.max():
+        extra += f"  ({reconstruction[exact].max():.3e} outside the diagonal shortcut)"
+    print(f"{name:<14} {len(A)/seconds:12.4e} cells/s  "
+          f"max |R^T R - I| = {orthonormality.max():.3e}  "
+          f"max |A - R Lambda R^T|/|A| = {reconstruction.max():.3e}"
+          f"{extra}{'' if passed else '  FAILED'}")
+    return passed
+
+
+def main():
+    """
+    Runs the 2x2 and 3x3 reference solvers against numpy.linalg.eigh.
+    """
+    parser = argparse.ArgumentParser(description="Batched reference for the closed-form eigen-solvers")
+    parser.add_argument('--ncells', type=int, default=1000000,
+                        help='Number of random tensors (default: 1000000)')
+    parser.add_argument('--seed', type=int, default=12345,
+                        help='Random seed (default: 12345)')
+    args = parser.parse_args()
+
+    passed = True
+    for dim, solver in ((2, eigensystem_2x2), (3, eigensystem_3x3)):
+        A = conformation_like_tensors(args.ncells, dim=dim, seed=args.seed)
+        print(f"Benchmarking {args.ncells} symmetric {dim}x{dim} tensors")
+        passed &= benchmark("eigh", np.linalg.eigh, A)
+        passed &= benchmark("closed-form", solver, A)
+    if not passed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+/**
+# HB Relaxation Factor Benchmark
+
+Benchmarks the relaxation step of the HB log-conform headers on a fixed
+mesh: `hb_relaxation_factor()` from `hb_yield_factor.h` against the
+direct per-cell formula it replaces. Reports ns/cell, transcendental
+(`pow()`/`exp()`) calls per cell and the largest difference between the
+two.
+
+## Usage
+
+`./testHBYieldFactor [n] [nHB]`
+
+`n` is the number of cells per side of the uniform mesh (default 1024)
+and `nHB` the flow index of the drop (default 0.5). The drop of radius
+0.25 sits in a unit box, the interface is smeared over four cells and
+the material properties are blended as in `two-phaseEVP-HB.h`.
+*/
+
+#include <stdio.h>
+#include <math.h>
+#include <stdlib.h>
+#include <time.h>
+
+#define HB_COUNT_TRANSCENDENTALS
+#include "../src-local/hb_yield_factor.h"
+
+#define max(a,b) ((a) > (b) ? (a) : (b))
+#define clamp(x,a,b) ((x) < (a) ? (a) : (x) > (b) ? (b) : (x))
+
+#define TOLelastic 1e-2
+#define saramitoHB_yield_eps 1e-6
+#define NREP 10
+
+typedef struct {
+  double Gp, lambda, tau0, nHB, tauD;
+} cell_state;
+
+static long reference_calls = 0;
+
+/**
+### reference_factor()
+
+The direct formula previously inlined in the HB headers.
+*/
+static double reference_factor(const cell_state* c, double dt)
+{
+  double nHB_loc = max(c->nHB, 1e-12);
+  double ohp = max(fabs(c->Gp*c->lambda), saramitoHB_yield_eps);
+  double hbArgument = (c->tauD - c->tau0)/
+    (pow(ohp, 1. - nHB_loc)*(c->tauD + saramitoHB_yield_eps));
+  double KHB = max(0., pow(max(hbArgument, 0.), 1./nHB_loc));
+  reference_calls += 2;
+  if (c->lambda != 0. && c->lambda != 1e30)
+    reference_calls++;
+  return (c->lambda != 0. ?
+    (c->lambda == 1e30 ? 1: exp(-dt*KHB/c->lambda)): 0.);
+}
+
+/**
+### build_mesh()
+
+Fills `cells` with the polymer cells (`Gp` or `lambda` non-zero) of an
+`n` x `n` mesh and returns their number.
+*/
+static int build_mesh(cell_state* cells, int n, double nHB1,
+                      double G1, double lambda1, double tau01,
+                      int* interface_cells)
+{
+  double G2 = 0., lambda2 = 0., tau02 = 0., nHB2 = 1.;
+  int count = 0;
+  *interface_cells = 0;
+  srand(12345);
+  for (int i = 0; i < n; i++)
+    for (int j = 0; j < n; j++) {
+      double x = (i + 0.5)/n - 0.5, y = (j + 0.5)/n - 0.5;
+      double sf = clamp(0.5 - (sqrt(x*x + y*y) - 0.25)*n/4., 0., 1.);
+      cell_state c = {0., 0., 0., 0., 0.};
+      if (clamp(sf, 0., 1.) > TOLelastic) {
+        c.Gp += G1*sf; c.lambda += lambda1*sf;
+        c.tau0 += tau01*sf; c.nHB += nHB1*sf;
+      }
+      if (clamp(1. - sf, 0., 1.) > TOLelastic) {
+        c.Gp += G2*(1. - sf); c.lambda += lambda2*(1. - sf);
+        c.tau0 += tau02*(1. - sf); c.nHB += nHB2*(1. - sf);
+      }
+      if (c.Gp == 0. && c.lambda == 0.)
+        continue;
+      // Stress norms spanning four decades around the yield stress
+      c.tauD = tau01*pow(10., -2. + 4.*rand()/(double) RAND_MAX);
+      if (sf < 1.)
+        (*interface_cells)++;
+      cells[count++] = c;
+    }
+  return count;
+}
+
+static double elapsed(struct timespec start, struct timespec end)
+{
+  return (end.tv_sec - start.tv_sec) + 1e-9*(end.tv_nsec - start.tv_nsec);
+}
+
+int main(int argc, char* argv[])
+{
+  int n = argc > 1 ? atoi(argv[1]) : 1024;
+  double nHB1 = argc > 2 ? atof(argv[2]) : 0.5;
+  if (n <= 0 || nHB1 <= 0.) {
+    fprintf(stderr, "Usage: %s [n] [nHB]\n", argv[0]);
+    return 1;
+  }
+
+  // Material parameters of dropImpact-EVP-HB.c (We = 5, Ec = 1, De = 1, J = 0.1)
+  double G1 = 0.2, lambda1 = sqrt(5.), tau01 = 0.1, dt = 1e-5;
+
+  cell_state* cells = malloc((size_t) n*n*sizeof(cell_state));
+  double* reference = malloc((size_t) n*n*sizeof(double));
+  if (!cells || !reference) {
+    fprintf(stderr, "Error: failed to allocate %d cells\n", n*n);
+    return 1;
+  }
+  int interface_cells;
+  int ncells = build_mesh(cells, n, nHB1, G1, lambda1, tau01,
+                          &interface_cells);
+
+  printf("Mesh %dx%d, %d polymer cells (%d interface), nHB = %g\n",
+         n, n, ncells, interface_cells, nHB1);
+
+  struct timespec start, end;
+  double sum = 0.;
+  clock_gettime(CLOCK_MONOTONIC, &start);
+  for (int r = 0; r < NREP; r++)
+    for (int k = 0; k < ncells; k++)
+      sum += reference[k] = reference_factor(&cells[k], dt);
+  clock_gettime(CLOCK_MONOTONIC, &end);
+  double t_reference = elapsed(start, end);
+
+  hb_clear_states();
+  hb_register_state(nHB1, G1*lambda1, saramitoHB_yield_eps);
+  hb_register_state(1., 0., saramitoHB_yield_eps);
+
+  double max_diff = 0.;
+  clock_gettime(CLOCK_MONOTONIC, &start);
+  for (int r = 0; r < NREP; r++)
+    for (int k = 0; k < ncells; k++) {
+      const cell_state* c = &cells[k];
+      double f = hb_relaxation_factor(c->tauD, c->tau0, c->nHB,
+                                      c->Gp*c->lambda, c->lambda, dt,
+                                      saramitoHB_yield_eps);
+      sum += f;
+      max_diff = fmax(max_diff, fabs(f - reference[k]));
+    }
+  clock_gettime(CLOCK_MONOTONIC, &end);
+  double t_table = elapsed(start, end);
+
+  double updates = (double) NREP*ncells;
+  printf("%-10s %8.2f ns/cell  %5.3f pow/exp calls per cell\n", "direct",
+         1e9*t_reference/updates, reference_calls/updates);
+  printf("%-10s %8.2f ns/cell  %5.3f pow/exp calls per cell\n", "tabulated",
+         1e9*t_table/updates, hb_transcendental_calls/updates);
+  printf("Max |difference| = %.3e (checksum %g)\n", max_diff, sum);
+
+  free(cells);
+  free(reference);
+  return max_diff == 0. ? 0 : 1;
+}
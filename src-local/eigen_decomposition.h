@@ -2,7 +2,8 @@
 # Symmetric 3x3 Eigen-Decomposition
 
 Householder tridiagonalization and QL iteration for symmetric
-3x3 matrices.
+3x3 matrices, and a closed-form (trigonometric) solver that falls back
+to the QL iteration for nearly degenerate eigenvalues.
 */
 #define SQUARE(x) ((x)*(x))
 
@@ -169,3 +170,148 @@ static int compute_eigensystem_symmetric_3x3(double matrix[3][3], double eigenve
 
     return 0;
 }
+
+/**
+## Closed-form solver
+
+For the conformation tensor the QL iteration above is the dominant cost
+of `diagonalization_3D()`, which runs twice per cell and per time step.
+The eigenvalues of a symmetric 3x3 matrix are the roots of its
+characteristic cubic and can be computed in closed form with the
+trigonometric (Cardano) formula
+$$
+\lambda_k = q + 2p\cos\left(\frac{1}{3}\arccos\left(\frac{\det \mathbf{B}}{2}\right) + \frac{2\pi k}{3}\right),
+\quad \mathbf{B} = \frac{\mathbf{A} - q\mathbf{I}}{p},
+$$
+with $q = \text{tr}(\mathbf{A})/3$ and $p^2 = \text{tr}\left((\mathbf{A}-q\mathbf{I})^2\right)/6$.
+The eigenvector of a simple eigenvalue is orthogonal to the rows of
+$\mathbf{A} - \lambda\mathbf{I}$, i.e. it is the cross product of two of
+its rows. This loses accuracy as eigenvalues approach each other, so
+when the relative gap between neighbouring eigenvalues drops below
+`EIGEN_ANALYTIC_GAP_TOL` we fall back to the QL iteration.
+*/
+
+#ifndef EIGEN_ANALYTIC_GAP_TOL
+#define EIGEN_ANALYTIC_GAP_TOL 1e-5
+#endif
+
+/**
+### eigenvector_from_rows_3x3()
+
+Computes the unit eigenvector of `matrix` for the simple eigenvalue
+`eigenvalue` as the largest cross product of two rows of
+$\mathbf{A} - \lambda\mathbf{I}$. Returns `0` if all cross products
+vanish (degenerate eigenvalue), `1` otherwise.
+*/
+static int eigenvector_from_rows_3x3(double matrix[3][3], double eigenvalue, double vector[3])
+{
+    double r0[3] = {matrix[0][0] - eigenvalue, matrix[0][1], matrix[0][2]};
+    double r1[3] = {matrix[1][0], matrix[1][1] - eigenvalue, matrix[1][2]};
+    double r2[3] = {matrix[2][0], matrix[2][1], matrix[2][2] - eigenvalue};
+
+    double c01[3] = {r0[1]*r1[2] - r0[2]*r1[1], r0[2]*r1[0] - r0[0]*r1[2], r0[0]*r1[1] - r0[1]*r1[0]};
+    double c02[3] = {r0[1]*r2[2] - r0[2]*r2[1], r0[2]*r2[0] - r0[0]*r2[2], r0[0]*r2[1] - r0[1]*r2[0]};
+    double c12[3] = {r1[1]*r2[2] - r1[2]*r2[1], r1[2]*r2[0] - r1[0]*r2[2], r1[0]*r2[1] - r1[1]*r2[0]};
+
+    double n01 = SQUARE(c01[0]) + SQUARE(c01[1]) + SQUARE(c01[2]);
+    double n02 = SQUARE(c02[0]) + SQUARE(c02[1]) + SQUARE(c02[2]);
+    double n12 = SQUARE(c12[0]) + SQUARE(c12[1]) + SQUARE(c12[2]);
+
+    double * best = c01;
+    double norm = n01;
+    if (n02 > norm) { best = c02; norm = n02; }
+    if (n12 > norm) { best = c12; norm = n12; }
+    if (norm <= 0.0)
+        return 0;
+
+    norm = 1.0/sqrt(norm);
+    for (int i = 0; i < 3; i++)
+        vector[i] = best[i]*norm;
+    return 1;
+}
+
+/**
+### compute_eigensystem_symmetric_3x3_analytic()
+
+Computes eigenvalues and eigenvectors of a symmetric 3x3 matrix in
+closed form, with the same interface and output layout as
+`compute_eigensystem_symmetric_3x3()` (eigenvectors stored column-wise,
+eigenvalues in no particular order). Near-degenerate matrices are
+handed to `compute_eigensystem_symmetric_3x3()`.
+
+#### Parameters
+
+- `matrix`: Input symmetric matrix.
+- `eigenvectors`: Eigenvector matrix (column-wise).
+- `eigenvalues`: Output eigenvalues.
+
+#### Returns
+
+- `0` on success.
+- `-1` if the QL fallback fails to converge.
+*/
+static int compute_eigensystem_symmetric_3x3_analytic(double matrix[3][3], double eigenvectors[3][3], double eigenvalues[3])
+{
+    double off_diagonal = SQUARE(matrix[0][1]) + SQUARE(matrix[0][2]) + SQUARE(matrix[1][2]);
+
+    // Diagonal matrix: nothing to do
+    if (off_diagonal < 1e-15) {
+        for (int i = 0; i < 3; i++) {
+            for (int j = 0; j < 3; j++)
+                eigenvectors[i][j] = (i == j) ? 1.0 : 0.0;
+            eigenvalues[i] = matrix[i][i];
+        }
+        return 0;
+    }
+
+    // Eigenvalues from the trigonometric solution of the characteristic cubic
+    double q = (matrix[0][0] + matrix[1][1] + matrix[2][2])/3.0;
+    double b00 = matrix[0][0] - q, b11 = matrix[1][1] - q, b22 = matrix[2][2] - q;
+    double p = sqrt((SQUARE(b00) + SQUARE(b11) + SQUARE(b22) + 2.0*off_diagonal)/6.0);
+    double det_b = b00*(b11*b22 - SQUARE(matrix[1][2]))
+                 - matrix[0][1]*(matrix[0][1]*b22 - matrix[1][2]*matrix[0][2])
+                 + matrix[0][2]*(matrix[0][1]*matrix[1][2] - b11*matrix[0][2]);
+    double r = det_b/(2.0*p*p*p);
+    r = (r < -1.0) ? -1.0 : (r > 1.0 ? 1.0 : r);
+    double phi = acos(r)/3.0;
+
+    double lambda_max = q + 2.0*p*cos(phi);
+    double lambda_min = q + 2.0*p*cos(phi + 2.0*M_PI/3.0);
+    double lambda_mid = 3.0*q - lambda_max - lambda_min;
+
+    /**
+    The cross-product eigenvectors are only accurate for well separated
+    eigenvalues; otherwise use the iterative solver. */
+
+    double scale = fabs(lambda_max) > fabs(lambda_min) ? fabs(lambda_max) : fabs(lambda_min);
+    double gap = (lambda_max - lambda_mid < lambda_mid - lambda_min) ? lambda_max - lambda_mid : lambda_mid - lambda_min;
+    double v_max[3], v_min[3];
+    if (gap <= EIGEN_ANALYTIC_GAP_TOL*scale ||
+        !eigenvector_from_rows_3x3(matrix, lambda_max, v_max) ||
+        !eigenvector_from_rows_3x3(matrix, lambda_min, v_min))
+        return compute_eigensystem_symmetric_3x3(matrix, eigenvectors, eigenvalues);
+
+    // Re-orthogonalize v_min against v_max and complete the basis
+    double dot = v_min[0]*v_max[0] + v_min[1]*v_max[1] + v_min[2]*v_max[2];
+    for (int i = 0; i < 3; i++)
+        v_min[i] -= dot*v_max[i];
+    double norm = 1.0/sqrt(SQUARE(v_min[0]) + SQUARE(v_min[1]) + SQUARE(v_min[2]));
+    for (int i = 0; i < 3; i++)
+        v_min[i] *= norm;
+    double v_mid[3] = {
+        v_min[1]*v_max[2] - v_min[2]*v_max[1],
+        v_min[2]*v_max[0] - v_min[0]*v_max[2],
+        v_min[0]*v_max[1] - v_min[1]*v_max[0]
+    };
+
+    eigenvalues[0] = lambda_max;
+    eigenvalues[1] = lambda_mid;
+    eigenvalues[2] = lambda_min;
+    for (int i = 0; i < 3; i++) {
+        eigenvectors[i][0] = v_max[i];
+        eigenvectors[i][1] = v_mid[i];
+        eigenvectors[i][2] = v_min[i];
+    }
+
+    return 0;
+}
@@ -0,0 +1,140 @@
+/**
+# Herschel-Bulkley Relaxation Factor
+
+Evaluates the integrating factor of the analytic relaxation step of the
+HB log-conformation headers,
+$$
+e^{-\Delta t K_{HB}/\lambda}, \quad
+K_{HB} = max\left[0,
+\left(\frac{\|\tau_d\|-\tau_y}
+{(G_p\lambda)^{1-n_{HB}} \|\tau_d\|}\right)^{1/n_{HB}}\right]
+$$
+with fewer transcendental calls per cell than the direct formula:
+
+- $(G_p\lambda)^{1-n_{HB}}$ depends only on the material state
+  $(n_{HB}, G_p\lambda)$. The states of the pure phases are registered
+  once per timestep (see [two-phaseEVP-HB.h](two-phaseEVP-HB.h)) and
+  looked up; blended interface cells miss the table and use `pow()`.
+- $n_{HB} = 1$ (Saramito) needs no `pow()` at all.
+- Unyielded cells ($\|\tau_d\| \leq \tau_y$) have $K_{HB} = 0$ and
+  skip both `pow()` and `exp()`.
+
+The values are the same as those of the direct formula.
+*/
+
+#ifndef HB_MAX_STATES
+#define HB_MAX_STATES 8
+#endif
+
+/**
+Defining `HB_COUNT_TRANSCENDENTALS` counts the `pow()` and `exp()` calls
+in `hb_transcendental_calls` (serial benchmarks only, the counter is not
+atomic). */
+
+#ifdef HB_COUNT_TRANSCENDENTALS
+static long hb_transcendental_calls = 0;
+#define HB_COUNT_CALL() (hb_transcendental_calls++)
+#else
+#define HB_COUNT_CALL()
+#endif
+
+typedef struct {
+  double nHB, ohp;  // material state: clamped n_HB and G_p*lambda
+  double factor;    // (G_p*lambda)^(1 - n_HB)
+} hb_state;
+
+static hb_state hb_states[HB_MAX_STATES];
+static int hb_nstates = 0;
+
+/**
+### hb_clear_states()
+
+Empties the material state table.
+*/
+static void hb_clear_states (void)
+{
+  hb_nstates = 0;
+}
+
+/**
+### hb_register_state()
+
+Adds a material state to the table. Duplicates are ignored, and so are
+states beyond `HB_MAX_STATES` (they take the exact path).
+
+#### Parameters
+
+- `nHB`: HB flow index.
+- `Gp_lambda`: Product of elastic modulus and relaxation time.
+- `eps`: Regularization (`saramitoHB_yield_eps`).
+*/
+static void hb_register_state (double nHB, double Gp_lambda, double eps)
+{
+  double nHB_loc = fmax(nHB, 1e-12);
+  double ohp = fmax(fabs(Gp_lambda), eps);
+  for (int k = 0; k < hb_nstates; k++)
+    if (hb_states[k].nHB == nHB_loc && hb_states[k].ohp == ohp)
+      return;
+  if (hb_nstates == HB_MAX_STATES)
+    return;
+  hb_states[hb_nstates].nHB = nHB_loc;
+  hb_states[hb_nstates].ohp = ohp;
+  hb_states[hb_nstates].factor = pow(ohp, 1. - nHB_loc);
+  hb_nstates++;
+}
+
+/**
+### hb_ohp_factor()
+
+Returns $(G_p\lambda)^{1-n_{HB}}$ from the table, or computes it for
+states that were not registered.
+*/
+static inline double hb_ohp_factor (double nHB_loc, double ohp)
+{
+  if (nHB_loc == 1.)
+    return 1.;
+  for (int k = 0; k < hb_nstates; k++)
+    if (hb_states[k].nHB == nHB_loc && hb_states[k].ohp == ohp)
+      return hb_states[k].factor;
+  HB_COUNT_CALL();
+  return pow(ohp, 1. - nHB_loc);
+}
+
+/**
+### hb_relaxation_factor()
+
+Returns the integrating factor $e^{-\Delta t K_{HB}/\lambda}$ of one cell.
+
+#### Parameters
+
+- `tauD`: Norm of the deviatoric stress $\|\tau_d\|$.
+- `tau0`: Yield stress.
+- `nHB`: HB flow index.
+- `Gp_lambda`: Product of elastic modulus and relaxation time.
+- `lambda`: Relaxation time (`0` relaxes fully, `1e30` not at all).
+- `dt`: Timestep.
+- `eps`: Regularization (`saramitoHB_yield_eps`).
+*/
+static inline double hb_relaxation_factor (double tauD, double tau0,
+                                           double nHB, double Gp_lambda,
+                                           double lambda, double dt,
+                                           double eps)
+{
+  if (lambda == 0.)
+    return 0.;
+  if (lambda == 1e30)
+    return 1.;
+  double nHB_loc = fmax(nHB, 1e-12);
+  double ohp = fmax(fabs(Gp_lambda), eps);
+  double hbArgument = (tauD - tau0)/
+    (hb_ohp_factor(nHB_loc, ohp)*(tauD + eps));
+  if (!(hbArgument > 0.))
+    return 1.; // unyielded, K_HB = 0
+  double KHB = hbArgument;
+  if (nHB_loc != 1.) {
+    HB_COUNT_CALL();
+    KHB = pow(hbArgument, 1./nHB_loc);
+  }
+  HB_COUNT_CALL();
+  return exp(-dt*KHB/lambda);
+}
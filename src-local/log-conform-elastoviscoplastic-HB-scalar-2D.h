@@ -18,6 +18,13 @@ elasto-viscoplastic Herschel-Bulkley flows.
 - 2024-11-23: Documentation updates.
 - 2026-02-02: Unify MultiRheoFlow docs across all submodules.
 - 2026-02-09: Add HB variant with `nHB` and HB relaxation factor.
+- 2026-10-19: Optional reuse of the eigenbasis of $\log\mathbf{A}$ when
+  converting back to $\mathbf{A}$ (`EIGENBASIS_REUSE`).
+- 2026-10-19: Skip the relaxation step in polymer-free cells
+  (`polymer_free_cells` of `relaxation_cells`, run total printed at the
+  end).
+- 2026-10-19: Evaluate the HB relaxation factor with
+  [hb_yield_factor.h](hb_yield_factor.h).
 
 ## Future Work
 
@@ -188,6 +195,31 @@ TODO:
 (const) scalar tau0 = unity; // yield-stress
 (const) scalar nHB = unity; // HB power-law exponent
 double saramitoHB_yield_eps = 1e-6; // regularization for HB denominator
+double polymer_free_cells = 0.; // cells skipped in the last relaxation step
+double relaxation_cells = 0.; // cells visited in the last relaxation step
+double polymer_free_skipped = 0., relaxation_visited = 0.; // over the run
+
+#include "hb_yield_factor.h"
+
+/**
+## Eigenbasis reuse
+
+Each step diagonalizes the conformation tensor twice: once to form
+$\Psi = \log \mathbf{A}$ and once, after advection, to recover
+$\mathbf{A} = e^{\Psi}$. Defining `EIGENBASIS_REUSE` before including this
+file caches the eigenvectors of the first diagonalization and reuses them
+for the second one in cells where no component of $\Psi$ changed by more
+than `eigenbasis_reuse_tol` during the step. The cached basis diagonalizes
+the old $\Psi$ exactly, so the neglected off-diagonal part of the new
+$\Psi$ is bounded by its change. Other cells are diagonalized as usual.
+
+`eigenbasis_reuse_hits` and `eigenbasis_reuse_cells` accumulate over the
+run and the hit-rate is printed at the end of the simulation. */
+
+#ifdef EIGENBASIS_REUSE
+double eigenbasis_reuse_tol = 1e-6; // max change of Psi to reuse the basis
+double eigenbasis_reuse_hits = 0., eigenbasis_reuse_cells = 0.;
+#endif
 
 scalar A11[], A12[], A22[]; // conformation tensor
 scalar T11[], T12[], T22[]; // stress tensor
@@ -278,28 +310,48 @@ static void diagonalization_2D (pseudo_v * Lambda, pseudo_t * R, pseudo_t * A)
   }
 
   double T = A->x.x + A->y.y; // Trace of the tensor
-  double D = A->x.x*A->y.y - sq(A->x.y); // Determinant
+  // sqrt(T^2/4 - det A), without the cancellation of T^2/4 - det A
+  double H = sqrt(sq(A->x.x - A->y.y)/4. + sq(A->x.y));
+
+  Lambda->x = T/2 + H;
+  Lambda->y = T/2 - H;
 
   /**
   The eigenvectors, $\mathbf{v}_i$ are saved by columns in tensor
-  $\mathbf{R} = (\mathbf{v}_1|\mathbf{v}_2)$. */
-
-  R->x.x = R->x.y = A->x.y;
-  R->y.x = R->y.y = -A->x.x;
-  double s = 1.;
-  for (int i = 0; i < dimension; i++) {
-    double * ev = (double *) Lambda;
-    ev[i] = T/2 + s*sqrt(sq(T)/4. - D);
-    s *= -1;
-    double * Rx = (double *) &R->x;
-    double * Ry = (double *) &R->y;
-    Ry[i] += ev[i];
-    double mod = sqrt(sq(Rx[i]) + sq(Ry[i]));
-    Rx[i] /= mod;
-    Ry[i] /= mod;
-  }
+  $\mathbf{R} = (\mathbf{v}_1|\mathbf{v}_2)$. $\mathbf{v}_1$ is taken
+  from the row of $\mathbf{A} - \lambda_1\mathbf{I}$ with the larger
+  norm, $(A_{xy}, \lambda_1 - A_{xx})$ or $(\lambda_1 - A_{yy}, A_{xy})$,
+  so a small off-diagonal term does not cancel it; $\mathbf{v}_2$ is
+  $\mathbf{v}_1$ rotated by 90 degrees, which keeps $\mathbf{R}$
+  orthonormal for nearly equal eigenvalues. */
+
+  double vx = A->x.y, vy = Lambda->x - A->x.x;
+  double wx = Lambda->x - A->y.y, wy = A->x.y;
+  if (sq(wx) + sq(wy) > sq(vx) + sq(vy))
+    vx = wx, vy = wy;
+  double mod = sqrt(sq(vx) + sq(vy));
+  R->x.x = vx/mod; R->y.x = vy/mod;
+  R->x.y = - R->y.x; R->y.y = R->x.x;
 }
 
+#ifdef EIGENBASIS_REUSE
+/**
+### rotate_to_cached_basis_2D()
+
+Eigen-decomposition of $\Psi$ in a cached orthonormal basis whose first
+vector is $(R_{xx}, R_{yx})$. The eigenvalues are the Rayleigh quotients
+of $\Psi$ in that basis, so the trace is preserved exactly. */
+
+static void rotate_to_cached_basis_2D (pseudo_v * Lambda, pseudo_t * R,
+                                       pseudo_t * A, double Rxx, double Ryx)
+{
+  R->x.x = Rxx; R->y.x = Ryx;
+  R->x.y = -Ryx; R->y.y = Rxx;
+  Lambda->x = sq(Rxx)*A->x.x + 2.*Rxx*Ryx*A->x.y + sq(Ryx)*A->y.y;
+  Lambda->y = A->x.x + A->y.y - Lambda->x;
+}
+#endif
+
 /**
 The stress tensor depends on previous instants and has to be
 integrated in time. In the log-conformation scheme the advection of
@@ -333,6 +385,9 @@ event tracer_advection(i++)
 #if AXI
   scalar Psiqq = AThTh;
 #endif
+#ifdef EIGENBASIS_REUSE
+  scalar Rxx0[], Ryx0[], Psi11_0[], Psi12_0[], Psi22_0[];
+#endif
 
   /**
   ### Computation of $\Psi = \log \mathbf{A}$ and upper convective term */
@@ -386,6 +441,11 @@ event tracer_advection(i++)
     Psi11[] = sq(R.x.x)*log(Lambda.x) + sq(R.x.y)*log(Lambda.y);
     Psi22[] = sq(R.y.y)*log(Lambda.y) + sq(R.y.x)*log(Lambda.x);
 
+#ifdef EIGENBASIS_REUSE
+    Rxx0[] = R.x.x; Ryx0[] = R.y.x;
+    Psi11_0[] = Psi11[]; Psi12_0[] = Psi12[]; Psi22_0[] = Psi22[];
+#endif
+
     /**
     We now compute the upper convective term $2 \mathbf{B} +
     (\Omega \cdot \Psi -\Psi \cdot \Omega)$.
@@ -492,73 +552,131 @@ event tracer_advection(i++)
   /**
   ### Convert back to Aij */
 
-  foreach() {
+  double skipped = 0., visited = 0.;
+#ifdef EIGENBASIS_REUSE
+  double hits = 0., cells = 0.;
+  foreach (reduction(+:hits) reduction(+:cells) reduction(+:skipped)
+           reduction(+:visited)) {
+#else
+  foreach (reduction(+:skipped) reduction(+:visited)) {
+#endif
+    visited++;
     /**
-    It is time to undo the log-conformation, again by
-    diagonalization, to recover the conformation tensor $\mathbf{A}$
-    and to perform step (c).*/
-
-    pseudo_t A = {{Psi11[], Psi12[]}, {Psi12[], Psi22[]}}, R;
-    init_pseudo_t(&R, 0.0);
-    pseudo_v Lambda;
-    init_pseudo_v(&Lambda, 0.0);
-    diagonalization_2D (&Lambda, &R, &A);
-    Lambda.x = exp(Lambda.x), Lambda.y = exp(Lambda.y);
+    Polymer-free cells ($G_p = \lambda = 0$, as set below `TOLelastic`
+    by [two-phaseEVP-HB.h](two-phaseEVP-HB.h)) relax to
+    $\mathbf{A} = \mathbf{I}$ within the step and carry no stress, so
+    they are set directly without diagonalization. */
+    if (Gp[] == 0. && lambda[] == 0.) {
+      A11[] = 1.; A22[] = 1.; A12[] = 0.;
+      T11[] = 0.; T22[] = 0.; T12[] = 0.;
+#if AXI
+      AThTh[] = 1.;
+      T_ThTh[] = 0.;
+#endif
+      skipped++;
+    }
+    else {
+      /**
+      It is time to undo the log-conformation, again by
+      diagonalization, to recover the conformation tensor $\mathbf{A}$
+      and to perform step (c).*/
+
+      pseudo_t A = {{Psi11[], Psi12[]}, {Psi12[], Psi22[]}}, R;
+      init_pseudo_t(&R, 0.0);
+      pseudo_v Lambda;
+      init_pseudo_v(&Lambda, 0.0);
+#ifdef EIGENBASIS_REUSE
+      bool reuse = (fabs(Psi11[] - Psi11_0[]) < eigenbasis_reuse_tol &&
+                    fabs(Psi12[] - Psi12_0[]) < eigenbasis_reuse_tol &&
+                    fabs(Psi22[] - Psi22_0[]) < eigenbasis_reuse_tol);
+      cells++;
+      if (reuse) {
+        rotate_to_cached_basis_2D (&Lambda, &R, &A, Rxx0[], Ryx0[]);
+        hits++;
+      }
+      else
+        diagonalization_2D (&Lambda, &R, &A);
+#else
+      diagonalization_2D (&Lambda, &R, &A);
+#endif
+      Lambda.x = exp(Lambda.x), Lambda.y = exp(Lambda.y);
 
-    A.x.y = R.x.x*R.y.x*Lambda.x + R.y.y*R.x.y*Lambda.y;
-    foreach_dimension()
-      A.x.x = sq(R.x.x)*Lambda.x + sq(R.x.y)*Lambda.y;
+      A.x.y = R.x.x*R.y.x*Lambda.x + R.y.y*R.x.y*Lambda.y;
+      foreach_dimension()
+        A.x.x = sq(R.x.x)*Lambda.x + sq(R.x.y)*Lambda.y;
 #if AXI
-      double Aqq = exp(Psiqq[]);
+        double Aqq = exp(Psiqq[]);
 #endif
 
-    /**
-    We perform now step (c) by integrating
-    $\mathbf{A}_t = -\mathbf{f}_r (\mathbf{A})/\lambda$ to obtain
-    $\mathbf{A}^{n+1}$. This step is analytic,
-    $$
-    \int_{t^n}^{t^{n+1}}\frac{d \mathbf{A}}{\mathbf{I}- \mathbf{A}} =
-    \frac{\Delta t}{\lambda}
-    $$
-    */
+      /**
+      We perform now step (c) by integrating
+      $\mathbf{A}_t = -\mathbf{f}_r (\mathbf{A})/\lambda$ to obtain
+      $\mathbf{A}^{n+1}$. This step is analytic,
+      $$
+      \int_{t^n}^{t^{n+1}}\frac{d \mathbf{A}}{\mathbf{I}- \mathbf{A}} =
+      \frac{\Delta t}{\lambda}
+      $$
+      */
 #if AXI
-     double tauD = sqrt((1./6.)*((T11[] - T22[])*(T11[] - T22[])+(T22[] - T_ThTh[])*(T22[] - T_ThTh[])+(T_ThTh[] - T11[])*(T_ThTh[] - T11[])) + T12[]*T12[]);
+       double tauD = sqrt((1./6.)*((T11[] - T22[])*(T11[] - T22[])+(T22[] - T_ThTh[])*(T22[] - T_ThTh[])+(T_ThTh[] - T11[])*(T_ThTh[] - T11[])) + T12[]*T12[]);
 #else
-    double tauD = sqrt(0.25*(T11[] - T22[])*(T11[] - T22[]) + T12[]*T12[]);
+      double tauD = sqrt(0.25*(T11[] - T22[])*(T11[] - T22[]) + T12[]*T12[]);
 #endif
-    double nHB_loc = max(nHB[], 1e-12);
-    double ohp = max(fabs(Gp[]*lambda[]), saramitoHB_yield_eps);
-    double hbArgument = (tauD - tau0[])/
-      (pow(ohp, 1. - nHB_loc)*(tauD + saramitoHB_yield_eps));
-    double KHB = max(0., pow(max(hbArgument, 0.), 1./nHB_loc)); // $K_{HB}$
-    double intFactor = (lambda[] != 0. ?
-      (lambda[] == 1e30 ? 1: exp(-dt*KHB/lambda[])): 0.);
+      double intFactor = hb_relaxation_factor (tauD, tau0[], nHB[],
+        Gp[]*lambda[], lambda[], dt, saramitoHB_yield_eps);
 
 #if AXI
-      Aqq = (1. - intFactor) + intFactor*exp(Psiqq[]);
+        Aqq = (1. - intFactor) + intFactor*exp(Psiqq[]);
 #endif
 
-    A.x.y *= intFactor;
-    foreach_dimension()
-      A.x.x = (1. - intFactor) + A.x.x*intFactor;
+      A.x.y *= intFactor;
+      foreach_dimension()
+        A.x.x = (1. - intFactor) + A.x.x*intFactor;
 
-    /**
-      Then the Conformation tensor $\mathcal{A}_p^{n+1}$ is restored from
-      $\mathbf{A}^{n+1}$.  */
+      /**
+        Then the Conformation tensor $\mathcal{A}_p^{n+1}$ is restored from
+        $\mathbf{A}^{n+1}$.  */
 
-    A12[] = A.x.y;
-    T12[] = Gp[]*A.x.y;
+      A12[] = A.x.y;
+      T12[] = Gp[]*A.x.y;
 #if AXI
-      AThTh[] = Aqq;
-      T_ThTh[] = Gp[]*(Aqq - 1.);
+        AThTh[] = Aqq;
+        T_ThTh[] = Gp[]*(Aqq - 1.);
 #endif
 
-    A11[] = A.x.x;
-    T11[] = Gp[]*(A.x.x - 1.);
-    A22[] = A.y.y;
-    T22[] = Gp[]*(A.y.y - 1.);
+      A11[] = A.x.x;
+      T11[] = Gp[]*(A.x.x - 1.);
+      A22[] = A.y.y;
+      T22[] = Gp[]*(A.y.y - 1.);
+    }
   }
+  polymer_free_cells = skipped;
+  relaxation_cells = visited;
+  polymer_free_skipped += skipped;
+  relaxation_visited += visited;
+#ifdef EIGENBASIS_REUSE
+  eigenbasis_reuse_hits += hits;
+  eigenbasis_reuse_cells += cells;
+#endif
+}
+
+event end (t = end)
+{
+  if (pid() == 0 && relaxation_visited > 0.)
+    fprintf(ferr, "Polymer-free cells skipped: %g of %g cell updates (%.1f%%)\n",
+            polymer_free_skipped, relaxation_visited,
+            100.*polymer_free_skipped/relaxation_visited);
+}
+
+#ifdef EIGENBASIS_REUSE
+event end (t = end)
+{
+  if (pid() == 0 && eigenbasis_reuse_cells > 0.)
+    fprintf(ferr, "Eigenbasis reuse: %g of %g cell updates (%.1f%%)\n",
+            eigenbasis_reuse_hits, eigenbasis_reuse_cells,
+            100.*eigenbasis_reuse_hits/eigenbasis_reuse_cells);
 }
+#endif
 
 /**
 ### Divergence of the extra stress tensor
@@ -14,6 +14,7 @@ Herschel-Bulkley flows.
 
 - `bcg.h`
 - `eigen_decomposition.h`
+- `hb_yield_factor.h`
 - `navier-stokes/centered.h`
 
 ## Change Log
@@ -28,6 +29,11 @@ Herschel-Bulkley flows.
 - 2025-03-16: Eigenvalue clamping and stability fixes.
 - 2025-06-30: Plasticity relaxation module.
 - 2026-02-09: Add HB variant with `nHB` and HB relaxation factor.
+- 2026-10-19: Skip the relaxation step in polymer-free cells
+  (`polymer_free_cells` of `relaxation_cells`, run total printed at the
+  end).
+- 2026-10-19: Evaluate the HB relaxation factor with
+  [hb_yield_factor.h](hb_yield_factor.h).
 
 ## Notes
 
@@ -212,6 +218,11 @@ static int eigenvalue_corrections = 0;
 (const) scalar tau0 = unity; // yield-stress
 (const) scalar nHB = unity; // HB power-law exponent
 double saramitoHB_yield_eps = 1e-6; // regularization for HB denominator
+double polymer_free_cells = 0.; // cells skipped in the last relaxation step
+double relaxation_cells = 0.; // cells visited in the last relaxation step
+double polymer_free_skipped = 0., relaxation_visited = 0.; // over the run
+
+#include "hb_yield_factor.h"
 
 /*
 conformation tensor */
@@ -302,26 +313,28 @@ static void diagonalization_2D (pseudo_v * Lambda, pseudo_t * R, pseudo_t * A)
   }
 
   double T = A->x.x + A->y.y; // Trace of the tensor
-  double D = A->x.x*A->y.y - sq(A->x.y); // Determinant
+  // sqrt(T^2/4 - det A), without the cancellation of T^2/4 - det A
+  double H = sqrt(sq(A->x.x - A->y.y)/4. + sq(A->x.y));
+
+  Lambda->x = T/2 + H;
+  Lambda->y = T/2 - H;
 
   /**
   The eigenvectors, $\mathbf{v}_i$ are saved by columns in tensor
-  $\mathbf{R} = (\mathbf{v}_1|\mathbf{v}_2)$. */
-
-  R->x.x = R->x.y = A->x.y;
-  R->y.x = R->y.y = -A->x.x;
-  double s = 1.;
-  for (int i = 0; i < dimension; i++) {
-    double * ev = (double *) Lambda;
-    ev[i] = T/2 + s*sqrt(sq(T)/4. - D);
-    s *= -1;
-    double * Rx = (double *) &R->x;
-    double * Ry = (double *) &R->y;
-    Ry[i] += ev[i];
-    double mod = sqrt(sq(Rx[i]) + sq(Ry[i]));
-    Rx[i] /= mod;
-    Ry[i] /= mod;
-  }
+  $\mathbf{R} = (\mathbf{v}_1|\mathbf{v}_2)$. $\mathbf{v}_1$ is taken
+  from the row of $\mathbf{A} - \lambda_1\mathbf{I}$ with the larger
+  norm, $(A_{xy}, \lambda_1 - A_{xx})$ or $(\lambda_1 - A_{yy}, A_{xy})$,
+  so a small off-diagonal term does not cancel it; $\mathbf{v}_2$ is
+  $\mathbf{v}_1$ rotated by 90 degrees, which keeps $\mathbf{R}$
+  orthonormal for nearly equal eigenvalues. */
+
+  double vx = A->x.y, vy = Lambda->x - A->x.x;
+  double wx = Lambda->x - A->y.y, wy = A->x.y;
+  if (sq(wx) + sq(wy) > sq(vx) + sq(vy))
+    vx = wx, vy = wy;
+  double mod = sqrt(sq(vx) + sq(vy));
+  R->x.x = vx/mod; R->y.x = vy/mod;
+  R->x.y = - R->y.x; R->y.y = R->x.x;
 }
 #endif
 
@@ -359,7 +372,7 @@ static void diagonalization_3D (pseudo_v3d * Lambda, pseudo_t3d * R, pseudo_t3d
     return;
   }
 
-  // Compute eigenvalues using the eigen_decomposition function
+  // Compute eigenvalues in closed form (QL fallback for near-degenerate eigenvalues)
   double matrix[3][3] = {
     {A->x.x, A->x.y, A->x.z},
     {A->y.x, A->y.y, A->y.z},
@@ -368,7 +381,7 @@ static void diagonalization_3D (pseudo_v3d * Lambda, pseudo_t3d * R, pseudo_t3d
   double eigenvectors[3][3];
   double eigenvalues[3];
 
-  compute_eigensystem_symmetric_3x3(matrix, eigenvectors, eigenvalues);
+  compute_eigensystem_symmetric_3x3_analytic(matrix, eigenvectors, eigenvalues);
 
   // Store eigenvalues and eigenvectors
   Lambda->x = eigenvalues[0];
@@ -550,58 +563,71 @@ event tracer_advection(i++)
   /**
   ### Convert back to Aij */
 
-  foreach() {
+  double skipped = 0., visited = 0.;
+  foreach (reduction(+:skipped) reduction(+:visited)) {
+    visited++;
     /**
-    It is time to undo the log-conformation, again by
-    diagonalization, to recover the conformation tensor $\mathbf{A}$
-    and to perform step (c).*/
-
-    pseudo_t A = {{Psi11[], Psi12[]}, {Psi12[], Psi22[]}}, R;
-    init_pseudo_t(&R, 0.0);
-    pseudo_v Lambda;
-    init_pseudo_v(&Lambda, 0.0);
+    Polymer-free cells ($G_p = \lambda = 0$, as set below `TOLelastic`
+    by [two-phaseEVP-HB.h](two-phaseEVP-HB.h)) relax to
+    $\mathbf{A} = \mathbf{I}$ within the step and carry no stress, so
+    they are set directly without diagonalization. */
+    if (Gp[] == 0. && lambda[] == 0.) {
+      A11[] = 1.; A22[] = 1.; A12[] = 0.;
+      T11[] = 0.; T22[] = 0.; T12[] = 0.;
+      skipped++;
+    }
+    else {
+      /**
+      It is time to undo the log-conformation, again by
+      diagonalization, to recover the conformation tensor $\mathbf{A}$
+      and to perform step (c).*/
 
-    diagonalization_2D (&Lambda, &R, &A);
-    Lambda.x = exp(Lambda.x), Lambda.y = exp(Lambda.y);
+      pseudo_t A = {{Psi11[], Psi12[]}, {Psi12[], Psi22[]}}, R;
+      init_pseudo_t(&R, 0.0);
+      pseudo_v Lambda;
+      init_pseudo_v(&Lambda, 0.0);
 
-    A.x.y = R.x.x*R.y.x*Lambda.x + R.y.y*R.x.y*Lambda.y;
-    foreach_dimension()
-      A.x.x = sq(R.x.x)*Lambda.x + sq(R.x.y)*Lambda.y;
+      diagonalization_2D (&Lambda, &R, &A);
+      Lambda.x = exp(Lambda.x), Lambda.y = exp(Lambda.y);
 
-    /**
-    We perform now step (c) by integrating
-    $\mathbf{A}_t = -\mathbf{f}_r (\mathbf{A})/\lambda$ to obtain
-    $\mathbf{A}^{n+1}$. This step is analytic,
-    $$
-    \int_{t^n}^{t^{n+1}}\frac{d \mathbf{A}}{\mathbf{I}- \mathbf{A}} =
-    \frac{\Delta t}{\lambda}
-    $$
-    */
+      A.x.y = R.x.x*R.y.x*Lambda.x + R.y.y*R.x.y*Lambda.y;
+      foreach_dimension()
+        A.x.x = sq(R.x.x)*Lambda.x + sq(R.x.y)*Lambda.y;
 
-    double tauD = sqrt(0.25*(T11[] - T22[])*(T11[] - T22[]) + T12[]*T12[]);
-    double nHB_loc = max(nHB[], 1e-12);
-    double ohp = max(fabs(Gp[]*lambda[]), saramitoHB_yield_eps);
-    double hbArgument = (tauD - tau0[])/
-      (pow(ohp, 1. - nHB_loc)*(tauD + saramitoHB_yield_eps));
-    double KHB = max(0., pow(max(hbArgument, 0.), 1./nHB_loc)); // $K_{HB}$
-    double intFactor = (lambda[] != 0. ?
-      (lambda[] == 1e30 ? 1: exp(-dt*KHB/lambda[])): 0.);
+      /**
+      We perform now step (c) by integrating
+      $\mathbf{A}_t = -\mathbf{f}_r (\mathbf{A})/\lambda$ to obtain
+      $\mathbf{A}^{n+1}$. This step is analytic,
+      $$
+      \int_{t^n}^{t^{n+1}}\frac{d \mathbf{A}}{\mathbf{I}- \mathbf{A}} =
+      \frac{\Delta t}{\lambda}
+      $$
+      */
 
-    A.x.y *= intFactor;
-    foreach_dimension()
-      A.x.x = (1. - intFactor) + A.x.x*intFactor;
+      double tauD = sqrt(0.25*(T11[] - T22[])*(T11[] - T22[]) + T12[]*T12[]);
+      double intFactor = hb_relaxation_factor (tauD, tau0[], nHB[],
+        Gp[]*lambda[], lambda[], dt, saramitoHB_yield_eps);
 
-    /**
-      Then the Conformation tensor $\mathcal{A}_p^{n+1}$ is restored from
-      $\mathbf{A}^{n+1}$.  */
-
-    A12[] = A.x.y;
-    T12[] = Gp[]*A.x.y;
-    A11[] = A.x.x;
-    T11[] = Gp[]*(A.x.x - 1.);
-    A22[] = A.y.y;
-    T22[] = Gp[]*(A.y.y - 1.);
+      A.x.y *= intFactor;
+      foreach_dimension()
+        A.x.x = (1. - intFactor) + A.x.x*intFactor;
+
+      /**
+        Then the Conformation tensor $\mathcal{A}_p^{n+1}$ is restored from
+        $\mathbf{A}^{n+1}$.  */
+
+      A12[] = A.x.y;
+      T12[] = Gp[]*A.x.y;
+      A11[] = A.x.x;
+      T11[] = Gp[]*(A.x.x - 1.);
+      A22[] = A.y.y;
+      T22[] = Gp[]*(A.y.y - 1.);
+    }
   }
+  polymer_free_cells = skipped;
+  relaxation_cells = visited;
+  polymer_free_skipped += skipped;
+  relaxation_visited += visited;
 }
 
 #elif dimension == 3
@@ -880,77 +906,92 @@ event tracer_advection(i++)
   exponentiation of eigenvalues, and application of the relaxation factor.
   */
 
-  foreach() {
-    pseudo_t3d A, R;
-    init_pseudo_t3d(&R, 0.0);
-    pseudo_v3d Lambda;
-    init_pseudo_v3d(&Lambda, 0.0);
-
-    // Reconstruct the log-conformation tensor from its components
-    A.x.x = Psi11[]; A.x.y = Psi12[]; A.x.z = Psi13[];
-    A.y.x = Psi12[]; A.y.y = Psi22[]; A.y.z = Psi23[];
-    A.z.x = Psi13[]; A.z.y = Psi23[]; A.z.z = Psi33[];
-
-    // Diagonalize A to obtain eigenvalues and eigenvectors
-    diagonalization_3D(&Lambda, &R, &A);
-
-    // Exponentiate eigenvalues
-    Lambda.x = exp(Lambda.x);
-    Lambda.y = exp(Lambda.y);
-    Lambda.z = exp(Lambda.z);
-
-    // Reconstruct A using A = R * diag(Lambda) * R^T
-    A.x.x = Lambda.x * sq(R.x.x) + Lambda.y * sq(R.x.y) + Lambda.z * sq(R.x.z);
-    A.x.y = Lambda.x * R.x.x * R.y.x + Lambda.y * R.x.y * R.y.y + Lambda.z * R.x.z * R.y.z;
-    A.y.x = A.x.y;
-    A.x.z = Lambda.x * R.x.x * R.z.x + Lambda.y * R.x.y * R.z.y + Lambda.z * R.x.z * R.z.z;
-    A.z.x = A.x.z;
-    A.y.y = Lambda.x * sq(R.y.x) + Lambda.y * sq(R.y.y) + Lambda.z * sq(R.y.z);
-    A.y.z = Lambda.x * R.y.x * R.z.x + Lambda.y * R.y.y * R.z.y + Lambda.z * R.y.z * R.z.z;
-    A.z.y = A.y.z;
-    A.z.z = Lambda.x * sq(R.z.x) + Lambda.y * sq(R.z.y) + Lambda.z * sq(R.z.z);
-
-    // Apply relaxation using the relaxation time lambda
-
-    double tauD = sqrt((1./6.)*((T11[] - T22[])*(T11[] - T22[])+(T22[] - T33[])*(T22[] - T33[])+(T33[] - T11[])*(T33[] - T11[])) + 3.*(T12[]*T12[] + T23[]*T23[] + T13[]*T13[]));
-    double nHB_loc = max(nHB[], 1e-12);
-    double ohp = max(fabs(Gp[]*lambda[]), saramitoHB_yield_eps);
-    double hbArgument = (tauD - tau0[])/
-      (pow(ohp, 1. - nHB_loc)*(tauD + saramitoHB_yield_eps));
-    double KHB = max(0., pow(max(hbArgument, 0.), 1./nHB_loc)); // $K_{HB}$
-    double intFactor = (lambda[] != 0. ?
-      (lambda[] == 1e30 ? 1: exp(-dt*KHB/lambda[])): 0.);
-
-    A.x.y *= intFactor;
-    A.y.x = A.x.y;
-    A.x.z *= intFactor;
-    A.z.x = A.x.z;
-    A.y.z *= intFactor;
-    A.z.y = A.y.z;
-    foreach_dimension()
-      A.x.x = 1. + (A.x.x - 1.)*intFactor;
+  double skipped = 0., visited = 0.;
+  foreach (reduction(+:skipped) reduction(+:visited)) {
+    visited++;
+    /**
+    Polymer-free cells ($G_p = \lambda = 0$, as set below `TOLelastic`
+    by [two-phaseEVP-HB.h](two-phaseEVP-HB.h)) relax to
+    $\mathbf{A} = \mathbf{I}$ within the step and carry no stress, so
+    they are set directly without diagonalization. */
+    if (Gp[] == 0. && lambda[] == 0.) {
+      A11[] = 1.; A22[] = 1.; A33[] = 1.;
+      A12[] = 0.; A13[] = 0.; A23[] = 0.;
+      T11[] = 0.; T22[] = 0.; T33[] = 0.;
+      T12[] = 0.; T13[] = 0.; T23[] = 0.;
+      skipped++;
+    }
+    else {
+      pseudo_t3d A, R;
+      init_pseudo_t3d(&R, 0.0);
+      pseudo_v3d Lambda;
+      init_pseudo_v3d(&Lambda, 0.0);
+
+      // Reconstruct the log-conformation tensor from its components
+      A.x.x = Psi11[]; A.x.y = Psi12[]; A.x.z = Psi13[];
+      A.y.x = Psi12[]; A.y.y = Psi22[]; A.y.z = Psi23[];
+      A.z.x = Psi13[]; A.z.y = Psi23[]; A.z.z = Psi33[];
+
+      // Diagonalize A to obtain eigenvalues and eigenvectors
+      diagonalization_3D(&Lambda, &R, &A);
+
+      // Exponentiate eigenvalues
+      Lambda.x = exp(Lambda.x);
+      Lambda.y = exp(Lambda.y);
+      Lambda.z = exp(Lambda.z);
+
+      // Reconstruct A using A = R * diag(Lambda) * R^T
+      A.x.x = Lambda.x * sq(R.x.x) + Lambda.y * sq(R.x.y) + Lambda.z * sq(R.x.z);
+      A.x.y = Lambda.x * R.x.x * R.y.x + Lambda.y * R.x.y * R.y.y + Lambda.z * R.x.z * R.y.z;
+      A.y.x = A.x.y;
+      A.x.z = Lambda.x * R.x.x * R.z.x + Lambda.y * R.x.y * R.z.y + Lambda.z * R.x.z * R.z.z;
+      A.z.x = A.x.z;
+      A.y.y = Lambda.x * sq(R.y.x) + Lambda.y * sq(R.y.y) + Lambda.z * sq(R.y.z);
+      A.y.z = Lambda.x * R.y.x * R.z.x + Lambda.y * R.y.y * R.z.y + Lambda.z * R.y.z * R.z.z;
+      A.z.y = A.y.z;
+      A.z.z = Lambda.x * sq(R.z.x) + Lambda.y * sq(R.z.y) + Lambda.z * sq(R.z.z);
+
+      // Apply relaxation using the relaxation time lambda
+
+      double tauD = sqrt((1./6.)*((T11[] - T22[])*(T11[] - T22[])+(T22[] - T33[])*(T22[] - T33[])+(T33[] - T11[])*(T33[] - T11[])) + 3.*(T12[]*T12[] + T23[]*T23[] + T13[]*T13[]));
+      double intFactor = hb_relaxation_factor (tauD, tau0[], nHB[],
+        Gp[]*lambda[], lambda[], dt, saramitoHB_yield_eps);
+
+      A.x.y *= intFactor;
+      A.y.x = A.x.y;
+      A.x.z *= intFactor;
+      A.z.x = A.x.z;
+      A.y.z *= intFactor;
+      A.z.y = A.y.z;
+      foreach_dimension()
+        A.x.x = 1. + (A.x.x - 1.)*intFactor;
 
-    /*
-    Get Aij from A. These commands might look repetitive. But, I do this so that in the future, generalization to tensor only form is easier.
-    */
+      /*
+      Get Aij from A. These commands might look repetitive. But, I do this so that in the future, generalization to tensor only form is easier.
+      */
 
-    // diagonal terms:
-    A11[] = A.x.x;
-    A22[] = A.y.y;
-    A33[] = A.z.z;
-    // off-diagonal terms:
-    A12[] = A.x.y;
-    A13[] = A.x.z;
-    A23[] = A.y.z;
-
-    // Compute the stress tensor T using the polymer modulus Gp
-    T11[] = Gp[]*(A.x.x - 1.);
-    T22[] = Gp[]*(A.y.y - 1.);
-    T33[] = Gp[]*(A.z.z - 1.);
-    T12[] = Gp[]*A.x.y;
-    T13[] = Gp[]*A.x.z;
-    T23[] = Gp[]*A.y.z;
+      // diagonal terms:
+      A11[] = A.x.x;
+      A22[] = A.y.y;
+      A33[] = A.z.z;
+      // off-diagonal terms:
+      A12[] = A.x.y;
+      A13[] = A.x.z;
+      A23[] = A.y.z;
+
+      // Compute the stress tensor T using the polymer modulus Gp
+      T11[] = Gp[]*(A.x.x - 1.);
+      T22[] = Gp[]*(A.y.y - 1.);
+      T33[] = Gp[]*(A.z.z - 1.);
+      T12[] = Gp[]*A.x.y;
+      T13[] = Gp[]*A.x.z;
+      T23[] = Gp[]*A.y.z;
+    }
   }
+  polymer_free_cells = skipped;
+  relaxation_cells = visited;
+  polymer_free_skipped += skipped;
+  relaxation_visited += visited;
 }
 #endif
 
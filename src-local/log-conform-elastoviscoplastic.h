@@ -271,26 +271,28 @@ static void diagonalization_2D (pseudo_v * Lambda, pseudo_t * R, pseudo_t * A)
   }
 
   double T = A->x.x + A->y.y; // Trace of the tensor
-  double D = A->x.x*A->y.y - sq(A->x.y); // Determinant
+  // sqrt(T^2/4 - det A), without the cancellation of T^2/4 - det A
+  double H = sqrt(sq(A->x.x - A->y.y)/4. + sq(A->x.y));
+
+  Lambda->x = T/2 + H;
+  Lambda->y = T/2 - H;
 
   /**
   The eigenvectors, $\mathbf{v}_i$ are saved by columns in tensor
-  $\mathbf{R} = (\mathbf{v}_1|\mathbf{v}_2)$. */
-
-  R->x.x = R->x.y = A->x.y;
-  R->y.x = R->y.y = -A->x.x;
-  double s = 1.;
-  for (int i = 0; i < dimension; i++) {
-    double * ev = (double *) Lambda;
-    ev[i] = T/2 + s*sqrt(sq(T)/4. - D);
-    s *= -1;
-    double * Rx = (double *) &R->x;
-    double * Ry = (double *) &R->y;
-    Ry[i] += ev[i];
-    double mod = sqrt(sq(Rx[i]) + sq(Ry[i]));
-    Rx[i] /= mod;
-    Ry[i] /= mod;
-  }
+  $\mathbf{R} = (\mathbf{v}_1|\mathbf{v}_2)$. $\mathbf{v}_1$ is taken
+  from the row of $\mathbf{A} - \lambda_1\mathbf{I}$ with the larger
+  norm, $(A_{xy}, \lambda_1 - A_{xx})$ or $(\lambda_1 - A_{yy}, A_{xy})$,
+  so a small off-diagonal term does not cancel it; $\mathbf{v}_2$ is
+  $\mathbf{v}_1$ rotated by 90 degrees, which keeps $\mathbf{R}$
+  orthonormal for nearly equal eigenvalues. */
+
+  double vx = A->x.y, vy = Lambda->x - A->x.x;
+  double wx = Lambda->x - A->y.y, wy = A->x.y;
+  if (sq(wx) + sq(wy) > sq(vx) + sq(vy))
+    vx = wx, vy = wy;
+  double mod = sqrt(sq(vx) + sq(vy));
+  R->x.x = vx/mod; R->y.x = vy/mod;
+  R->x.y = - R->y.x; R->y.y = R->x.x;
 }
 
 /**
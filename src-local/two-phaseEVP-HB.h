@@ -9,6 +9,7 @@ log-conformation rheology.
 
 - 2025-06-30: Add support for EVP simulations.
 - 2026-02-09: Add support for HB.
+- 2026-10-19: Tabulate the HB factors of the pure phases.
 
 ## Two-Phase Interfacial Flows
 
@@ -108,7 +109,16 @@ event tracer_advection (i++) {
 }
 
 event properties (i++) {
-  
+
+  /**
+  The pure phases are the only material states that occur away from the
+  interface, so their $(G_p\lambda)^{1-n_{HB}}$ factors are tabulated
+  once per timestep (see [hb_yield_factor.h](hb_yield_factor.h)). */
+
+  hb_clear_states();
+  hb_register_state (nHB1, G1*lambda1, saramitoHB_yield_eps);
+  hb_register_state (nHB2, G2*lambda2, saramitoHB_yield_eps);
+
   foreach_face() {
     double ff = (sf[] + sf[-1])/2.;
     alphav.x[] = fm.x[]/rho(ff);
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Round-Trip Check of Compacted Snapshots
+
+Writes a synthetic Basilisk dump (quadtree, `size` first as `dump()` writes
+it, then the fields of an EVP run), compacts it the way
+`compactSnapshots.py --keep-fields viz` does, uncompressed (`.lite`), with
+gzip and with xz, and restores every result as Basilisk's `restore()` does:
+the first field of each cell record is the subtree size and is skipped,
+the others are matched to the restoring program's fields by position in
+the header. The check fails unless every restored file
+
+- is a complete dump starting with `size`,
+- holds exactly `size` and the viz fields of the original,
+- gives back the original values of those fields, cell by cell.
+
+Usage:
+    python testCompactSnapshots.py
+
+Dependencies:
+    - Python standard library only
+
+Author: Vatsal Sanjay
+Contact: vatsalsanjay@gmail.com
+Affiliation: Physics of Fluids Group
+"""
+
+import struct
+import sys
+import tempfile
+from pathlib import Path
+
+from compactSnapshots import VIZ_FIELDS, compact_snapshot, open_snapshot
+from resumeRun import DUMP_HEADER, dump_is_complete
+
+NAMES = ['size', 'f', 'u.x', 'u.y', 'p', 'pf', 'A11', 'A12', 'A22', 'conform_qq',
+         'Tau_p11', 'Tau_p12', 'Tau_p22', 'Tau_pqq']
+LEAF_FLAG = 1 << 1
+DUMP_VERSION = 170901
+MAX_LEVEL = 4
+
+
+def synthetic_cells(level=0, i=0, j=0):
+    """
+    Depth-first records of a quadtree refined towards one corner.
+
+    Returns:
+        list: (flags, values) per cell, values[0] being the subtree size
+    """
+    value = lambda k: 1000.*level + 10.*i + 0.1*j + 0.001*k
+    if level == MAX_LEVEL or (level >= 2 and i + j > 0):
+        return [(LEAF_FLAG, [1.] + [value(k) for k in range(1, len(NAMES))])]
+    children = []
+    for a in (0, 1):
+        for b in (0, 1):
+            children += synthetic_cells(level + 1, 2*i + a, 2*j + b)
+    return [(0, [1. + len(children)] + [value(k) for k in range(1, len(NAMES))])] + children
+
+
+def write_dump(path, cells):
+    with open(path, 'wb') as fp:
+        fp.write(DUMP_HEADER.pack(0.25, len(NAMES), 17, MAX_LEVEL, 1, DUMP_VERSION, 0., 0., 0.))
+        for name in NAMES:
+            fp.write(struct.pack('=I', len(name)) + name.encode())
+        fp.write(struct.pack('=4d', 0., 0., 0., 1.))
+        for flags, values in cells:
+            fp.write(struct.pack('=I', flags) + struct.pack(f'={len(values)}d', *values))
+
+
+def restore(path):
+    """
+    Reads a (compressed) dump as `restore()` does.
+
+    Returns:
+        tuple: (names, fields) with fields mapping every name but the
+        skipped first one to its values, in cell order
+    """
+    with open_snapshot(path) as fp:
+        data = fp.read()
+    t, nvar, i, depth, npe, version, *_ = DUMP_HEADER.unpack_from(data)
+    offset, names = DUMP_HEADER.size, []
+    for _ in range(nvar):
+        length, = struct.unpack_from('=I', data, offset)
+        names.append(data[offset + 4:offset + 4 + length].decode())
+        offset += 4 + length
+    offset += 32
+    record = 4 + 8*nvar
+    rows = [struct.unpack_from(f'={nvar}d', data, start + 4)
+            for start in range(offset, len(data), record)]
+    return names, {name: [row[k] for row in rows] for k, name in enumerate(names) if k}
+
+
+def main():
+    """
+    Compacts a synthetic dump every way and checks what restore() gets.
+    """
+    cells = synthetic_cells()
+    original = {name: [values[k] for _, values in cells] for k, name in enumerate(NAMES)}
+    expected = ['size'] + [name for name in NAMES[1:] if name in VIZ_FIELDS]
+
+    passed = True
+    with tempfile.TemporaryDirectory() as tmp:
+        for compression in ('none', 'gzip', 'xz'):
+            path = Path(tmp)/'snapshot-0.2500'
+            write_dump(path, cells)
+            target = compact_snapshot(path, VIZ_FIELDS, compression)
+            names, fields = restore(target)
+            errors = []
+            if names != expected:
+                errors.append(f"fields {names}, expected {expected}")
+            for name, values in fields.items():
+                if values != original.get(name):
+                    errors.append(f"{name} restored wrong")
+            if compression == 'none' and not dump_is_complete(target)[0]:
+                errors.append("incomplete cell tree")
+            print(f"{target.name:<24} {len(cells)} cells, fields {' '.join(names)}"
+                  f"{'' if not errors else '  FAILED: ' + '; '.join(errors)}")
+            passed &= not errors
+            target.unlink()
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())